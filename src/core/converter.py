@@ -5,13 +5,15 @@ This module provides functions for converting PDF documents to text
 using various methods including OpenAI's API and local tools.
 """
 
+import asyncio
 import os
 import time
 import math
+import re
 import contextlib
-import textwrap
 import threading
-from typing import List, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
 
 import PyPDF2
 from dotenv import load_dotenv
@@ -19,7 +21,7 @@ from marker.config.parser import ConfigParser  # type: ignore
 from marker.converters.pdf import PdfConverter  # type: ignore
 from marker.models import create_model_dict  # type: ignore
 from markitdown import MarkItDown
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from src.types.converter import ConverterType, ConverterFunc
 from src.utils.logging_utils import get_logger
@@ -30,6 +32,11 @@ try:
 except Exception:
     torch = None
 
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
 from src.utils.utils import download_from_url, extract
 
 # Get module logger
@@ -37,10 +44,18 @@ logger = get_logger(__name__)
 
 load_dotenv(override=True)
 
-# Global lock to prevent concurrent marker model loading
+# Global lock to prevent concurrent marker model loading; the loaded models are
+# shared, while each thread builds its own PdfConverter around them
 _marker_lock = threading.Lock()
 _marker_models = None
-_marker_converter = None
+_marker_local = threading.local()
+
+# Chunk boundaries: any whitespace, and the last whitespace before the end of a window
+_BREAK_RE = re.compile(r"\s")
+_LAST_BREAK_RE = re.compile(r"\s\S*\Z")
+
+# Maximum number of concurrent OpenAI requests when converting one document
+_OPENAI_MAX_CONCURRENCY = 8
 
 # Global lock to prevent concurrent markitdown model loading
 _markitdown_lock = threading.Lock()
@@ -156,16 +171,62 @@ def convert(conversion_type: ConverterType, input_path: str) -> str:
 
 
 def chunk_text(text: str, chunk_size: int = 4000) -> List[str]:
-    """Splits text into smaller chunks to fit within token limits."""
-    return textwrap.wrap(
-        text, width=chunk_size, break_long_words=False, break_on_hyphens=False
+    """Splits text into smaller chunks to fit within token limits.
+
+    Chunks break at the last whitespace character that fits in chunk_size
+    characters. A word longer than chunk_size is kept whole rather than split.
+    """
+    chunks = []
+    start, length = 0, len(text)
+    while start < length:
+        end = start + chunk_size
+        if end < length:
+            # text[end] may itself be the break, so the search window includes it
+            match = _LAST_BREAK_RE.search(text, start, end + 1)
+            if match is None or match.start() <= start:
+                match = _BREAK_RE.search(text, end)
+            end = match.start() if match else length
+
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        start = end + 1
+
+    return chunks
+
+
+def _get_marker_converter() -> PdfConverter:
+    """Return this thread's marker converter, loading the shared models on first use."""
+    global _marker_models
+
+    converter = getattr(_marker_local, "converter", None)
+    if converter is not None:
+        return converter
+
+    with _marker_lock:
+        if _marker_models is None:
+            logger.info("Loading marker models (this may take a moment)...")
+            _marker_models = create_model_dict()
+            logger.info("Marker models loaded successfully")
+
+    config_parser = ConfigParser(
+        {
+            "languages": "en",
+            "output_format": "markdown",
+        }
+    )
+    converter = PdfConverter(
+        config=config_parser.generate_config_dict(),
+        artifact_dict=_marker_models,
+        processor_list=config_parser.get_processors(),
+        renderer=config_parser.get_renderer(),
     )
+    _marker_local.converter = converter
+    return converter
 
 
 def marker(input_path: str) -> str:
     """Convert text using the marker module, where input_path is either a path to pdf file or a path to a folder containing a set of pdf files."""
-    global _marker_models, _marker_converter
-
     try:
         # Acquire converter-side GPU lock (prefer low indices; likely 0)
         with acquire_converter_gpu_lock_with_timeout("MARKER") as locked_gpu_idx:
@@ -203,34 +264,14 @@ def marker(input_path: str) -> str:
             else:
                 raise ValueError(f"Invalid input path: {input_path}")
 
-            std_out = ""
-
-            # Use thread-safe model loading and conversion
-            with _marker_lock:
-                if _marker_models is None or _marker_converter is None:
-                    logger.info("Loading marker models (this may take a moment)...")
-                    _marker_models = create_model_dict()
-                    config_parser = ConfigParser(
-                        {
-                            "languages": "en",
-                            "output_format": "markdown",
-                        }
-                    )
-                    _marker_converter = PdfConverter(
-                        config=config_parser.generate_config_dict(),
-                        artifact_dict=_marker_models,
-                        processor_list=config_parser.get_processors(),
-                        renderer=config_parser.get_renderer(),
-                    )
-                    logger.info("Marker models loaded successfully")
-
-                # Use the cached converter - now conversion happens inside the lock
-                converter = _marker_converter
+            # Only model loading is serialized; conversions run without the
+            # process-wide lock (the GPU lock above still guards the device)
+            converter = _get_marker_converter()
 
-                for pdf_path in input_pdf_paths:
-                    rendered = converter(pdf_path)
-                    rendered_markdown = rendered.markdown
-                    std_out += rendered_markdown
+            std_out = ""
+            for pdf_path in input_pdf_paths:
+                rendered = converter(pdf_path)
+                std_out += rendered.markdown
 
             return std_out
 
@@ -242,7 +283,27 @@ def marker(input_path: str) -> str:
 
 
 def extract_text_from_pdf(input_path: str) -> str:
-    """Extracts text from a PDF file."""
+    """Extracts text from a PDF file, using PDFium when available."""
+    if pdfium is None:
+        return _extract_text_with_pypdf2(input_path)
+
+    pdf = pdfium.PdfDocument(input_path)
+    try:
+        page_texts = []
+        for page in pdf:
+            textpage = page.get_textpage()
+            try:
+                page_texts.append(textpage.get_text_range())
+            finally:
+                textpage.close()
+                page.close()
+        return "".join(page_texts)
+    finally:
+        pdf.close()
+
+
+def _extract_text_with_pypdf2(input_path: str) -> str:
+    """Extracts text from a PDF file with the pure-Python PyPDF2 reader."""
     pdf_reader = PyPDF2.PdfReader(input_path)
     text_content = ""
 
@@ -253,20 +314,14 @@ def extract_text_from_pdf(input_path: str) -> str:
     return text_content
 
 
-def openai(input_path: str) -> str:
-    """Convert large text to Markdown using OpenAI API with chunking."""
-    try:
-        if not os.path.exists(input_path):
-            raise FileNotFoundError(f"Input file not found: {input_path}")
-
-        pdf_text = extract_text_from_pdf(input_path)
-        chunks = chunk_text(pdf_text, chunk_size=4000)
-
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        markdown_chunks = []
+async def _openai_convert_chunks(chunks: List[str]) -> List[Optional[str]]:
+    """Convert text chunks to Markdown concurrently, preserving their order."""
+    client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    semaphore = asyncio.Semaphore(_OPENAI_MAX_CONCURRENCY)
 
-        for chunk in chunks:
-            response = client.chat.completions.create(
+    async def convert_chunk(chunk: str) -> Optional[str]:
+        async with semaphore:
+            response = await client.chat.completions.create(
                 model="gpt-3.5-turbo",
                 messages=[
                     {
@@ -275,11 +330,49 @@ def openai(input_path: str) -> str:
                     },
                 ],
             )
-            if response and response.choices:
-                markdown_chunks.append(response.choices[0].message.content)
-            else:
-                print("Failed to convert a chunk using OpenAI.")
-                markdown_chunks.append(chunk)
+        if response and response.choices:
+            return response.choices[0].message.content
+        print("Failed to convert a chunk using OpenAI.")
+        return chunk
+
+    try:
+        return await asyncio.gather(*(convert_chunk(chunk) for chunk in chunks))
+    finally:
+        await client.close()
+
+
+def _run_coroutine_sync(coro):
+    """
+    Run a coroutine to completion from synchronous code.
+
+    asyncio.run cannot be used while this thread already runs an event loop,
+    so in that case the coroutine gets its own loop on a worker thread and
+    this call blocks until it finishes.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def openai(input_path: str) -> str:
+    """Convert large text to Markdown using OpenAI API with chunking.
+
+    This is a synchronous function; it may be called from inside a running
+    event loop, but then blocks that loop until conversion finishes, so async
+    callers should run it in a worker thread.
+    """
+    try:
+        if not os.path.exists(input_path):
+            raise FileNotFoundError(f"Input file not found: {input_path}")
+
+        pdf_text = extract_text_from_pdf(input_path)
+        chunks = chunk_text(pdf_text, chunk_size=4000)
+
+        markdown_chunks = _run_coroutine_sync(_openai_convert_chunks(chunks))
 
         filtered_chunks = [chunk for chunk in markdown_chunks if chunk is not None]
         return "\n\n".join(filtered_chunks)
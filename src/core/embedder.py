@@ -9,7 +9,7 @@ import os
 import time
 import math
 from functools import lru_cache
-from typing import List, Dict
+from typing import List, Dict, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import torch
@@ -27,6 +27,28 @@ logger = get_logger(__name__)
 
 load_dotenv(override=True)
 
+# The OpenAI embeddings endpoint accepts at most 2048 inputs per request
+OPENAI_MAX_BATCH_SIZE = 2048
+# It also caps each request at 300k tokens in total. Tokens are estimated from
+# the text length, so batches are kept well under that to allow for dense text
+OPENAI_MAX_BATCH_TOKENS = 250_000
+OPENAI_CHARS_PER_TOKEN = 4
+
+# Default batch size per embedder: remote APIs take as many texts per request
+# as the provider allows, local models are bounded by GPU memory
+DEFAULT_BATCH_SIZES: Dict[str, int] = {
+    "openai": OPENAI_MAX_BATCH_SIZE,
+    "bge": 32,
+    "bgelarge": 32,
+}
+
+# Model behind each embedder type, used to key cached embeddings
+EMBEDDER_MODELS: Dict[str, str] = {
+    "openai": "text-embedding-3-small",
+    "bge": "BAAI/bge-small-en",
+    "bgelarge": "BAAI/bge-large-en-v1.5",
+}
+
 
 def setup_gpu_config():
     """Setup GPU configuration based on GPU_SPLIT environment variable."""
@@ -372,14 +394,21 @@ def embed(
 def embed_batch(
     embeder_type: EmbedderType,
     input_texts: List[str],
-    batch_size: int = 32,
+    batch_size: Optional[int] = None,
     user_email: str = None,
 ) -> List[Embedding]:
-    """Embed multiple texts in batches based on the specified embedding type."""
+    """Embed multiple texts in batches based on the specified embedding type.
+
+    When batch_size is not given, the embedder's default from DEFAULT_BATCH_SIZES
+    is used so that API-backed embedders send as few requests as possible.
+    """
 
     # Create user-specific logger
     embed_logger = get_user_logger(user_email, "embedder")
 
+    if batch_size is None:
+        batch_size = DEFAULT_BATCH_SIZES.get(embeder_type, 32)
+
     batch_embedding_methods: Dict[str, BatchEmbedderFunc] = {
         "openai": openai_batch,
         "bge": bge_batch,
@@ -395,25 +424,59 @@ def embed_batch(
     )
 
 
+def _estimate_tokens(text: str) -> int:
+    """Roughly estimate the number of tokens OpenAI counts for a text."""
+    return len(text) // OPENAI_CHARS_PER_TOKEN + 1
+
+
+def _openai_batches(texts: List[str], batch_size: int) -> List[List[str]]:
+    """Split texts into consecutive batches within the input-count and token limits.
+
+    A single text over the token budget still gets a batch of its own.
+    """
+    batches = []
+    batch: List[str] = []
+    batch_tokens = 0
+    for text in texts:
+        tokens = _estimate_tokens(text)
+        if batch and (
+            len(batch) >= batch_size or batch_tokens + tokens > OPENAI_MAX_BATCH_TOKENS
+        ):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+        batch.append(text)
+        batch_tokens += tokens
+    if batch:
+        batches.append(batch)
+    return batches
+
+
 def openai_batch(
-    texts: List[str], batch_size: int = 32, user_email: str = None
+    texts: List[str], batch_size: int = OPENAI_MAX_BATCH_SIZE, user_email: str = None
 ) -> List[Embedding]:
-    """Embed multiple texts using the OpenAI embedding API in batches."""
+    """Embed multiple texts using the OpenAI embedding API in batches.
+
+    Batches are capped at OPENAI_MAX_BATCH_SIZE inputs and an estimated
+    OPENAI_MAX_BATCH_TOKENS tokens per request.
+    """
     embed_logger = get_user_logger(user_email, "embedder")
 
+    batch_size = max(1, min(batch_size, OPENAI_MAX_BATCH_SIZE))
+
     client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
     all_embeddings = []
-    num_batches = (len(texts) + batch_size - 1) // batch_size
+    batches = _openai_batches(texts, batch_size)
+    num_batches = len(batches)
 
-    for i in range(0, len(texts), batch_size):
-        batch_num = i // batch_size + 1
-        batch = texts[i: i + batch_size]
+    for batch_num, batch in enumerate(batches, start=1):
         embed_logger.info(
             f"Processing OpenAI batch {batch_num}/{num_batches} ({len(batch)} texts)"
         )
 
-        response = client.embeddings.create(model="text-embedding-3-small", input=batch)
+        response = client.embeddings.create(
+            model=EMBEDDER_MODELS["openai"], input=batch
+        )
         batch_embeddings = [data.embedding for data in response.data]
         all_embeddings.extend(batch_embeddings)
 
@@ -424,7 +487,7 @@ def openai_batch(
 @lru_cache(maxsize=8)
 def _load_bge(device: torch.device) -> SentenceTransformer:
     """Load BGE model on specified device with caching."""
-    model_name = "BAAI/bge-small-en"
+    model_name = EMBEDDER_MODELS["bge"]
     return SentenceTransformer(model_name, device=device)
 
 
@@ -446,7 +509,7 @@ def bge_batch(
 @lru_cache(maxsize=8)
 def _load_bge_large(device: torch.device) -> SentenceTransformer:
     """Load BGE Large model on specified device with caching."""
-    model_name = "BAAI/bge-large-en-v1.5"
+    model_name = EMBEDDER_MODELS["bgelarge"]
     return SentenceTransformer(model_name, device=device)
 
 
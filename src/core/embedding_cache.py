@@ -0,0 +1,199 @@
+"""
+Persistent embedding cache.
+
+This module provides a content-addressed cache of chunk embeddings backed by
+SQLite, so that unchanged chunks are neither re-embedded nor re-uploaded to
+IPFS when documents are processed again.
+"""
+
+import hashlib
+import sqlite3
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from src.types.embedder import Embedding
+from src.utils.logging_utils import get_logger
+
+try:
+    from blake3 import blake3
+except ImportError:
+    blake3 = None
+
+# Get module logger
+logger = get_logger(__name__)
+
+
+def content_hash(text: str) -> str:
+    """Return the cache key for a chunk of text.
+
+    Runs of whitespace are collapsed first so chunks that differ only in
+    spacing or line breaks share an embedding. Keys are local to the cache,
+    so the faster BLAKE3 is used when installed, with SHA-256 as the fallback.
+    """
+    data = " ".join(text.split()).encode("utf-8")
+    if blake3 is not None:
+        return blake3(data).hexdigest()
+    return hashlib.sha256(data).hexdigest()
+
+
+def _pack_vector(vector: Embedding) -> bytes:
+    """Pack an embedding as contiguous float32 values."""
+    return struct.pack(f"{len(vector)}f", *vector)
+
+
+def _unpack_vector(blob: bytes) -> Embedding:
+    """Unpack a float32 blob written by _pack_vector."""
+    return list(struct.unpack(f"{len(blob) // 4}f", blob))
+
+
+class EmbeddingCache:
+    """
+    SQLite-backed cache mapping chunk content to its embedding and IPFS CID.
+
+    Entries are keyed by (content hash, provider, model) so the same chunk
+    embedded by different models is cached independently. The cache holds at
+    most max_entries rows and evicts the least recently used ones first. With
+    a max_age, entries not used for that long are treated as misses and
+    removed on the next write.
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        max_entries: int = 100_000,
+        max_age: Optional[float] = None,
+    ):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            db_path: Path to the SQLite database file
+            max_entries: Maximum number of cached embeddings
+            max_age: Seconds an entry may go unused before it expires, None to never expire
+        """
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.db_path), timeout=30, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                hash TEXT NOT NULL,
+                provider TEXT NOT NULL,
+                model TEXT NOT NULL,
+                vec BLOB NOT NULL,
+                cid TEXT NOT NULL,
+                last_used REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (hash, provider, model)
+            )
+            """
+        )
+        # Caches created before LRU eviction have no last_used column; their
+        # entries start out as the least recently used
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(embeddings)")}
+        if "last_used" not in columns:
+            self._conn.execute(
+                "ALTER TABLE embeddings ADD COLUMN last_used REAL NOT NULL DEFAULT 0"
+            )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)"
+        )
+        self._conn.commit()
+
+    def _is_expired(self, last_used: float, now: float) -> bool:
+        """Return whether an entry last used at last_used has outlived max_age."""
+        return self.max_age is not None and now - last_used > self.max_age
+
+    def get(
+        self, content_hash: str, provider: str, model: str
+    ) -> Optional[Tuple[Embedding, str]]:
+        """
+        Look up a cached embedding and mark it as recently used.
+
+        Args:
+            content_hash: Hash of the chunk text (see content_hash)
+            provider: Embedder type, e.g. "openai"
+            model: Model name used by the embedder
+
+        Returns:
+            Tuple of (embedding, embedding CID) if cached, None otherwise
+        """
+        now = time.time()
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT vec, cid, last_used FROM embeddings WHERE hash = ? AND provider = ? AND model = ?",
+                    (content_hash, provider, model),
+                ).fetchone()
+                if row is None or self._is_expired(row[2], now):
+                    return None
+                self._conn.execute(
+                    "UPDATE embeddings SET last_used = ? WHERE hash = ? AND provider = ? AND model = ?",
+                    (now, content_hash, provider, model),
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error reading embedding cache {self.db_path}: {e}")
+            return None
+
+        return _unpack_vector(row[0]), row[1]
+
+    def put(
+        self,
+        content_hash: str,
+        provider: str,
+        model: str,
+        vector: Embedding,
+        cid: str,
+    ) -> None:
+        """
+        Store an embedding and the CID it was uploaded under.
+
+        Args:
+            content_hash: Hash of the chunk text (see content_hash)
+            provider: Embedder type, e.g. "openai"
+            model: Model name used by the embedder
+            vector: The embedding vector
+            cid: IPFS CID of the uploaded embedding
+        """
+        now = time.time()
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO embeddings (hash, provider, model, vec, cid, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                    (content_hash, provider, model, _pack_vector(vector), cid, now),
+                )
+                if self.max_age is not None:
+                    self._conn.execute(
+                        "DELETE FROM embeddings WHERE last_used < ?",
+                        (now - self.max_age,),
+                    )
+                # Keep the max_entries most recently used rows; rowid breaks
+                # ties between entries used within the same clock tick
+                self._conn.execute(
+                    """
+                    DELETE FROM embeddings WHERE rowid IN (
+                        SELECT rowid FROM embeddings
+                        ORDER BY last_used DESC, rowid DESC
+                        LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_entries,),
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error writing embedding cache {self.db_path}: {e}")
+
+    def close(self) -> None:
+        """Close the cache database."""
+        with self._lock:
+            self._conn.close()
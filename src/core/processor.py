@@ -6,17 +6,22 @@ of scientific documents, including conversion, chunking, embedding, and storage.
 """
 
 import json
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
-import certifi
+import orjson
 import requests
 
 from src.core.chunker import chunk
 from src.core.converter import convert
-from src.core.embedder import embed_batch
-from src.db.graph_db import IPFSNeo4jGraph
+from src.core.embedder import EMBEDDER_MODELS, embed_batch
+from src.core.embedding_cache import EmbeddingCache, content_hash
+from src.db.graph_db import get_graph_db
+from src.utils.embedding_codec import SUPPORTED_DTYPES, encode_embeddings
+from src.utils.file_lock import file_lock
 from src.utils.ipfs_utils import get_ipfs_client
 from src.utils.logging_utils import get_logger, get_user_logger
 
@@ -66,44 +71,63 @@ class Processor:
 
         self.logger.info(f"Using user temp directory: {self.user_temp_dir}")
 
-        # Paths for user-specific temporary files
-        self.tmp_file_path = self.user_temp_dir / "tmp.txt"
-
-        # Set SSL certificate path explicitly
-        os.environ["SSL_CERT_FILE"] = certifi.where()
-
-        neo4j_uri = os.getenv("NEO4J_URI")
-        neo4j_username = os.getenv("NEO4J_USERNAME")
-        neo4j_password = os.getenv("NEO4J_PASSWORD")
-
-        self.graph_db = IPFSNeo4jGraph(
-            uri=neo4j_uri, username=neo4j_username, password=neo4j_password
+        # Mappings of PDF CID -> processed database combinations, kept in memory
+        # and flushed to disk once per processed document
+        self.global_mappings_path = self.temp_dir / "mappings.json"
+        self.user_mappings_path = self.user_temp_dir / "mappings.json"
+        self._global_mappings = self.__load_mapping_sets(self.global_mappings_path)
+        self._user_mappings = self.__load_mapping_sets(self.user_mappings_path)
+        self._mappings_dirty = False
+
+        # Number of concurrent IPFS uploads for chunks and embeddings
+        self.upload_workers = int(os.getenv("IPFS_UPLOAD_WORKERS", "16"))
+
+        # Storage dtype for uploaded embeddings (float32 keeps plain JSON lists)
+        self.embedding_dtype = os.getenv("EMBEDDING_DTYPE", "float32")
+        if self.embedding_dtype not in SUPPORTED_DTYPES:
+            error_msg = f"Invalid EMBEDDING_DTYPE: {self.embedding_dtype}. Must be one of {', '.join(SUPPORTED_DTYPES)}"
+            self.logger.error(error_msg)
+            raise ValueError(error_msg)
+
+        # Embedding cache shared by all users, keyed by chunk content
+        self.embedding_cache = EmbeddingCache(
+            self.temp_dir / "embedding_cache" / "embeddings.sqlite",
+            max_entries=int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "100000")),
+            # Days an unused embedding stays cached; 0 keeps entries until evicted
+            max_age=float(os.getenv("EMBEDDING_CACHE_TTL_DAYS", "0")) * 86400 or None,
         )
 
+        self.graph_db = get_graph_db()
+
         # Get OpenRouter API key for metadata extraction
         self.openrouter_api_key = os.getenv("OPENROUTER_API_KEY")
 
-        self.__write_to_file(self.authorPublicKey, str(self.tmp_file_path))
         self.logger.info(
             f"Uploading author public key to IPFS: {self.authorPublicKey[:10]}..."
         )
-        self.author_cid = self.ipfs_client.upload_file(str(self.tmp_file_path))
+        self.author_cid = self.ipfs_client.upload_text(self.authorPublicKey)
         self.logger.info(f"Author CID: {self.author_cid}")
         self.graph_db.add_ipfs_node(self.author_cid)
 
-    def __write_to_file(self, content: str, file_path: Union[str, Path]) -> None:
-        """Writes the content to a file.
+    def _embedding_cache_model(self, embedder_func: str) -> str:
+        """
+        Return the model name used to key an embedder's cache entries.
 
-        - content: The content to be written to the file.
-        - file_path: The path to the file to write the content to.
+        Cached CIDs point at embeddings encoded with EMBEDDING_DTYPE, so the
+        dtype is part of the key; switching dtypes must not reuse CIDs of the
+        old encoding.
         """
-        try:
-            path_str = str(file_path)
-            os.makedirs(os.path.dirname(path_str), exist_ok=True)
-            with open(path_str, "w") as file:
-                file.write(content)
-        except Exception as e:
-            self.logger.error(f"Error writing to file {file_path}: {e}")
+        model = EMBEDDER_MODELS.get(embedder_func, embedder_func)
+        return f"{model}:{self.embedding_dtype}"
+
+    def _upload_many(self, payloads: List[bytes]) -> List[str]:
+        """Upload several payloads to IPFS concurrently, preserving input order."""
+        if not payloads:
+            return []
+
+        workers = max(1, min(self.upload_workers, len(payloads)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(self.ipfs_client.upload_bytes, payloads))
 
     def __read_mappings(
         self, mapping_file_path: Union[str, Path]
@@ -125,7 +149,7 @@ class Processor:
                             f"Mappings file {mapping_file_path} is empty, returning empty dict"
                         )
                         return {}
-                    return json.loads(content)
+                    return orjson.loads(content)
             return {}
         except json.JSONDecodeError as e:
             self.logger.error(
@@ -143,22 +167,44 @@ class Processor:
             self.logger.error(f"Error reading mappings from {mapping_file_path}: {e}")
             return {}
 
+    def __load_mapping_sets(
+        self, mapping_file_path: Union[str, Path]
+    ) -> Dict[str, Set[str]]:
+        """Read a mappings file into a dictionary of sets."""
+        return {
+            pdf_cid: set(combinations)
+            for pdf_cid, combinations in self.__read_mappings(
+                mapping_file_path
+            ).items()
+        }
+
     def __write_mappings(
-        self, mappings: Dict[str, List[str]], mapping_file_path: Union[str, Path]
+        self, mappings: Dict[str, Set[str]], mapping_file_path: Union[str, Path]
     ) -> None:
-        """Write mappings to JSON file.
+        """Atomically write mappings to a compact JSON file.
 
         Args:
-            mappings: Dictionary mapping PDF CIDs to list of database combinations
+            mappings: Dictionary mapping PDF CIDs to sets of database combinations
             mapping_file_path: Path to the mappings JSON file
         """
+        tmp_path = f"{mapping_file_path}.{os.getpid()}.tmp"
         try:
             os.makedirs(os.path.dirname(str(mapping_file_path)), exist_ok=True)
-            with open(mapping_file_path, "w") as file:
-                json.dump(mappings, file, indent=2)
+            with open(tmp_path, "wb") as file:
+                file.write(
+                    orjson.dumps(
+                        {
+                            pdf_cid: sorted(combinations)
+                            for pdf_cid, combinations in mappings.items()
+                        }
+                    )
+                )
+            os.replace(tmp_path, mapping_file_path)
             self.logger.debug(f"Updated mappings in {mapping_file_path}")
         except Exception as e:
             self.logger.error(f"Error writing mappings to {mapping_file_path}: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
 
     def _query_ipfs_content(self, cid):
         """
@@ -251,7 +297,7 @@ class Processor:
 
                 # Try to parse the JSON response
                 try:
-                    metadata = json.loads(content)
+                    metadata = orjson.loads(content)
                     self.logger.info("Successfully extracted metadata using OpenRouter")
                     return metadata
                 except json.JSONDecodeError:
@@ -265,7 +311,7 @@ class Processor:
                         end_idx = content.rfind("}") + 1
                         if start_idx != -1 and end_idx != 0:
                             json_str = content[start_idx:end_idx]
-                            metadata = json.loads(json_str)
+                            metadata = orjson.loads(json_str)
                             self.logger.info(
                                 "Successfully parsed metadata from OpenRouter response"
                             )
@@ -329,13 +375,10 @@ class Processor:
 
         # Serialize metadata as JSON
         try:
-            metadata_json = json.dumps(extracted_metadata, indent=2)
-
-            # Write metadata to temporary file
-            self.__write_to_file(metadata_json, self.tmp_file_path)
+            metadata_json = orjson.dumps(extracted_metadata, option=orjson.OPT_INDENT_2)
 
             # Upload metadata to IPFS
-            metadata_cid = self.ipfs_client.upload_file(str(self.tmp_file_path))
+            metadata_cid = self.ipfs_client.upload_bytes(metadata_json)
 
             if not metadata_cid:
                 self.logger.error("Failed to upload metadata to IPFS")
@@ -355,41 +398,75 @@ class Processor:
             return None
 
     def __update_mappings(self, pdf_cid: str, db_combination: str) -> None:
-        """Update both global and user-specific mappings.
+        """Record a processed combination in the in-memory global and user mappings.
 
         Args:
             pdf_cid: The PDF CID that was processed
             db_combination: The database combination in format "converter_chunker_embedder"
         """
-        # Global mappings file
-        global_mappings_path = self.temp_dir / "mappings.json"
-        global_mappings = self.__read_mappings(global_mappings_path)
+        self._global_mappings.setdefault(pdf_cid, set()).add(db_combination)
+        self._user_mappings.setdefault(pdf_cid, set()).add(db_combination)
+        self._mappings_dirty = True
 
-        if pdf_cid not in global_mappings:
-            global_mappings[pdf_cid] = []
-        if db_combination not in global_mappings[pdf_cid]:
-            global_mappings[pdf_cid].append(db_combination)
+    def _flush_mappings(self) -> None:
+        """Write pending mapping updates to the global and user mappings files.
 
-        self.__write_mappings(global_mappings, global_mappings_path)
+        Other processors may have updated the files since they were loaded, so
+        each file is re-read and merged under a lock before being replaced.
+        """
+        if not self._mappings_dirty:
+            return
 
-        # User-specific mappings file
-        user_mappings_path = self.user_temp_dir / "mappings.json"
-        user_mappings = self.__read_mappings(user_mappings_path)
+        for mappings, mapping_file_path in (
+            (self._global_mappings, self.global_mappings_path),
+            (self._user_mappings, self.user_mappings_path),
+        ):
+            lock_path = Path(f"{mapping_file_path}.lock")
+            try:
+                with file_lock(lock_path):
+                    for pdf_cid, combinations in self.__load_mapping_sets(
+                        mapping_file_path
+                    ).items():
+                        mappings.setdefault(pdf_cid, set()).update(combinations)
+                    self.__write_mappings(mappings, mapping_file_path)
+            except TimeoutError as e:
+                self.logger.error(f"Error flushing mappings to {mapping_file_path}: {e}")
+                return
+
+        self._mappings_dirty = False
+
+    def _flush_graph(
+        self, nodes: List[str], relationships: List[Tuple[str, str, str]]
+    ) -> bool:
+        """Write the nodes and relationships collected during process() in one transaction.
 
-        if pdf_cid not in user_mappings:
-            user_mappings[pdf_cid] = []
-        if db_combination not in user_mappings[pdf_cid]:
-            user_mappings[pdf_cid].append(db_combination)
+        Args:
+            nodes: CIDs to add as IPFS nodes (duplicates are ignored)
+            relationships: List of tuples (source_cid, target_cid, relationship_type)
 
-        self.__write_mappings(user_mappings, user_mappings_path)
+        Returns:
+            True if the graph was written, False otherwise
+        """
+        unique_nodes = list(dict.fromkeys(nodes))
+        self.logger.info(
+            f"Writing {len(unique_nodes)} nodes and {len(relationships)} relationships to graph..."
+        )
+        return self.graph_db.write_graph_batch(unique_nodes, relationships)
 
-    def process(self, pdf_path: str, databases: List[dict]) -> None:
+    def process(self, pdf_path: str, databases: List[dict]) -> bool:
         """
         Processes the PDF according to the list of database configurations passed.
 
+        Graph writes for all database configurations are collected and flushed
+        once at the end, after which the processed combinations are recorded
+        in the mappings files.
+
         Args:
             pdf_path: Path to the input PDF
             databases: A list of configs, each containing a converter, chunker, and embedder
+
+        Returns:
+            True if the PDF was processed and recorded, False if it failed
         """
         doc_id = os.path.splitext(os.path.basename(pdf_path))[0]
         self.logger.info(f"Processing document: {doc_id}")
@@ -403,10 +480,22 @@ class Processor:
 
         if not metadata["pdf_ipfs_cid"]:
             self.logger.error(f"Failed to upload PDF to IPFS: {pdf_path}")
-            return
+            return False
+
+        # Graph writes are buffered for the whole document
+        graph_nodes: List[str] = [metadata["pdf_ipfs_cid"]]
+        graph_relationships: List[Tuple[str, str, str]] = []
 
-        self.logger.info(f"Adding PDF CID to graph: {metadata['pdf_ipfs_cid']}")
-        self.graph_db.add_ipfs_node(metadata["pdf_ipfs_cid"])
+        # Combinations to record in the mappings once the graph is written
+        completed_combinations: Set[str] = set()
+
+        # Combinations already processed for this PDF, looked up once
+        processed_combinations = self._global_mappings.get(
+            metadata["pdf_ipfs_cid"], set()
+        )
+
+        # Converted text CIDs for this document, keyed by converter
+        converted_cids: Dict[str, str] = {}
 
         # Handle metadata extraction and node creation
         metadata_cid = None
@@ -418,21 +507,18 @@ class Processor:
             db_combination = f"{converter_func}_{chunker_func}_{embedder_func}"
 
             # Check if this PDF + database combination already exists in global mappings
-            global_mappings_path = self.temp_dir / "mappings.json"
-            global_mappings = self.__read_mappings(global_mappings_path)
-
             self.logger.debug(
                 f"Checking if {db_combination} already exists for PDF CID {metadata['pdf_ipfs_cid']}"
             )
 
             if (
-                metadata["pdf_ipfs_cid"] in global_mappings
-                and db_combination in global_mappings[metadata["pdf_ipfs_cid"]]
+                db_combination in completed_combinations
+                or db_combination in processed_combinations
             ):
                 self.logger.info(
                     f"Skipping {db_combination} - already processed for this PDF"
                 )
-                self.__update_mappings(metadata["pdf_ipfs_cid"], db_combination)
+                completed_combinations.add(db_combination)
                 continue
 
             self.logger.info(f"Processing new combination: {db_combination}")
@@ -441,23 +527,27 @@ class Processor:
             all_authored_nodes = []
 
             # Step 2.1: Conversion
-            # Check if markdown conversion already exists for this PDF CID
-            converted_text_ipfs_cid = self.graph_db.get_converted_markdown_cid(
-                metadata["pdf_ipfs_cid"], converter_func
-            )
+            # Reuse a conversion made earlier for this document, otherwise
+            # check if markdown conversion already exists for this PDF CID
+            converted_text_ipfs_cid = converted_cids.get(converter_func)
 
-            # If the conversion already exists, use the existing conversion
-            if converted_text_ipfs_cid:
-                # Fetch converted text content from IPFS
-                converted_text = self._query_ipfs_content(converted_text_ipfs_cid)
-                if converted_text:
-                    self.convert_cache[converter_func] = converted_text
-                    self.logger.info("Using existing markdown conversion")
-                else:
-                    self.logger.warning(
-                        "Failed to fetch existing conversion content, performing new conversion"
-                    )
-                    converted_text_ipfs_cid = None  # Reset to trigger new conversion
+            if converted_text_ipfs_cid is None:
+                converted_text_ipfs_cid = self.graph_db.get_converted_markdown_cid(
+                    metadata["pdf_ipfs_cid"], converter_func
+                )
+
+                # If the conversion already exists, use the existing conversion
+                if converted_text_ipfs_cid:
+                    # Fetch converted text content from IPFS
+                    converted_text = self._query_ipfs_content(converted_text_ipfs_cid)
+                    if converted_text:
+                        self.convert_cache[converter_func] = converted_text
+                        self.logger.info("Using existing markdown conversion")
+                    else:
+                        self.logger.warning(
+                            "Failed to fetch existing conversion content, performing new conversion"
+                        )
+                        converted_text_ipfs_cid = None  # Reset to trigger new conversion
 
             # If no existing conversion was found or content could not be fetched, perform conversion
             if not converted_text_ipfs_cid or converter_func not in self.convert_cache:
@@ -472,21 +562,21 @@ class Processor:
                 else:
                     converted_text = self.convert_cache[converter_func]
 
-                # Upload converted text to IPFS and commit to Git
-                self.__write_to_file(converted_text, self.tmp_file_path)
+                # Upload converted text to IPFS
+                converted_text_ipfs_cid = self.ipfs_client.upload_text(converted_text)
 
-                converted_text_ipfs_cid = self.ipfs_client.upload_file(
-                    self.tmp_file_path
-                )
-
-                self.graph_db.add_ipfs_node(converted_text_ipfs_cid)
-                self.graph_db.create_relationship(
-                    metadata["pdf_ipfs_cid"],
-                    converted_text_ipfs_cid,
-                    "CONVERTED_BY_" + converter_func,
+                graph_nodes.append(converted_text_ipfs_cid)
+                graph_relationships.append(
+                    (
+                        metadata["pdf_ipfs_cid"],
+                        converted_text_ipfs_cid,
+                        "CONVERTED_BY_" + converter_func,
+                    )
                 )
                 all_authored_nodes.append(converted_text_ipfs_cid)
 
+            converted_cids[converter_func] = converted_text_ipfs_cid
+
             # Step 2.1.5: Handle metadata creation (only once per document)
             if metadata_cid is None:
                 self.logger.info("Creating or retrieving metadata node...")
@@ -515,83 +605,179 @@ class Processor:
                 chunked_text = self.chunk_cache[chunk_cache_key]
                 self.logger.debug(f"Using cached chunks for {chunk_cache_key}")
 
-            # Step 2.2.1: Process all chunks and get their CIDs
-            chunk_cids = []
-            self.logger.info(f"Processing {len(chunked_text)} chunks...")
-
-            for chunk_i in chunked_text:
-                self.__write_to_file(chunk_i, self.tmp_file_path)
-
-                chunk_text_ipfs_cid = self.ipfs_client.upload_file(self.tmp_file_path)
-                chunk_cids.append(chunk_text_ipfs_cid)
+            # Identical chunks (repeated headers, footers, boilerplate) map to the
+            # same CID, so each distinct chunk is only uploaded and embedded once
+            unique_chunks = list(dict.fromkeys(chunked_text))
+            if len(unique_chunks) < len(chunked_text):
+                self.logger.info(
+                    f"Skipping {len(chunked_text) - len(unique_chunks)} duplicate chunks"
+                )
 
-            # Batch add all chunk nodes to graph
-            self.logger.info(f"Adding {len(chunk_cids)} chunk nodes to graph...")
-            self.graph_db.add_ipfs_nodes_batch(chunk_cids)
+            # Step 2.2.1: Upload all chunks concurrently and get their CIDs
+            self.logger.info(f"Processing {len(unique_chunks)} chunks...")
+            chunk_cids = self._upload_many(
+                [chunk_i.encode("utf-8") for chunk_i in unique_chunks]
+            )
 
-            # Add chunk CIDs to authored nodes list
+            graph_nodes.extend(chunk_cids)
             all_authored_nodes.extend(chunk_cids)
 
-            # Create CHUNKED_BY relationships for chunks
-            chunk_relationships = []
-            for chunk_cid in chunk_cids:
-                chunk_relationships.append(
-                    (converted_text_ipfs_cid, chunk_cid, f"CHUNKED_BY_{chunker_func}")
+            # CHUNKED_BY relationships for chunks
+            graph_relationships.extend(
+                (converted_text_ipfs_cid, chunk_cid, f"CHUNKED_BY_{chunker_func}")
+                for chunk_cid in chunk_cids
+            )
+            # Step 2.3: Batch Embedding (only chunks missing from the embedding cache)
+            embedding_model = self._embedding_cache_model(embedder_func)
+            chunk_hashes = [content_hash(chunk_i) for chunk_i in unique_chunks]
+            embedding_cids: List[Optional[str]] = [None] * len(unique_chunks)
+            missing_indices = []
+
+            for i, chunk_hash in enumerate(chunk_hashes):
+                cached = self.embedding_cache.get(
+                    chunk_hash, embedder_func, embedding_model
                 )
+                if cached:
+                    embedding_cids[i] = cached[1]
+                else:
+                    missing_indices.append(i)
 
             self.logger.info(
-                f"Creating {len(chunk_relationships)} CHUNKED_BY relationships..."
+                f"Embedding cache: {len(unique_chunks) - len(missing_indices)} hits, "
+                f"{len(missing_indices)} misses"
             )
-            self.graph_db.create_relationships_batch(chunk_relationships)
 
-            # Step 2.3: Batch Embedding
-            self.logger.info(
-                f"Batch processing embeddings for {len(chunked_text)} chunks..."
-            )
-            embeddings = embed_batch(
-                embeder_type=embedder_func,
-                input_texts=chunked_text,
-                batch_size=32,
-                user_email=self.user_email,
-            )
-
-            # Step 2.4: Create embedding relationships
-            embedding_cids = []
-            for embedding in embeddings:
-                self.__write_to_file(json.dumps(embedding), self.tmp_file_path)
-
-                embedding_ipfs_cid = self.ipfs_client.upload_file(self.tmp_file_path)
-                embedding_cids.append(embedding_ipfs_cid)
+            if missing_indices:
+                self.logger.info(
+                    f"Batch processing embeddings for {len(missing_indices)} chunks..."
+                )
+                embeddings = embed_batch(
+                    embeder_type=embedder_func,
+                    input_texts=[unique_chunks[i] for i in missing_indices],
+                    user_email=self.user_email,
+                )
 
-            # Batch add all embedding nodes to graph
-            self.logger.info(
-                f"Adding {len(embedding_cids)} embedding nodes to graph..."
-            )
-            self.graph_db.add_ipfs_nodes_batch(embedding_cids)
+                # Step 2.4: Upload new embeddings and remember them in the cache
+                uploaded_cids = self._upload_many(
+                    encode_embeddings(embeddings, self.embedding_dtype)
+                )
+                for i, embedding, embedding_ipfs_cid in zip(
+                    missing_indices, embeddings, uploaded_cids
+                ):
+                    embedding_cids[i] = embedding_ipfs_cid
+                    if embedding_ipfs_cid:
+                        self.embedding_cache.put(
+                            chunk_hashes[i],
+                            embedder_func,
+                            embedding_model,
+                            embedding,
+                            embedding_ipfs_cid,
+                        )
 
-            # Add embedding CIDs to authored nodes list
+            graph_nodes.extend(embedding_cids)
             all_authored_nodes.extend(embedding_cids)
 
-            # Create EMBEDDED_BY relationships for embeddings
-            embedding_relationships = []
-            for chunk_cid, embedding_cid in zip(chunk_cids, embedding_cids):
-                embedding_relationships.append(
-                    (chunk_cid, embedding_cid, f"EMBEDDED_BY_{embedder_func}")
-                )
-
-            self.logger.info(
-                f"Creating {len(embedding_relationships)} EMBEDDED_BY relationships..."
+            # EMBEDDED_BY relationships for embeddings
+            graph_relationships.extend(
+                (chunk_cid, embedding_cid, f"EMBEDDED_BY_{embedder_func}")
+                for chunk_cid, embedding_cid in zip(chunk_cids, embedding_cids)
             )
-            self.graph_db.create_relationships_batch(embedding_relationships)
 
-            # Create all AUTHORED_BY relationships in one batch
-            authored_relationships = [
+            # AUTHORED_BY relationships for everything created in this combination
+            graph_relationships.extend(
                 (node_cid, self.author_cid, "AUTHORED_BY")
                 for node_cid in all_authored_nodes
-            ]
-            self.logger.info(
-                f"Creating {len(authored_relationships)} AUTHORED_BY relationships in one batch..."
             )
-            self.graph_db.create_relationships_batch(authored_relationships)
 
+            completed_combinations.add(db_combination)
+
+        if not self._flush_graph(graph_nodes, graph_relationships):
+            self.logger.error(
+                f"Failed to write graph for {doc_id}; not recording it as processed"
+            )
+            return False
+
+        for db_combination in completed_combinations:
             self.__update_mappings(metadata["pdf_ipfs_cid"], db_combination)
+        self._flush_mappings()
+        return True
+
+
+# Processor owned by the current worker process (see process_many)
+_worker_processor: Optional[Processor] = None
+
+
+def _init_worker(
+    author_public_key: str, user_email: str, project_root: Optional[Path]
+) -> None:
+    """Build the Processor used by a process_many worker."""
+    global _worker_processor
+    _worker_processor = Processor(
+        authorPublicKey=author_public_key,
+        user_email=user_email,
+        project_root=project_root,
+    )
+
+
+def _worker_process(
+    pdf_path: str, databases: List[dict]
+) -> Tuple[str, bool, Optional[str]]:
+    """Process one PDF with the worker's Processor."""
+    try:
+        if not _worker_processor.process(pdf_path=pdf_path, databases=databases):
+            return pdf_path, False, "Processing failed, see the processor logs"
+        return pdf_path, True, None
+    except Exception as e:
+        return pdf_path, False, str(e)
+
+
+def process_many(
+    pdf_paths: List[str],
+    databases: List[dict],
+    author_public_key: str,
+    user_email: str,
+    project_root: Optional[Path] = None,
+    max_workers: Optional[int] = None,
+) -> List[Tuple[str, bool, Optional[str]]]:
+    """
+    Process several PDFs in parallel worker processes.
+
+    Each worker builds one Processor and keeps its converter models loaded
+    for all the PDFs it handles, so conversion is not serialized on the
+    in-process converter locks.
+
+    Args:
+        pdf_paths: Paths to the input PDFs
+        databases: A list of configs, each containing a converter, chunker, and embedder
+        author_public_key: Public key of the author
+        user_email: Email of the user for creating user-specific folders
+        project_root: Path to project root directory
+        max_workers: Number of worker processes (defaults to PROCESSOR_WORKERS, or 2)
+
+    Returns:
+        List of (pdf_path, success, error) tuples in completion order
+    """
+    if not pdf_paths:
+        return []
+
+    workers = max_workers or int(os.getenv("PROCESSOR_WORKERS", "2"))
+    workers = max(1, min(workers, len(pdf_paths)))
+
+    # CUDA and the Neo4j driver are not fork-safe, so always spawn workers
+    mp_context = multiprocessing.get_context("spawn")
+
+    results = []
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=mp_context,
+        initializer=_init_worker,
+        initargs=(author_public_key, user_email, project_root),
+    ) as executor:
+        futures = [
+            executor.submit(_worker_process, str(pdf_path), databases)
+            for pdf_path in pdf_paths
+        ]
+        for future in as_completed(futures):
+            results.append(future.result())
+
+    return results
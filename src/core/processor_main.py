@@ -7,14 +7,14 @@ PDF processing, conversion, chunking, embedding, and storage in various database
 
 import os
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List
 
+import anyio
 import yaml
 from dotenv import load_dotenv
 
-from src.core.processor import Processor
+from src.core.processor import Processor, process_many
 from src.utils.logging_utils import get_logger, get_user_logger
 
 # Get module logger
@@ -27,8 +27,17 @@ PROJECT_ROOT = Path(__file__).parent.parent.parent
 # Parent directory of the project (coophive folder)
 COOPHIVE_DIR = PROJECT_ROOT.parent
 
-# Create a thread pool executor for CPU-intensive tasks
-_thread_pool = ThreadPoolExecutor(max_workers=2)
+# At most this many papers are processed in worker threads at once
+MAX_CONCURRENT_PAPERS = 2
+_processing_limiter = None
+
+
+def _get_processing_limiter() -> anyio.CapacityLimiter:
+    """Return the limiter that bounds concurrent paper processing, creating it inside the event loop."""
+    global _processing_limiter
+    if _processing_limiter is None:
+        _processing_limiter = anyio.CapacityLimiter(MAX_CONCURRENT_PAPERS)
+    return _processing_limiter
 
 
 def load_config():
@@ -82,17 +91,21 @@ def test_processor():
         db_name = f"{converter}_{chunker}_{embedder}"
         db_config["db_name"] = db_name
 
-    processor = Processor(
-        authorPublicKey=author_config["public_key"],
-        user_email=author_config["email"],
-        project_root=PROJECT_ROOT,
-    )
-
     try:
-        for paper in papers:
-            logger.info(f"Processing {paper}...")
+        logger.info(f"Processing {len(papers)} papers...")
+        results = process_many(
+            pdf_paths=papers,
+            databases=databases,
+            author_public_key=author_config["public_key"],
+            user_email=author_config["email"],
+            project_root=PROJECT_ROOT,
+        )
 
-            processor.process(pdf_path=paper, databases=databases)
+        for paper, success, error in results:
+            if success:
+                logger.info(f"Processed {paper}")
+            else:
+                logger.error(f"Error processing {paper}: {error}")
 
         # Clean up: Delete all PDF files after processing
         logger.info("Starting cleanup: Deleting processed PDF files...")
@@ -122,7 +135,8 @@ def _process_single_paper_sync(processor, paper_path, databases):
     This runs in a separate thread to avoid blocking the event loop.
     """
     try:
-        processor.process(pdf_path=str(paper_path), databases=databases)
+        if not processor.process(pdf_path=str(paper_path), databases=databases):
+            return False, "Processing failed, see the processor logs"
         return True, None
     except Exception as e:
         return False, str(e)
@@ -192,13 +206,12 @@ async def process_combination(
 
         try:
             # Run the CPU-intensive processing in a separate thread
-            loop = asyncio.get_event_loop()
-            success, error = await loop.run_in_executor(
-                _thread_pool,
+            success, error = await anyio.to_thread.run_sync(
                 _process_single_paper_sync,
                 processor,
                 paper_path,
                 databases,
+                limiter=_get_processing_limiter(),
             )
 
             if success:
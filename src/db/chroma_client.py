@@ -5,10 +5,28 @@ ChromaDB is used as the vector database for storing and querying document embedd
 """
 
 import os
+from collections import defaultdict
 from pathlib import Path
-from typing import Optional, List
+from typing import Callable, Optional, Sequence, Union
 
 import chromadb
+import numpy as np
+
+from src.utils.logging_utils import get_logger
+
+# Get module logger
+logger = get_logger(__name__)
+
+# Default number of buffered single-document inserts sent per collection.add call
+DEFAULT_INSERT_BATCH_SIZE = 250
+
+# Number of entries fetched per page when listing collection metadata
+METADATA_PAGE_SIZE = 10_000
+
+
+def _empty_buffer() -> dict:
+    """Returns an empty insert buffer for one collection."""
+    return {"embeddings": [], "ids": [], "metadatas": []}
 
 
 class VectorDatabaseManager:
@@ -19,7 +37,12 @@ class VectorDatabaseManager:
     collections, which are used to store document embeddings.
     """
 
-    def __init__(self, db_names: List[str], db_path: Optional[str] = None):
+    def __init__(
+        self,
+        db_names: Sequence[str],
+        db_path: Optional[str] = None,
+        batch_size: int = DEFAULT_INSERT_BATCH_SIZE,
+    ):
         """
         Initializes databases based on the provided list of database names.
 
@@ -27,14 +50,20 @@ class VectorDatabaseManager:
             db_names: A list of database names to create (e.g., ['openai_paragraph_openai', 'marker_sentence_bge']).
             db_path: Optional path to the database directory. If not provided,
                     will use the default 'database' directory in the src package.
+            batch_size: Number of documents buffered by insert_document before
+                    they are written to the collection.
 
         Raises:
             ValueError: If db_names is empty or not a list.
         """
-        if not isinstance(db_names, list) or not db_names:
+        if not isinstance(db_names, (list, tuple)) or not db_names:
             raise ValueError("db_names must be a non-empty list of database names.")
 
-        self.db_names = db_names
+        # Keep the order for iteration and a set for membership checks on every insert
+        self.db_names = tuple(db_names)
+        self._db_name_set = frozenset(db_names)
+        self._batch_size = max(1, batch_size)
+        self._buffers = defaultdict(_empty_buffer)
 
         # Use the provided db_path or create a default path
         if db_path is None:
@@ -54,85 +83,194 @@ class VectorDatabaseManager:
         """
         Initializes or checks the existence of all databases (Cartesian product of convert, chunker, and embedder).
         """
-        for db_name in self.db_names:
-            self.db_client.get_or_create_collection(name=db_name)
+        self._collections = {
+            db_name: self.db_client.get_or_create_collection(name=db_name)
+            for db_name in self.db_names
+        }
+
+    def _get_collection(self, db_name: str):
+        """Returns the cached collection handle, fetching it on first use."""
+        collection = self._collections.get(db_name)
+        if collection is None:
+            collection = self.db_client.get_or_create_collection(name=db_name)
+            self._collections[db_name] = collection
+        return collection
 
     def insert_document(
-        self, db_name: str, embedding: list, metadata: dict, doc_id: str
+        self,
+        db_name: str,
+        embedding: Union[np.ndarray, list],
+        metadata: dict,
+        doc_id: str,
     ):
         """
         Inserts a document into the specified database.
 
+        Documents are buffered and written in batches of batch_size; call
+        flush() to write any remaining buffered documents. If writing a batch
+        fails, the error is raised from the call that triggered the write.
+
         :param db_name: Name of the database where the document is to be inserted.
         :param embedding: The embedding of the document chunk to insert.
         :param metadata: Metadata associated with the document chunk.
         :param doc_id: Document ID to use for insertion.
         """
-        if db_name not in self.db_names:
+        if db_name not in self._db_name_set:
             raise ValueError(f"Database '{db_name}' does not exist.")
 
-        # Insert document into the database
-        collection = self.db_client.get_collection(name=db_name)
+        buffer = self._buffers[db_name]
+        buffer["embeddings"].append(np.asarray(embedding, dtype=np.float32).ravel())
+        buffer["ids"].append(doc_id)
+        buffer["metadatas"].append(metadata)
+        self._maybe_flush(db_name)
+
+    def _maybe_flush(self, db_name: str):
+        """Writes the buffer for a database once it reaches the batch size."""
+        if len(self._buffers[db_name]["ids"]) >= self._batch_size:
+            self._flush_buffer(db_name)
+
+    def _flush_buffer(self, db_name: str):
+        """
+        Writes and clears the insert buffer for a single database.
+
+        Raises:
+            Exception: If the buffered documents could not be written. The
+                documents are dropped from the buffer, so the error names how
+                many were lost.
+        """
+        buffer = self._buffers.pop(db_name, None)
+        if not buffer or not buffer["ids"]:
+            return
+
         try:
-            collection.add(
-                documents=[metadata["content_cid"]],
-                embeddings=embedding,
-                ids=[doc_id],
-                metadatas=[metadata],
+            buffer["embeddings"] = np.vstack(buffer["embeddings"])
+            self._get_collection(db_name).add(**buffer)
+        except Exception as e:
+            logger.error(
+                f"Error inserting {len(buffer['ids'])} buffered documents into database '{db_name}': {e}"
             )
+            raise Exception(
+                f"Error inserting {len(buffer['ids'])} buffered documents into database '{db_name}': {e}"
+            ) from e
+
+    def flush(self, db_name: Optional[str] = None):
+        """
+        Writes buffered documents to their collections.
+
+        When flushing every database, the remaining databases are still
+        written if one fails, and the first error is raised afterwards.
+
+        :param db_name: Database to flush. If None, all buffers are flushed.
+        """
+        if db_name is not None:
+            self._flush_buffer(db_name)
+            return
+
+        first_error = None
+        for name in list(self._buffers):
+            try:
+                self._flush_buffer(name)
+            except Exception as e:
+                first_error = first_error or e
+        if first_error is not None:
+            raise first_error
+
+    def close(self):
+        """Flushes all buffered documents."""
+        self.flush()
+
+    def __del__(self):
+        """Flushes buffered documents when the manager is garbage collected."""
+        # __init__ may have raised before the buffers were created
+        if not getattr(self, "_buffers", None):
+            return
+        try:
+            self.flush()
         except Exception as e:
-            print(f"Error inserting document into database '{db_name}': {e}")
+            # Exceptions cannot propagate out of __del__; _flush_buffer has
+            # already logged which database lost documents
+            logger.error(f"Buffered documents were lost when the manager was garbage collected: {e}")
 
     def batch_insert_documents(
-        self, db_name: str, embeddings: list, metadatas: list, doc_ids: list
+        self,
+        db_name: str,
+        embeddings: Union[np.ndarray, list],
+        metadatas: list,
+        doc_ids: list,
+        content_cids: Optional[list] = None,
     ):
         """
         Batch inserts multiple documents into the specified database in a single transaction.
 
         :param db_name: Name of the database where the documents are to be inserted.
-        :param embeddings: List of embeddings for the document chunks.
+        :param embeddings: Embeddings for the document chunks, as an (N, D) array or a list of
+            vectors. Lists are converted to a single float32 array; arrays are passed through.
         :param metadatas: List of metadata dicts associated with the document chunks.
         :param doc_ids: List of document IDs to use for insertion.
+        :param content_cids: Optional content CIDs to store as Chroma documents. Only needed
+            when the collection must hold documents; the CIDs are taken as given, not
+            extracted from the metadata.
         """
-        if db_name not in self.db_names:
+        if db_name not in self._db_name_set:
             raise ValueError(f"Database '{db_name}' does not exist.")
 
         if not (len(embeddings) == len(metadatas) == len(doc_ids)):
             raise ValueError("All input lists must have the same length.")
 
-        if not embeddings:
+        if content_cids is not None and len(content_cids) != len(doc_ids):
+            raise ValueError("All input lists must have the same length.")
+
+        if len(embeddings) == 0:
             return  # Nothing to insert
 
-        # Extract documents from metadata
-        documents = [metadata["content_cid"] for metadata in metadatas]
+        if not isinstance(embeddings, np.ndarray):
+            embeddings = np.asarray(embeddings, dtype=np.float32)
+        if embeddings.ndim != 2:
+            raise ValueError("Embeddings must be a 2-D array of shape (N, D).")
+
+        # Keep insertion order when single-document inserts are still buffered
+        self.flush(db_name)
 
         # Batch insert all documents into the database
-        collection = self.db_client.get_collection(name=db_name)
+        collection = self._get_collection(db_name)
         try:
             collection.add(
-                documents=documents,
                 embeddings=embeddings,
                 ids=doc_ids,
                 metadatas=metadatas,
+                **({"documents": content_cids} if content_cids is not None else {}),
             )
         except Exception as e:
             raise Exception(
                 f"Error batch inserting documents into database '{db_name}': {e}"
             )
 
-    def print_all_metadata(self):
+    def print_all_metadata(self, writer: Optional[Callable[[object], None]] = None):
         """
         Retrieves and prints all metadata from every collection.
+
+        Collections are read in pages of METADATA_PAGE_SIZE entries so memory
+        use stays bounded however large a collection is.
+
+        :param writer: Callable used to output each line. Defaults to print.
         """
+        writer = writer or print
         for db_name in self.db_names:
-            collection = self.db_client.get_collection(name=db_name)
-            # Retrieve all entries from the collection.
-            # The structure of the returned results is assumed to contain a "metadatas" key.
-            results = collection.get()
-            metadatas = results.get("metadatas", [])
-            print(f"\nMetadata for collection '{db_name}':")
-            if not metadatas:
-                print("  No metadata found.")
-            else:
+            collection = self._get_collection(db_name)
+            writer(f"\nMetadata for collection '{db_name}':")
+
+            offset = 0
+            while True:
+                results = collection.get(
+                    include=["metadatas"], limit=METADATA_PAGE_SIZE, offset=offset
+                )
+                metadatas = results.get("metadatas") or []
                 for metadata in metadatas:
-                    print(metadata)
+                    writer(metadata)
+
+                offset += len(metadatas)
+                if len(metadatas) < METADATA_PAGE_SIZE:
+                    break
+
+            if offset == 0:
+                writer("  No metadata found.")
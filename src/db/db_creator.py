@@ -8,6 +8,7 @@ with scientific document data for the system.
 import json
 import os
 
+import orjson
 import requests
 from dotenv import load_dotenv
 
@@ -39,6 +40,10 @@ class DatabaseCreator:
         self.user_email = user_email
         self.light_server_url = os.getenv("LIGHT_SERVER_URL", "http://localhost:5001")
 
+        # PDF CID -> metadata, so each document's metadata is fetched once
+        # no matter how many database combinations are built from it
+        self._metadata_cache = {}
+
         # Use user-specific logger if user_email is provided
         if user_email:
             self.logger = get_user_logger(user_email, "database_creator")
@@ -99,12 +104,30 @@ class DatabaseCreator:
         """
         Retrieve metadata for a given PDF CID.
 
+        Successful lookups are cached for the lifetime of the DatabaseCreator.
+        List and dict values are converted to strings for ChromaDB compatibility
+        before caching, so callers can use the result as-is.
+
         Args:
             pdf_cid: The PDF CID to get metadata for
 
         Returns:
             Dictionary containing metadata or None if not found
         """
+        if pdf_cid in self._metadata_cache:
+            return self._metadata_cache[pdf_cid]
+
+        metadata = self._fetch_pdf_metadata(pdf_cid)
+        if metadata is not None:
+            metadata = {
+                key: str(value) if isinstance(value, (list, dict)) else value
+                for key, value in metadata.items()
+            }
+            self._metadata_cache[pdf_cid] = metadata
+        return metadata
+
+    def _fetch_pdf_metadata(self, pdf_cid):
+        """Look up the metadata node for a PDF CID and retrieve its content."""
         try:
             # Get metadata CID from graph database
             metadata_cid = self.graph.get_existing_metadata_cid(pdf_cid)
@@ -133,7 +156,7 @@ class DatabaseCreator:
                 if metadata_cid in result.get("contents", {}):
                     metadata_json = result["contents"][metadata_cid]
                     try:
-                        metadata = json.loads(metadata_json)
+                        metadata = orjson.loads(metadata_json)
                         self.logger.debug(
                             f"Retrieved metadata for PDF {pdf_cid}: {metadata.get('title', 'Unknown Title')}"
                         )
@@ -254,11 +277,6 @@ class DatabaseCreator:
                 **(pdf_metadata if pdf_metadata else {}),
             }
 
-            # Convert lists and dicts to strings for ChromaDB compatibility
-            for key, value in metadata.items():
-                if isinstance(value, (list, dict)):
-                    metadata[key] = str(value)
-
             # Add to batch lists with unique ID
             batch_embeddings.append(embedding_vector)
             batch_metadatas.append(metadata)
@@ -6,7 +6,8 @@ and operations related to IPFS content identifiers (CIDs).
 """
 
 import os
-from typing import List, Tuple, Optional
+import threading
+from typing import Dict, List, Tuple, Optional
 
 import certifi
 from neo4j import GraphDatabase
@@ -16,6 +17,20 @@ from src.utils.logging_utils import get_logger
 # Get module logger
 logger = get_logger(__name__)
 
+# Maximum number of rows sent in a single UNWIND statement
+UNWIND_BATCH_SIZE = 5000
+
+_ssl_cert_file_set = False
+
+
+def ensure_ssl_cert_file():
+    """Point SSL_CERT_FILE at the certifi bundle, once per process."""
+    global _ssl_cert_file_set
+
+    if not _ssl_cert_file_set:
+        os.environ.setdefault("SSL_CERT_FILE", certifi.where())
+        _ssl_cert_file_set = True
+
 
 class IPFSNeo4jGraph:
     """
@@ -58,13 +73,14 @@ class IPFSNeo4jGraph:
             raise ValueError(error_msg)
 
         try:
-            os.environ["SSL_CERT_FILE"] = certifi.where()
+            ensure_ssl_cert_file()
 
             self.driver = GraphDatabase.driver(
                 self.uri, auth=(self.username, self.password), encrypted=False
             )
             self.driver.verify_connectivity()
             self.logger.info(f"Connected to Neo4j at {self.uri}")
+            self._cid_index_ready = False
         except Exception as e:
             self.logger.error(f"Failed to connect to Neo4j: {e}")
             raise
@@ -128,29 +144,84 @@ class IPFSNeo4jGraph:
         if not relationships:
             return
 
+        self.write_graph_batch([], relationships)
+
+    def write_graph_batch(
+        self, cids: List[str], relationships: List[Tuple[str, str, str]]
+    ) -> bool:
+        """
+        Merge nodes and relationships in a single write transaction.
+
+        Nodes are merged with one UNWIND statement and relationships with one
+        UNWIND statement per relationship type (types cannot be parameterized),
+        each split into chunks of UNWIND_BATCH_SIZE rows.
+
+        Args:
+            cids: IPFS CIDs to merge as nodes
+            relationships: List of tuples (source_cid, target_cid, relationship_type)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not cids and not relationships:
+            return True
+
         # Group relationships by type for more efficient querying
-        relationships_by_type = {}
+        relationships_by_type: Dict[str, List[Tuple[str, str]]] = {}
         for source, target, rel_type in relationships:
-            if rel_type not in relationships_by_type:
-                relationships_by_type[rel_type] = []
-            relationships_by_type[rel_type].append((source, target))
+            relationships_by_type.setdefault(rel_type, []).append((source, target))
+
+        self._ensure_cid_index()
 
         try:
             with self.driver.session() as session:
-                for rel_type, pairs in relationships_by_type.items():
-                    # Use UNWIND to process multiple relationships of the same type
-                    query = f"""
-                        UNWIND $pairs AS pair
-                        MERGE (a:IPFS {{cid: pair[0]}})
-                        MERGE (b:IPFS {{cid: pair[1]}})
-                        MERGE (a)-[:{rel_type}]->(b)
-                    """
-                    session.run(query, pairs=pairs)
-                    self.logger.info(
-                        f"Batch created {len(pairs)} relationships of type {rel_type}"
-                    )
+                session.execute_write(
+                    self._write_graph_batch_tx, cids, relationships_by_type
+                )
+            self.logger.info(
+                f"Batch wrote {len(cids)} nodes and {len(relationships)} relationships"
+            )
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to batch write graph: {e}")
+            return False
+
+    @staticmethod
+    def _write_graph_batch_tx(
+        tx, cids: List[str], relationships_by_type: Dict[str, List[Tuple[str, str]]]
+    ) -> None:
+        """Transaction function for write_graph_batch."""
+        for i in range(0, len(cids), UNWIND_BATCH_SIZE):
+            tx.run(
+                """
+                UNWIND $cids AS cid
+                MERGE (:IPFS {cid: cid})
+                """,
+                cids=cids[i: i + UNWIND_BATCH_SIZE],
+            )
+
+        for rel_type, pairs in relationships_by_type.items():
+            # Use UNWIND to process multiple relationships of the same type
+            query = f"""
+                UNWIND $pairs AS pair
+                MERGE (a:IPFS {{cid: pair[0]}})
+                MERGE (b:IPFS {{cid: pair[1]}})
+                MERGE (a)-[:{rel_type}]->(b)
+            """
+            for i in range(0, len(pairs), UNWIND_BATCH_SIZE):
+                tx.run(query, pairs=pairs[i: i + UNWIND_BATCH_SIZE])
+
+    def _ensure_cid_index(self) -> None:
+        """Create the index on :IPFS(cid) that MERGE relies on, once per instance."""
+        if self._cid_index_ready:
+            return
+
+        try:
+            with self.driver.session() as session:
+                session.run("CREATE INDEX ipfs_cid IF NOT EXISTS FOR (n:IPFS) ON (n.cid)")
+            self._cid_index_ready = True
         except Exception as e:
-            self.logger.error(f"Failed to batch create relationships: {e}")
+            self.logger.warning(f"Could not ensure index on :IPFS(cid): {e}")
 
     def query_graph(self):
         """Retrieve all nodes and relationships."""
@@ -303,11 +374,11 @@ class IPFSNeo4jGraph:
             True if successful, False otherwise
         """
         try:
-            # Add metadata node to graph
-            self.add_ipfs_node(metadata_cid)
-
-            # Create relationship between PDF and metadata
-            self.create_relationship(pdf_cid, metadata_cid, "HAS_METADATA")
+            # Add metadata node and its relationship to the PDF in one transaction
+            if not self.write_graph_batch(
+                [metadata_cid], [(pdf_cid, metadata_cid, "HAS_METADATA")]
+            ):
+                return False
 
             self.logger.info(
                 f"Created metadata node {metadata_cid} linked to PDF {pdf_cid}"
@@ -337,3 +408,27 @@ class IPFSNeo4jGraph:
             "citation": "Unknown Authors. (Unknown Date). Unknown Title. Unknown Journal. No DOI available",
             "pdf_filename": "Unknown Filename",
         }
+
+
+# Singleton instance shared by every Processor in the process
+_graph_db: Optional[IPFSNeo4jGraph] = None
+_graph_db_lock = threading.Lock()
+
+
+def get_graph_db() -> IPFSNeo4jGraph:
+    """
+    Get or create the singleton Neo4j graph instance.
+
+    The connection parameters are read from the NEO4J_* environment variables.
+    The Neo4j driver is thread-safe, so the instance can be shared freely.
+
+    Returns:
+        IPFSNeo4jGraph instance
+    """
+    global _graph_db
+
+    with _graph_db_lock:
+        if _graph_db is None:
+            _graph_db = IPFSNeo4jGraph()
+
+    return _graph_db
@@ -8,6 +8,7 @@ of document processing and query results.
 import json
 import os
 import time
+import uuid
 from pathlib import Path
 from typing import Any, Dict, Optional
 
@@ -75,15 +76,16 @@ class EvaluationAgent:
             get_user_logger(user_email, "evaluation_agent") if user_email else logger
         )
 
-        timestamp = int(time.time())
+        # The server runs queries concurrently, so the timestamp alone is not unique
+        file_id = f"{int(time.time())}_{uuid.uuid4().hex[:8]}"
 
         # Use user-specific temp directory if user_email is provided
         if user_email:
             user_temp_dir = self.temp_dir / user_email / "evaluation"
             os.makedirs(user_temp_dir, exist_ok=True)
-            results_file = user_temp_dir / f"query_results_{timestamp}.json"
+            results_file = user_temp_dir / f"query_results_{file_id}.json"
         else:
-            results_file = self.temp_dir / f"query_results_{timestamp}.json"
+            results_file = self.temp_dir / f"query_results_{file_id}.json"
 
         # Auto-discover collections if not provided and user_email is available
         user_logger.info(f"Auto-discovering collections for user: {user_email}")
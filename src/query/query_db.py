@@ -130,21 +130,23 @@ def query_collection(collection_name, user_query, db_path=None, user_email=None,
         values = collection.query(
             query_embeddings=[embedding],
             n_results=k,
-            include=["metadatas", "documents", "distances"],
+            include=["metadatas", "distances"],
         )
 
         result = {"query": user_query, "results": []}
 
         if values["ids"] and len(values["ids"][0]) > 0:
             for i in range(len(values["ids"][0])):
+                metadata = (
+                    values["metadatas"][0][i]
+                    if i < len(values["metadatas"][0])
+                    else {}
+                )
                 result["results"].append(
                     {
-                        "document": values["documents"][0][i]
-                        if i < len(values["documents"][0])
-                        else "",
-                        "metadata": values["metadatas"][0][i]
-                        if i < len(values["metadatas"][0])
-                        else {},
+                        # Documents are not stored separately; the content CID lives in the metadata
+                        "document": metadata.get("content_cid", ""),
+                        "metadata": metadata,
                         "distance": values["distances"][0][i]
                         if i < len(values["distances"][0])
                         else 0,
@@ -5,6 +5,7 @@ This module provides test functions for the token reward system,
 allowing verification of token distribution functionality.
 """
 
+import logging
 import os
 from pathlib import Path
 
@@ -113,11 +114,13 @@ def run_reward_users():
         # Create the database if it doesn't exist
         rewarder._create_database_and_table(db_name)
 
-        # Add rewards for each author
-        for author, jobs in author_jobs.items():
-            logger.info(f"Adding rewards for author {author}: {jobs} jobs")
-            rewarder.add_reward_to_user(author, db_name, jobs)
+        # Add rewards for all authors in one batch
+        if logger.isEnabledFor(logging.INFO):
+            for author, jobs in author_jobs.items():
+                logger.info("Adding rewards for author %s: %s jobs", author, jobs)
+        rewarder.batch_add_rewards(db_name, author_jobs.items())
 
+    rewarder.close()
     logger.info("Token reward test completed")
 
 
@@ -5,15 +5,30 @@ This module provides a TokenRewarder class for calculating and distributing
 rewards to users based on their contributions to the system.
 """
 
+import asyncio
+import atexit
+import csv
+import functools
+import io
 import itertools
-import json
-import math
+import logging
 import os
+import queue
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 
+import asyncpg
+import numpy as np
+import orjson
 from dotenv import load_dotenv
-from psycopg2 import connect, sql
+from psycopg2 import connect, errors, sql
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from web3 import Web3
 
 from src.utils.logging_utils import get_logger
@@ -23,6 +38,42 @@ logger = get_logger(__name__)
 
 load_dotenv()
 
+# Maximum number of pooled connections kept open per reward database
+POOL_MAX_CONNECTIONS = 16
+
+# Maximum number of databases initialized concurrently
+INIT_MAX_WORKERS = 16
+
+# Rows fetched per round trip when streaming reward totals
+REWARD_STREAM_ITERSIZE = 10000
+
+# Batches with at least this many users are loaded with COPY instead of INSERT
+COPY_THRESHOLD = 10000
+
+# Seconds a fetched gas price is reused before asking the node again
+GAS_PRICE_TTL = 10
+
+# Largest number of time buckets supported by the decay reward scheme
+MAX_DECAY_BUCKETS = 64
+
+# Queued add_reward_to_user calls: capacity, rows per flush, and seconds between flushes
+REWARD_QUEUE_MAXSIZE = 100_000
+REWARD_FLUSH_BATCH_SIZE = 1000
+REWARD_FLUSH_INTERVAL = 0.1
+
+
+@functools.lru_cache(maxsize=8)
+def _load_abi(path: str) -> dict:
+    """Parses a contract ABI file, once per path per process."""
+    return orjson.loads(Path(path).read_bytes())
+
+
+def _flush_rewarder_at_exit(rewarder_ref):
+    """Writes rewards still queued on a TokenRewarder when the interpreter exits."""
+    rewarder = rewarder_ref()
+    if rewarder is not None:
+        rewarder.flush_queued_rewards()
+
 
 class TokenRewarder:
     """
@@ -32,6 +83,9 @@ class TokenRewarder:
     to users who contribute to the system by uploading and processing scientific documents.
     """
 
+    # Exponential decay weights, most recent bucket first
+    _DECAY_WEIGHTS = np.exp(-np.arange(MAX_DECAY_BUCKETS))
+
     def __init__(
         self,
         network="test_base",
@@ -78,18 +132,49 @@ class TokenRewarder:
         self.owner_address = os.getenv("OWNER_ADDRESS")
         self.private_key = os.getenv("PRIVATE_KEY")
 
+        # Locally tracked nonce and cached (gas price, fetched at) pair. This assumes
+        # the rewarder is the only process sending transactions from owner_address.
+        self._nonce = None
+        self._gas_price_cache = None
+        self._tx_lock = threading.Lock()
+
         # Store PostgreSQL connection details
         self.host = host
         self.port = port
         self.user = user
         self.password = password
 
+        # Connection pools, created lazily per database name
+        self._pools = {}
+        self._pools_lock = threading.Lock()
+
+        # asyncpg pools for the async reward API, created lazily per database name.
+        # A pool only works on the event loop that created it, so pools are kept
+        # per loop as {loop: (asyncio.Lock, {dbname: pool})}
+        self._apools = {}
+        self._apools_lock = threading.Lock()
+
+        # Shared connection to the 'postgres' database for CREATE DATABASE
+        self._bootstrap_conn = None
+        self._bootstrap_lock = threading.Lock()
+
+        # Rewards queued by add_reward_to_user, written by a background flusher thread.
+        # Each flusher gets its own queue, so a flusher being stopped never shares
+        # its stop sentinel with the one started after it
+        self._reward_queue = None
+        self._flusher = None
+        self._flusher_lock = threading.Lock()
+        # The flusher is a daemon thread, so write what is still queued at exit.
+        # The hook is a per-instance partial so close() can unregister just this one
+        self._exit_hook = functools.partial(_flush_rewarder_at_exit, weakref.ref(self))
+        atexit.register(self._exit_hook)
+
         # Generate database names and initialize reward tables
         if db_components:
             self.db_names = self.generate_db_names(db_components)
             self._initialize_reward_tables()
         else:
-            self.db_names = []
+            self.db_names = ()
 
         self.logger.info(f"Initialized TokenRewarder for network: {network}")
         self.logger.info(f"Contract address: {contract_address}")
@@ -126,137 +211,495 @@ class TokenRewarder:
             self.logger.error(f"Error connecting to the database: {e}")
             return None
 
+    def _get_pool(self, dbname):
+        """
+        Returns the connection pool for a database, creating it on first use.
+
+        Creating a pool opens its first connection, so it is built outside the
+        lock to let pools for different databases connect in parallel. If two
+        threads race to create the same pool, the loser closes its own.
+        """
+        with self._pools_lock:
+            pool = self._pools.get(dbname)
+        if pool is not None:
+            return pool
+
+        new_pool = ThreadedConnectionPool(
+            minconn=1,
+            maxconn=POOL_MAX_CONNECTIONS,
+            host=self.host,
+            port=self.port,
+            user=self.user,
+            password=self.password,
+            dbname=dbname,
+        )
+        with self._pools_lock:
+            pool = self._pools.setdefault(dbname, new_pool)
+        if pool is not new_pool:
+            new_pool.closeall()
+        return pool
+
+    @contextmanager
+    def _conn(self, dbname):
+        """
+        Borrows a pooled connection to the specified database.
+
+        Yields None if no connection could be obtained, and returns the
+        connection to its pool on exit.
+        """
+        try:
+            pool = self._get_pool(dbname)
+            conn = pool.getconn()
+            conn.autocommit = True
+        except Exception as e:
+            self.logger.error(f"Error connecting to the database: {e}")
+            yield None
+            return
+
+        try:
+            yield conn
+        finally:
+            pool.putconn(conn, close=bool(conn.closed))
+
+    def _get_bootstrap_conn(self):
+        """
+        Returns the shared connection to the 'postgres' database, opening it on first use.
+
+        CREATE DATABASE cannot run inside a transaction, so this connection stays in
+        autocommit mode and is reused for every database the rewarder sets up.
+        """
+        with self._bootstrap_lock:
+            if self._bootstrap_conn is None or self._bootstrap_conn.closed:
+                self._bootstrap_conn = self._connect()
+            return self._bootstrap_conn
+
+    def close(self):
+        """
+        Writes any queued rewards, then closes the bootstrap connection and all
+        pooled database connections.
+        """
+        self.flush_queued_rewards()
+        # Everything queued has been written, so the exit hook is no longer needed
+        atexit.unregister(self._exit_hook)
+
+        with self._bootstrap_lock:
+            if self._bootstrap_conn is not None:
+                self._bootstrap_conn.close()
+                self._bootstrap_conn = None
+
+        with self._pools_lock:
+            for pool in self._pools.values():
+                pool.closeall()
+            self._pools.clear()
+
     def load_contract_abi(self, abi_path):
         """Loads the contract ABI from the given path."""
-        with open(abi_path, "r") as abi_file:
-            return json.load(abi_file)
+        return _load_abi(str(abi_path))
 
     def generate_db_names(self, components):
         """Generates database names using Cartesian product of components."""
-        return [
+        return tuple(
             f"{c}_{ch}_{e}_token"
             for c, ch, e in itertools.product(
                 components["converter"], components["chunker"], components["embedder"]
             )
-        ]
+        )
 
     def _initialize_reward_tables(self):
         """Creates reward tables in all generated databases."""
-        for db_name in self.db_names:
-            self._create_database_and_table(db_name)
+        if not self.db_names:
+            return
+
+        # CREATE DATABASE runs one at a time on the single bootstrap connection,
+        # which psycopg2 does not allow threads to use concurrently. The schema
+        # and table are then set up through each database's own pool in parallel.
+        ready = [db_name for db_name in self.db_names if self._ensure_database(db_name)]
+        if not ready:
+            return
+
+        with ThreadPoolExecutor(
+            max_workers=min(INIT_MAX_WORKERS, len(ready))
+        ) as executor:
+            list(executor.map(self._create_schema_and_table, ready))
 
     def _create_database_and_table(self, db_name):
-        """Creates the database and initializes the reward table."""
-        conn = self._connect()
+        """
+        Creates the database and initializes the reward table.
+
+        Returns:
+            The database name if it is ready for use, None otherwise
+        """
+        if not self._ensure_database(db_name):
+            return None
+
+        # Ensure schema and table are created in the new database. This goes through
+        # the database's pool, leaving a warm connection for the reward methods.
+        self._create_schema_and_table(db_name)
+        return db_name
+
+    def _ensure_database(self, db_name):
+        """
+        Creates the database if it does not exist yet.
+
+        Returns:
+            True if the database exists, False otherwise
+        """
+        conn = self._get_bootstrap_conn()
         if conn is None:
             self.logger.error("Unable to connect to PostgreSQL server.")
-            return
+            return False
 
-        cursor = conn.cursor()
-        try:
-            # Check if the database exists
-            cursor.execute(
-                sql.SQL("SELECT 1 FROM pg_database WHERE datname = %s"), [db_name]
-            )
-            if not cursor.fetchone():
-                # Create the new database
+        with self._bootstrap_lock:
+            cursor = conn.cursor()
+            try:
+                # Check if the database exists
+                cursor.execute(
+                    sql.SQL("SELECT 1 FROM pg_database WHERE datname = %s"), [db_name]
+                )
+                if not cursor.fetchone():
+                    self._create_database(cursor, db_name)
+            except Exception as e:
+                self.logger.error(f"Error creating database or table: {e}")
+                return False
+            finally:
+                cursor.close()
+        return True
+
+    def _create_database(self, cursor, db_name, attempts=3):
+        """
+        Creates a database, retrying while another CREATE DATABASE holds the template.
+
+        CREATE DATABASE statements from other processes all copy template1 too and can
+        make this one fail with ObjectInUse; a database created by someone else in the
+        meantime is accepted.
+        """
+        for attempt in range(attempts):
+            try:
                 cursor.execute(
                     sql.SQL("CREATE DATABASE {}").format(sql.Identifier(db_name))
                 )
                 self.logger.info(f"Database '{db_name}' created successfully.")
-
-            # Ensure schema and table are created in the new database
-            self._create_schema_and_table(db_name)
-
-        except Exception as e:
-            self.logger.error(f"Error creating database or table: {e}")
-        finally:
-            cursor.close()
-            conn.close()
+                return
+            except errors.DuplicateDatabase:
+                return
+            except errors.ObjectInUse:
+                if attempt == attempts - 1:
+                    raise
+                time.sleep(0.1 * (attempt + 1))
 
     def _create_schema_and_table(self, db_name):
         """Creates the schema and 'user_rewards' table in the given database, if they don't already exist."""
-        conn = self._connect(db_name)
-        if conn is None:
-            self.logger.error(f"Unable to connect to the database '{db_name}'.")
-            return
+        with self._conn(db_name) as conn:
+            if conn is None:
+                self.logger.error(f"Unable to connect to the database '{db_name}'.")
+                return
 
-        cursor = conn.cursor()
-        try:
-            # Create schema if it doesn't exist
-            cursor.execute("CREATE SCHEMA IF NOT EXISTS default_schema")
+            cursor = conn.cursor()
+            try:
+                # Create schema if it doesn't exist
+                cursor.execute("CREATE SCHEMA IF NOT EXISTS default_schema")
 
-            # Check if 'user_rewards' table exists
-            cursor.execute(
+                # Check if 'user_rewards' table exists
+                cursor.execute(
+                    """
+                    SELECT EXISTS (
+                        SELECT FROM information_schema.tables
+                        WHERE table_schema = 'default_schema'
+                        AND table_name = 'user_rewards'
+                    )
                 """
-                SELECT EXISTS (
-                    SELECT FROM information_schema.tables
-                    WHERE table_schema = 'default_schema'
-                    AND table_name = 'user_rewards'
                 )
-            """
-            )
-            table_exists = cursor.fetchone()[0]
+                table_exists = cursor.fetchone()[0]
+
+                if not table_exists:
+                    # Create the 'user_rewards' table with an id as primary key.
+                    # public_key is unique so reward upserts can use ON CONFLICT.
+                    cursor.execute(
+                        """
+                        CREATE TABLE default_schema.user_rewards (
+                            id SERIAL PRIMARY KEY,
+                            public_key TEXT NOT NULL UNIQUE,
+                            job_count INT DEFAULT 0,
+                            time_stamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                        )
+                    """
+                    )
+                    self.logger.info(f"Initialized 'user_rewards' table in '{db_name}'.")
+                else:
+                    self.logger.info(
+                        f"'user_rewards' table already exists in '{db_name}', skipping creation."
+                    )
+                    self._ensure_public_key_unique(cursor, db_name)
 
-            if not table_exists:
-                # Create the 'user_rewards' table with an id as primary key
                 cursor.execute(
                     """
-                    CREATE TABLE default_schema.user_rewards (
-                        id SERIAL PRIMARY KEY,
-                        public_key TEXT NOT NULL,
-                        job_count INT DEFAULT 0,
-                        time_stamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
+                    CREATE INDEX IF NOT EXISTS ix_user_rewards_time_stamp
+                    ON default_schema.user_rewards (time_stamp)
                 """
                 )
-                self.logger.info(f"Initialized 'user_rewards' table in '{db_name}'.")
-            else:
-                self.logger.info(
-                    f"'user_rewards' table already exists in '{db_name}', skipping creation."
-                )
 
-        except Exception as e:
-            self.logger.error(f"Error creating schema or table: {e}")
-        finally:
-            cursor.close()
-            conn.close()
+            except Exception as e:
+                self.logger.error(f"Error creating schema or table: {e}")
+            finally:
+                cursor.close()
+
+    def _ensure_public_key_unique(self, cursor, db_name):
+        """
+        Adds a unique index on public_key to a table created before it was unique.
+
+        PostgreSQL has no ADD CONSTRAINT IF NOT EXISTS, but ON CONFLICT (public_key)
+        works equally well with a unique index, which does support IF NOT EXISTS.
+        """
+        cursor.execute(
+            """
+            SELECT 1 FROM pg_indexes
+            WHERE schemaname = 'default_schema'
+            AND tablename = 'user_rewards'
+            AND indexdef LIKE 'CREATE UNIQUE INDEX % (public_key)'
+        """
+        )
+        if cursor.fetchone():
+            return
+
+        try:
+            cursor.execute(
+                """
+                CREATE UNIQUE INDEX IF NOT EXISTS ux_user_rewards_public_key
+                ON default_schema.user_rewards (public_key)
+            """
+            )
+            self.logger.info(f"Added unique index on public_key in '{db_name}'.")
+        except errors.UniqueViolation as e:
+            self.logger.error(
+                f"Cannot make public_key unique in '{db_name}', duplicate rows must be merged first: {e}"
+            )
 
     def add_reward_to_user(self, public_key, db_name, job_count=1):
         """
         Adds a new entry for the user with a specific job count.
 
+        The entry is queued and written in the background together with other
+        queued entries; call flush_queued_rewards() or close() to wait for it.
+        Entries still queued are also written when the interpreter exits. Write
+        errors are logged rather than raised, since they happen in the background.
+
         :param public_key: The public key of the user.
         :param db_name: The database name where the user record exists.
         :param job_count: The number of jobs to add.
         """
+        # Enqueue under the lock so the row cannot land behind the stop sentinel
+        # of a flusher that flush_queued_rewards is shutting down
+        with self._flusher_lock:
+            if self._flusher is None:
+                self._start_flusher()
+            self._reward_queue.put((db_name, public_key, job_count))
+
+    def _start_flusher(self):
+        """Starts a background reward flusher with a fresh queue. The caller holds _flusher_lock."""
+        self._reward_queue = queue.Queue(maxsize=REWARD_QUEUE_MAXSIZE)
+        self._flusher = threading.Thread(
+            target=self._flush_loop,
+            args=(self._reward_queue,),
+            name="reward-flusher",
+            daemon=True,
+        )
+        self._flusher.start()
+
+    def _flush_loop(self, reward_queue):
+        """
+        Drains queued rewards and writes them in batches.
+
+        A batch is written once it holds REWARD_FLUSH_BATCH_SIZE rows or
+        REWARD_FLUSH_INTERVAL seconds after its first row arrived. A None
+        item stops the loop after the current batch is written.
+
+        :param reward_queue: The queue owned by this flusher.
+        """
+        while True:
+            item = reward_queue.get()
+            if item is None:
+                return
+
+            batch = [item]
+            stop = False
+            deadline = time.monotonic() + REWARD_FLUSH_INTERVAL
+            while len(batch) < REWARD_FLUSH_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = reward_queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._write_queued_rewards(batch)
+            if stop:
+                return
+
+    def _write_queued_rewards(self, batch):
+        """Writes a batch of queued (db_name, public_key, job_count) rows per database."""
+        rows_by_db = {}
+        for db_name, public_key, job_count in batch:
+            rows_by_db.setdefault(db_name, []).append((public_key, job_count))
+
+        for db_name, rows in rows_by_db.items():
+            try:
+                self.batch_add_rewards(db_name, rows)
+            except Exception as e:
+                self.logger.error(f"❌ Error flushing queued rewards for '{db_name}': {e}")
+
+    def flush_queued_rewards(self):
+        """Writes all rewards queued by add_reward_to_user and stops the flusher thread."""
+        with self._flusher_lock:
+            flusher, reward_queue = self._flusher, self._reward_queue
+            self._flusher = self._reward_queue = None
+            if flusher is not None:
+                reward_queue.put(None)
+
+        if flusher is not None:
+            flusher.join()
+
+    def batch_add_rewards(self, db_name, rows):
+        """
+        Adds job counts for many users with a single multi-row upsert.
+
+        :param db_name: The database name where the user records exist.
+        :param rows: Iterable of (public_key, job_count) tuples. Repeated public
+            keys are summed, since one upsert cannot touch the same row twice.
+        """
+        totals = {}
+        for public_key, job_count in rows:
+            totals[public_key] = totals.get(public_key, 0) + job_count
+
+        if not totals:
+            return
+
+        if len(totals) >= COPY_THRESHOLD:
+            self.bulk_load_rewards(db_name, totals.items())
+            return
+
         db_name = f"{db_name}_token"
 
-        conn = self._connect(db_name)
-        if conn is None:
-            self.logger.error(f"❌ Unable to connect to the database '{db_name}'.")
+        with self._conn(db_name) as conn:
+            if conn is None:
+                self.logger.error(f"❌ Unable to connect to the database '{db_name}'.")
+                return
+
+            cursor = conn.cursor()
+            try:
+                execute_values(
+                    cursor,
+                    """
+                    INSERT INTO default_schema.user_rewards (public_key, job_count, time_stamp)
+                    VALUES %s
+                    ON CONFLICT (public_key)
+                    DO UPDATE SET job_count = default_schema.user_rewards.job_count + EXCLUDED.job_count
+                    """,
+                    list(totals.items()),
+                    template="(%s, %s, CURRENT_TIMESTAMP)",
+                    page_size=1000,
+                )
+                if len(totals) == 1:
+                    public_key, job_count = next(iter(totals.items()))
+                    self.logger.info(
+                        f"✅ Added entry for user '{public_key}' with job_count {job_count}."
+                    )
+                else:
+                    self.logger.info(f"✅ Added reward entries for {len(totals)} users.")
+
+            except Exception as e:
+                self.logger.error(f"❌ Error adding reward entry: {e}")
+            finally:
+                cursor.close()
+
+    def bulk_load_rewards(self, db_name, rows):
+        """
+        Adds job counts for many users by streaming them through COPY.
+
+        Rows are copied into a temporary staging table and merged into
+        user_rewards with one INSERT ... SELECT upsert, in a single transaction.
+
+        :param db_name: The database name where the user records exist.
+        :param rows: Iterable of (public_key, job_count) tuples.
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        row_count = 0
+        for public_key, job_count in rows:
+            writer.writerow((public_key, int(job_count)))
+            row_count += 1
+
+        if not row_count:
             return
+        buffer.seek(0)
 
-        cursor = conn.cursor()
-        try:
-            cursor.execute(
-                """
-                INSERT INTO default_schema.user_rewards (public_key, job_count, time_stamp)
-                VALUES (%s, %s, CURRENT_TIMESTAMP)
-                ON CONFLICT (public_key)
-                DO UPDATE SET job_count = default_schema.user_rewards.job_count + EXCLUDED.job_count
-                """,
-                (public_key, job_count),
-            )
-            self.logger.info(
-                f"✅ Added entry for user '{public_key}' with job_count {job_count}."
-            )
+        db_name = f"{db_name}_token"
 
-        except Exception as e:
-            self.logger.error(f"❌ Error adding reward entry: {e}")
-        finally:
-            cursor.close()
-            conn.close()
+        with self._conn(db_name) as conn:
+            if conn is None:
+                self.logger.error(f"❌ Unable to connect to the database '{db_name}'.")
+                return
+
+            # The staging table is dropped on commit, so this needs a transaction
+            conn.autocommit = False
+            cursor = conn.cursor()
+            try:
+                cursor.execute(
+                    "CREATE TEMP TABLE reward_stage (public_key TEXT, job_count INT) ON COMMIT DROP"
+                )
+                cursor.copy_expert(
+                    "COPY reward_stage (public_key, job_count) FROM STDIN WITH (FORMAT CSV)",
+                    buffer,
+                )
+                cursor.execute(
+                    """
+                    INSERT INTO default_schema.user_rewards (public_key, job_count, time_stamp)
+                    SELECT public_key, SUM(job_count), CURRENT_TIMESTAMP
+                    FROM reward_stage
+                    GROUP BY public_key
+                    ON CONFLICT (public_key)
+                    DO UPDATE SET job_count = default_schema.user_rewards.job_count + EXCLUDED.job_count
+                    """
+                )
+                conn.commit()
+                self.logger.info(f"✅ Bulk loaded {row_count} reward rows into '{db_name}'.")
+
+            except Exception as e:
+                conn.rollback()
+                self.logger.error(f"❌ Error bulk loading reward entries: {e}")
+            finally:
+                cursor.close()
+
+    def _next_nonce(self):
+        """Returns the next transaction nonce, fetching it from the node only once."""
+        with self._tx_lock:
+            if self._nonce is None:
+                self._nonce = self.web3.eth.get_transaction_count(
+                    self.owner_address, "pending"
+                )
+            nonce = self._nonce
+            self._nonce += 1
+            return nonce
+
+    def reset_nonce(self):
+        """Forgets the tracked nonce so the next transaction re-reads it from the node."""
+        with self._tx_lock:
+            self._nonce = None
+
+    def _gas_price(self):
+        """Returns the network gas price, cached for GAS_PRICE_TTL seconds."""
+        now = time.monotonic()
+        cached = self._gas_price_cache
+        if cached is not None and now - cached[1] < GAS_PRICE_TTL:
+            return cached[0]
+
+        gas_price = self.web3.eth.gas_price
+        self._gas_price_cache = (gas_price, now)
+        return gas_price
 
     def issue_token(self, recipient_address, amount=1):
         """Issues tokens to the recipient address."""
@@ -269,7 +712,7 @@ class TokenRewarder:
             return False
 
         try:
-            nonce = self.web3.eth.get_transaction_count(self.owner_address, "pending")
+            nonce = self._next_nonce()
 
             txn = self.contract.functions.transfer(
                 str(recipient_address), int(amount * 1e18)
@@ -277,7 +720,7 @@ class TokenRewarder:
                 {
                     "chainId": self.chain_id,
                     "gas": 100000,
-                    "gasPrice": self.web3.eth.gas_price,
+                    "gasPrice": self._gas_price(),
                     "nonce": nonce,
                 }
             )
@@ -289,6 +732,8 @@ class TokenRewarder:
 
         except Exception as e:
             self.logger.error(f"❌ Error sending transaction: {e}")
+            # The nonce may not have been used, so re-read it for the next transaction
+            self.reset_nonce()
             return False
 
     def batch_issue_tokens(self, recipients, amounts):
@@ -302,7 +747,7 @@ class TokenRewarder:
             return False
 
         try:
-            nonce = self.web3.eth.get_transaction_count(self.owner_address, "pending")
+            nonce = self._next_nonce()
             self.logger.info(
                 f"🏦 Batch issuing tokens to {len(recipients)} recipients..."
             )
@@ -318,7 +763,7 @@ class TokenRewarder:
                     "chainId": self.chain_id,
                     # Base gas + extra for each recipient
                     "gas": 200000 + (70000 * len(recipients)),
-                    "gasPrice": self.web3.eth.gas_price,
+                    "gasPrice": self._gas_price(),
                     "nonce": nonce,
                 }
             )
@@ -330,8 +775,38 @@ class TokenRewarder:
 
         except Exception as e:
             self.logger.error(f"❌ Error sending batch transaction: {e}")
+            # The nonce may not have been used, so re-read it for the next transaction
+            self.reset_nonce()
             return False
 
+    def _fetch_rewards(self, conn, query, params=()):
+        """
+        Streams (public_key, reward) rows into a dict through a server-side cursor.
+
+        Named cursors only exist inside a transaction, so autocommit is switched
+        off for the duration of the query.
+        """
+        conn.autocommit = False
+        try:
+            with conn.cursor(name="rewards_stream") as cursor:
+                cursor.itersize = REWARD_STREAM_ITERSIZE
+                cursor.execute(query, params)
+                rewards = dict(cursor)
+            conn.commit()
+            return rewards
+        except Exception:
+            conn.rollback()
+            raise
+
+    def _log_rewards(self, title, rewards):
+        """Logs the reward for each user, skipping the formatting when INFO is disabled."""
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+
+        self.logger.info(title)
+        for user, reward in rewards.items():
+            self.logger.info("  User '%s': %.2f tokens", user, reward)
+
     def get_user_rewards(self, db_name):
         """
         Get all user rewards and distribute them in a single batch transaction.
@@ -351,13 +826,12 @@ class TokenRewarder:
             return
 
         # Collect all recipients and amounts for batch distribution
-        recipients = []
-        amounts = []
+        recipients = list(user_rewards.keys())
+        amounts = list(user_rewards.values())
 
-        for user, amount in user_rewards.items():
-            self.logger.info(f"Adding {amount:.2f} tokens for user '{user}'")
-            recipients.append(user)
-            amounts.append(amount)
+        if self.logger.isEnabledFor(logging.INFO):
+            for user, amount in user_rewards.items():
+                self.logger.info("Adding %.2f tokens for user '%s'", amount, user)
 
         # Use batch distribution
         if recipients and amounts:
@@ -368,312 +842,470 @@ class TokenRewarder:
 
     def reward_users_after_time(self, db_name, start_time, reward_per_job=1):
         """Rewards users based on a constant reward per job count after a specified time."""
-        conn = self._connect(db_name)
-        if conn is None:
-            self.logger.error(f"Unable to connect to the database '{db_name}'.")
-            return
-
-        cursor = conn.cursor()
-        try:
-            cursor.execute(
-                """
-                SELECT public_key, SUM(job_count) AS total_jobs
-                FROM default_schema.user_rewards
-                WHERE time_stamp >= %s
-                GROUP BY public_key
-            """,
-                (start_time,),
-            )
-
-            user_entries = cursor.fetchall()
-
-            rewards = {}
-            for public_key, total_jobs in user_entries:
-                rewards[public_key] = total_jobs * reward_per_job
-
-            self.logger.info("\nRewards After Specified Time:")
-            for user, reward in rewards.items():
-                self.logger.info(f"  User '{user}': {reward:.2f} tokens")
+        with self._conn(db_name) as conn:
+            if conn is None:
+                self.logger.error(f"Unable to connect to the database '{db_name}'.")
+                return
 
-            return rewards
+            try:
+                rewards = self._fetch_rewards(
+                    conn,
+                    """
+                    SELECT public_key, SUM(job_count) * %s::float8 AS reward
+                    FROM default_schema.user_rewards
+                    WHERE time_stamp >= %s
+                    GROUP BY public_key
+                """,
+                    (reward_per_job, start_time),
+                )
+                self._log_rewards("\nRewards After Specified Time:", rewards)
+                return rewards
 
-        except Exception as e:
-            self.logger.error(f"Error calculating time-based rewards: {e}")
-        finally:
-            cursor.close()
-            conn.close()
+            except Exception as e:
+                self.logger.error(f"Error calculating time-based rewards: {e}")
 
     def reward_users_milestone(self, db_name, milestone=10, reward_per_job=1):
         """Rewards users based on a milestone-based reward scheme."""
-        conn = self._connect(db_name)
-        if conn is None:
-            self.logger.error(f"Unable to connect to the database '{db_name}'.")
-            return
-
-        cursor = conn.cursor()
-        try:
-            cursor.execute(
-                """
-                SELECT public_key, SUM(job_count) AS total_jobs
-                FROM default_schema.user_rewards
-                GROUP BY public_key
-                HAVING SUM(job_count) >= %s
-            """,
-                (milestone,),
-            )
-
-            user_entries = cursor.fetchall()
-
-            rewards = {}
-            for public_key, total_jobs in user_entries:
-                rewards[public_key] = total_jobs * reward_per_job
-
-            self.logger.info("\nMilestone-Based Rewards:")
-            for user, reward in rewards.items():
-                self.logger.info(f"  User '{user}': {reward:.2f} tokens")
+        with self._conn(db_name) as conn:
+            if conn is None:
+                self.logger.error(f"Unable to connect to the database '{db_name}'.")
+                return
 
-            return rewards
+            try:
+                rewards = self._fetch_rewards(
+                    conn,
+                    """
+                    SELECT public_key, SUM(job_count) * %s::float8 AS reward
+                    FROM default_schema.user_rewards
+                    GROUP BY public_key
+                    HAVING SUM(job_count) >= %s
+                """,
+                    (reward_per_job, milestone),
+                )
+                self._log_rewards("\nMilestone-Based Rewards:", rewards)
+                return rewards
 
-        except Exception as e:
-            self.logger.error(f"Error calculating milestone-based rewards: {e}")
-        finally:
-            cursor.close()
-            conn.close()
+            except Exception as e:
+                self.logger.error(f"Error calculating milestone-based rewards: {e}")
 
     def reward_users_with_bonus(
         self, db_name, bonus_threshold=50, bonus=10, reward_per_job=1
     ):
         """Rewards users based on a bonus threshold and bonus amount."""
-        conn = self._connect(db_name)
-        if conn is None:
-            self.logger.error(f"Unable to connect to the database '{db_name}'.")
-            return
+        with self._conn(db_name) as conn:
+            if conn is None:
+                self.logger.error(f"Unable to connect to the database '{db_name}'.")
+                return
 
-        cursor = conn.cursor()
-        try:
-            cursor.execute(
-                """
-                SELECT public_key, SUM(job_count) AS total_jobs
-                FROM default_schema.user_rewards
-                GROUP BY public_key
-            """
-            )
+            try:
+                rewards = self._fetch_rewards(
+                    conn,
+                    """
+                    SELECT public_key,
+                        SUM(job_count) * %s::float8
+                        + CASE WHEN SUM(job_count) >= %s THEN %s::float8 ELSE 0 END AS reward
+                    FROM default_schema.user_rewards
+                    GROUP BY public_key
+                """,
+                    (reward_per_job, bonus_threshold, bonus),
+                )
+                self._log_rewards("\nRewards with Bonuses:", rewards)
+                return rewards
 
-            user_entries = cursor.fetchall()
+            except Exception as e:
+                self.logger.error(f"Error calculating rewards with bonuses: {e}")
 
-            rewards = {}
-            for public_key, total_jobs in user_entries:
-                reward = total_jobs * reward_per_job
-                if total_jobs >= bonus_threshold:
-                    reward += bonus
-                rewards[public_key] = reward
+    def reward_users_constant(self, db_name, reward_per_job=1):
+        """Rewards users based on a constant reward per job count."""
+        with self._conn(db_name) as conn:
+            if conn is None:
+                self.logger.error(f"Unable to connect to the database '{db_name}'.")
+                return
 
-            self.logger.info("\nRewards with Bonuses:")
-            for user, reward in rewards.items():
-                self.logger.info(f"  User '{user}': {reward:.2f} tokens")
+            try:
+                rewards = self._fetch_rewards(
+                    conn,
+                    """
+                    SELECT public_key, SUM(job_count) * %s::float8 AS reward
+                    FROM default_schema.user_rewards
+                    GROUP BY public_key
+                """,
+                    (reward_per_job,),
+                )
+                self._log_rewards("\nConstant Rewards:", rewards)
+                return rewards
 
-            return rewards
+            except Exception as e:
+                self.logger.error(f"Error calculating constant rewards: {e}")
 
-        except Exception as e:
-            self.logger.error(f"Error calculating rewards with bonuses: {e}")
-        finally:
-            cursor.close()
-            conn.close()
+    def reward_users_default(self, db_name):
+        """Rewards users based on a default exponential decay reward scheme."""
+        with self._conn(db_name) as conn:
+            if conn is None:
+                self.logger.error(f"Unable to connect to the database '{db_name}'.")
+                return
 
-    def reward_users_constant(self, db_name, reward_per_job=1):
-        """Rewards users based on a constant reward per job count."""
-        conn = self._connect(db_name)
-        if conn is None:
-            self.logger.error(f"Unable to connect to the database '{db_name}'.")
-            return
+            cursor = conn.cursor()
+            n_buckets = 3
 
-        cursor = conn.cursor()
-        try:
-            cursor.execute(
+            try:
+                cursor.execute(
+                    """
+                    SELECT MIN(time_stamp), MAX(time_stamp)
+                    FROM default_schema.user_rewards
                 """
-                SELECT public_key, SUM(job_count) AS total_jobs
-                FROM default_schema.user_rewards
-                GROUP BY public_key
-            """
-            )
+                )
+                first_time, last_time = cursor.fetchone()
 
-            user_entries = cursor.fetchall()
+                if first_time is None:
+                    self.logger.info("No user entries found.")
+                    return
 
-            rewards = {}
-            for public_key, total_jobs in user_entries:
-                rewards[public_key] = total_jobs * reward_per_job
+                bucket_duration = (last_time - first_time) / n_buckets
+                if not bucket_duration:
+                    self.logger.info("All user entries share one timestamp, no rewards to weight.")
+                    return {}
 
-            self.logger.info("\nConstant Rewards:")
-            for user, reward in rewards.items():
-                self.logger.info(f"  User '{user}': {reward:.2f} tokens")
+                current_time = datetime.now()
+                start_time = current_time - (bucket_duration * n_buckets)
 
-            return rewards
+                global_buckets = [
+                    start_time + i * bucket_duration for i in range(n_buckets)
+                ]
 
-        except Exception as e:
-            self.logger.error(f"Error calculating constant rewards: {e}")
-        finally:
-            cursor.close()
-            conn.close()
+                # Sum contributions per user and bucket in the database. width_bucket
+                # numbers the buckets 1..n_buckets and puts entries outside
+                # [start_time, current_time) in bucket 0 or n_buckets + 1.
+                cursor.execute(
+                    """
+                    SELECT public_key, bucket, SUM(job_count)
+                    FROM (
+                        SELECT public_key, job_count,
+                            width_bucket(
+                                EXTRACT(EPOCH FROM time_stamp),
+                                EXTRACT(EPOCH FROM %s::timestamp),
+                                EXTRACT(EPOCH FROM %s::timestamp),
+                                %s
+                            ) AS bucket
+                        FROM default_schema.user_rewards
+                    ) AS bucketed
+                    WHERE bucket BETWEEN 1 AND %s
+                    GROUP BY public_key, bucket
+                """,
+                    (start_time, current_time, n_buckets, n_buckets),
+                )
 
-    def reward_users_default(self, db_name):
-        """Rewards users based on a default exponential decay reward scheme."""
-        conn = self._connect(db_name)
-        if conn is None:
-            self.logger.error(f"Unable to connect to the database '{db_name}'.")
-            return
+                rows = cursor.fetchall()
+                users = list(dict.fromkeys(public_key for public_key, _, _ in rows))
+                user_index = {user: i for i, user in enumerate(users)}
+
+                # Contributions per (user, bucket), oldest bucket first
+                contributions = np.zeros((len(users), n_buckets), dtype=np.int64)
+                for public_key, bucket, job_count in rows:
+                    contributions[user_index[public_key], bucket - 1] = job_count
+
+                # The most recent bucket gets weight exp(0)
+                weights = self._DECAY_WEIGHTS[:n_buckets][::-1]
+                weighted = contributions @ weights
+                weighted_rewards = dict(zip(users, weighted.tolist()))
+
+                if self.logger.isEnabledFor(logging.INFO):
+                    for j in reversed(range(n_buckets)):
+                        self.logger.info(
+                            "Bucket starting %s (Weight: %s):", global_buckets[j], weights[j]
+                        )
+                        for i in np.flatnonzero(contributions[:, j]):
+                            count = contributions[i, j]
+                            self.logger.info(
+                                "  User '%s': %s contributions, Weighted reward: %.2f",
+                                users[i],
+                                count,
+                                count * weights[j],
+                            )
+
+                    self.logger.info("\nTotal Weighted Rewards:")
+                    for user, total_reward in weighted_rewards.items():
+                        self.logger.info(
+                            "  User '%s': %.2f total weighted reward", user, total_reward
+                        )
+
+                return weighted_rewards
+
+            except Exception as e:
+                self.logger.error(f"Error fetching user rewards: {e}")
+            finally:
+                cursor.close()
+
+    def reward_users_within_timeframe(
+        self, db_name, start_time, end_time, reward_per_job=1
+    ):
+        """Rewards users who contributed within a specific timeframe."""
+        with self._conn(db_name) as conn:
+            if conn is None:
+                self.logger.error(f"Unable to connect to the database '{db_name}'.")
+                return
 
-        cursor = conn.cursor()
-        n_buckets = 3
+            try:
+                rewards = self._fetch_rewards(
+                    conn,
+                    """
+                    SELECT public_key, SUM(job_count) * %s::float8 AS reward
+                    FROM default_schema.user_rewards
+                    WHERE time_stamp >= %s AND time_stamp <= %s
+                    GROUP BY public_key
+                """,
+                    (reward_per_job, start_time, end_time),
+                )
+                self._log_rewards("\nTimeframe-Based Rewards:", rewards)
+                return rewards
 
-        try:
-            cursor.execute(
-                """
-                SELECT public_key, job_count, time_stamp
-                FROM default_schema.user_rewards
-                ORDER BY public_key, time_stamp
-            """
-            )
+            except Exception as e:
+                self.logger.error(f"Error calculating timeframe-based rewards: {e}")
 
-            user_entries = cursor.fetchall()
+    def reward_users_by_tier(self, db_name, tiers=None):
+        """Rewards users based on their tier of contributions."""
+        if tiers is None:
+            tiers = {
+                100: 5,  # Contributions >= 100 get 5 tokens per job
+                50: 3,  # Contributions >= 50 get 3 tokens per job
+                0: 1,  # Contributions >= 0 get 1 token per job
+            }
 
-            if not user_entries:
-                self.logger.info("No user entries found.")
+        with self._conn(db_name) as conn:
+            if conn is None:
+                self.logger.error(f"Unable to connect to the database '{db_name}'.")
                 return
 
-            current_time = datetime.now()
-            bucket_duration = (user_entries[-1][2] - user_entries[0][2]) / n_buckets
-            start_time = current_time - (bucket_duration * n_buckets)
-
-            global_buckets = [
-                start_time + i * bucket_duration for i in range(n_buckets)
-            ]
-
-            # Initialize the bucket map
-            bucket_map = {bucket_start: {} for bucket_start in global_buckets}
-
-            # Populate each bucket with user contributions
-            for public_key, job_count, time_stamp in user_entries:
-                for bucket_start in global_buckets:
-                    # Define the end time for the current bucket
-                    bucket_end = bucket_start + bucket_duration
-                    if bucket_start <= time_stamp < bucket_end:
-                        if public_key not in bucket_map[bucket_start]:
-                            bucket_map[bucket_start][public_key] = 0
-
-                        bucket_map[bucket_start][public_key] += job_count
-                        break
-
-            weights = [math.exp(-i) for i in range(n_buckets)]
-
-            weighted_rewards = {}
-            for i, (bucket_start, users) in enumerate(reversed(bucket_map.items())):
-                weight = weights[i]
-                self.logger.info(f"Bucket starting {bucket_start} (Weight: {weight}):")
-                for user, count in users.items():
-                    weighted_reward = count * weight
-                    if user not in weighted_rewards:
-                        weighted_rewards[user] = 0
-                    weighted_rewards[user] += weighted_reward
-                    self.logger.info(
-                        f"  User '{user}': {count} contributions, Weighted reward: {weighted_reward:.2f}"
-                    )
+            try:
+                user_totals = self._fetch_rewards(
+                    conn,
+                    """
+                    SELECT public_key, SUM(job_count) AS total_jobs
+                    FROM default_schema.user_rewards
+                    GROUP BY public_key
+                """,
+                )
+
+                thresholds = np.array(sorted(tiers))
+                tier_rewards = np.array([tiers[threshold] for threshold in thresholds])
+                totals = np.fromiter(user_totals.values(), dtype=np.int64, count=len(user_totals))
+
+                # Index of the highest threshold each total reaches; -1 means below every tier
+                idx = np.searchsorted(thresholds, totals, side="right") - 1
+                if len(thresholds):
+                    per_job = np.where(idx >= 0, tier_rewards[np.maximum(idx, 0)], 0)
+                else:
+                    per_job = np.zeros_like(totals)
+                rewards = dict(zip(user_totals.keys(), (totals * per_job).tolist()))
+
+                self._log_rewards("\nTier-Based Rewards:", rewards)
+                return rewards
+
+            except Exception as e:
+                self.logger.error(f"Error calculating tier-based rewards: {e}")
+
+    def _loop_apools(self):
+        """
+        Returns the (lock, pools) pair for the running event loop.
 
-            self.logger.info("\nTotal Weighted Rewards:")
-            for user, total_reward in weighted_rewards.items():
-                self.logger.info(
-                    f"  User '{user}': {total_reward:.2f} total weighted reward"
+        Pools left behind by loops that have since closed (e.g. earlier
+        asyncio.run calls) are unusable and are dropped.
+        """
+        loop = asyncio.get_running_loop()
+        with self._apools_lock:
+            for other in [other for other in self._apools if other.is_closed()]:
+                del self._apools[other]
+            if loop not in self._apools:
+                self._apools[loop] = (asyncio.Lock(), {})
+            return self._apools[loop]
+
+    async def _get_apool(self, dbname):
+        """Returns the running loop's asyncpg pool for a database, creating it on first use."""
+        lock, pools = self._loop_apools()
+        async with lock:
+            pool = pools.get(dbname)
+            if pool is None:
+                pool = await asyncpg.create_pool(
+                    host=self.host,
+                    port=self.port,
+                    user=self.user,
+                    password=self.password,
+                    database=dbname,
+                    min_size=2,
+                    max_size=POOL_MAX_CONNECTIONS,
                 )
+                pools[dbname] = pool
+            return pool
+
+    async def aclose(self):
+        """Closes the running event loop's asyncpg pools."""
+        lock, pools = self._loop_apools()
+        async with lock:
+            await asyncio.gather(*(pool.close() for pool in pools.values()))
+            pools.clear()
+
+    async def _afetch_rewards(self, db_name, query, *args):
+        """Runs a (public_key, reward) query on the async pool and returns a dict."""
+        pool = await self._get_apool(db_name)
+        records = await pool.fetch(query, *args)
+        return {record[0]: record[1] for record in records}
+
+    async def abatch_add_rewards(self, db_name, rows):
+        """
+        Async counterpart of batch_add_rewards.
+
+        :param db_name: The database name where the user records exist.
+        :param rows: Iterable of (public_key, job_count) tuples.
+        """
+        totals = {}
+        for public_key, job_count in rows:
+            totals[public_key] = totals.get(public_key, 0) + job_count
+
+        if not totals:
+            return
 
-            return weighted_rewards
+        db_name = f"{db_name}_token"
 
+        try:
+            pool = await self._get_apool(db_name)
+            await pool.execute(
+                """
+                INSERT INTO default_schema.user_rewards (public_key, job_count, time_stamp)
+                SELECT public_key, job_count, CURRENT_TIMESTAMP
+                FROM unnest($1::text[], $2::int[]) AS rows (public_key, job_count)
+                ON CONFLICT (public_key)
+                DO UPDATE SET job_count = default_schema.user_rewards.job_count + EXCLUDED.job_count
+                """,
+                list(totals.keys()),
+                list(totals.values()),
+            )
+            self.logger.info(f"✅ Added reward entries for {len(totals)} users.")
         except Exception as e:
-            self.logger.error(f"Error fetching user rewards: {e}")
-        finally:
-            cursor.close()
-            conn.close()
+            self.logger.error(f"❌ Error adding reward entry: {e}")
 
-    def reward_users_within_timeframe(
-        self, db_name, start_time, end_time, reward_per_job=1
-    ):
-        """Rewards users who contributed within a specific timeframe."""
-        conn = self._connect(db_name)
-        if conn is None:
-            self.logger.error(f"Unable to connect to the database '{db_name}'.")
-            return
+    async def aadd_reward_to_user(self, public_key, db_name, job_count=1):
+        """Async counterpart of add_reward_to_user."""
+        await self.abatch_add_rewards(db_name, [(public_key, job_count)])
 
-        cursor = conn.cursor()
+    async def areward_users_constant(self, db_name, reward_per_job=1):
+        """Async counterpart of reward_users_constant."""
         try:
-            cursor.execute(
+            rewards = await self._afetch_rewards(
+                db_name,
                 """
-                SELECT public_key, SUM(job_count) AS total_jobs
+                SELECT public_key, SUM(job_count) * $1::float8 AS reward
                 FROM default_schema.user_rewards
-                WHERE time_stamp >= %s AND time_stamp <= %s
                 GROUP BY public_key
             """,
-                (start_time, end_time),
+                reward_per_job,
             )
-
-            user_entries = cursor.fetchall()
-
-            rewards = {}
-            for public_key, total_jobs in user_entries:
-                rewards[public_key] = total_jobs * reward_per_job
-
-            self.logger.info("\nTimeframe-Based Rewards:")
-            for user, reward in rewards.items():
-                self.logger.info(f"  User '{user}': {reward:.2f} tokens")
-
+            self._log_rewards("\nConstant Rewards:", rewards)
             return rewards
+        except Exception as e:
+            self.logger.error(f"Error calculating constant rewards: {e}")
 
+    async def areward_users_after_time(self, db_name, start_time, reward_per_job=1):
+        """Async counterpart of reward_users_after_time."""
+        try:
+            rewards = await self._afetch_rewards(
+                db_name,
+                """
+                SELECT public_key, SUM(job_count) * $1::float8 AS reward
+                FROM default_schema.user_rewards
+                WHERE time_stamp >= $2
+                GROUP BY public_key
+            """,
+                reward_per_job,
+                start_time,
+            )
+            self._log_rewards("\nRewards After Specified Time:", rewards)
+            return rewards
         except Exception as e:
-            self.logger.error(f"Error calculating timeframe-based rewards: {e}")
-        finally:
-            cursor.close()
-            conn.close()
+            self.logger.error(f"Error calculating time-based rewards: {e}")
 
-    def reward_users_by_tier(self, db_name, tiers=None):
-        """Rewards users based on their tier of contributions."""
-        if tiers is None:
-            tiers = {
-                100: 5,  # Contributions >= 100 get 5 tokens per job
-                50: 3,  # Contributions >= 50 get 3 tokens per job
-                0: 1,  # Contributions >= 0 get 1 token per job
-            }
+    async def areward_users_milestone(self, db_name, milestone=10, reward_per_job=1):
+        """Async counterpart of reward_users_milestone."""
+        try:
+            rewards = await self._afetch_rewards(
+                db_name,
+                """
+                SELECT public_key, SUM(job_count) * $1::float8 AS reward
+                FROM default_schema.user_rewards
+                GROUP BY public_key
+                HAVING SUM(job_count) >= $2
+            """,
+                reward_per_job,
+                milestone,
+            )
+            self._log_rewards("\nMilestone-Based Rewards:", rewards)
+            return rewards
+        except Exception as e:
+            self.logger.error(f"Error calculating milestone-based rewards: {e}")
 
-        conn = self._connect(db_name)
-        if conn is None:
-            self.logger.error(f"Unable to connect to the database '{db_name}'.")
-            return
+    async def areward_users_with_bonus(
+        self, db_name, bonus_threshold=50, bonus=10, reward_per_job=1
+    ):
+        """Async counterpart of reward_users_with_bonus."""
+        try:
+            rewards = await self._afetch_rewards(
+                db_name,
+                """
+                SELECT public_key,
+                    SUM(job_count) * $1::float8
+                    + CASE WHEN SUM(job_count) >= $2 THEN $3::float8 ELSE 0 END AS reward
+                FROM default_schema.user_rewards
+                GROUP BY public_key
+            """,
+                reward_per_job,
+                bonus_threshold,
+                bonus,
+            )
+            self._log_rewards("\nRewards with Bonuses:", rewards)
+            return rewards
+        except Exception as e:
+            self.logger.error(f"Error calculating rewards with bonuses: {e}")
 
-        cursor = conn.cursor()
+    async def areward_users_within_timeframe(
+        self, db_name, start_time, end_time, reward_per_job=1
+    ):
+        """Async counterpart of reward_users_within_timeframe."""
         try:
-            cursor.execute(
+            rewards = await self._afetch_rewards(
+                db_name,
                 """
-                SELECT public_key, SUM(job_count) AS total_jobs
+                SELECT public_key, SUM(job_count) * $1::float8 AS reward
                 FROM default_schema.user_rewards
+                WHERE time_stamp >= $2 AND time_stamp <= $3
                 GROUP BY public_key
-            """
+            """,
+                reward_per_job,
+                start_time,
+                end_time,
             )
+            self._log_rewards("\nTimeframe-Based Rewards:", rewards)
+            return rewards
+        except Exception as e:
+            self.logger.error(f"Error calculating timeframe-based rewards: {e}")
 
-            user_entries = cursor.fetchall()
+    async def aget_user_rewards(self, db_name):
+        """
+        Async counterpart of get_user_rewards.
 
-            rewards = {}
-            for public_key, total_jobs in user_entries:
-                reward_per_job = 0
-                for threshold, reward in sorted(tiers.items(), reverse=True):
-                    if total_jobs >= threshold:
-                        reward_per_job = reward
-                        break
-                rewards[public_key] = total_jobs * reward_per_job
+        The reward query runs on the async pool; the web3 transaction is
+        synchronous and runs in a worker thread.
 
-            self.logger.info("\nTier-Based Rewards:")
-            for user, reward in rewards.items():
-                self.logger.info(f"  User '{user}': {reward:.2f} tokens")
+        Args:
+            db_name (str): The name of the database to query for user rewards
+        """
+        user_rewards = await self.areward_users_constant(db_name)
 
-            return rewards
+        if not user_rewards:
+            self.logger.info("No rewards to distribute")
+            return
 
-        except Exception as e:
-            self.logger.error(f"Error calculating tier-based rewards: {e}")
-        finally:
-            cursor.close()
-            conn.close()
+        recipients = list(user_rewards.keys())
+        amounts = list(user_rewards.values())
+        self.logger.info(
+            f"Issuing tokens to {len(recipients)} users in a single transaction"
+        )
+        await asyncio.to_thread(self.batch_issue_tokens, recipients, amounts)
@@ -0,0 +1,51 @@
+"""
+CORS configuration shared by the API servers.
+
+Allowed origins come from the ALLOWED_ORIGINS environment variable as a
+comma-separated list. It defaults to "*" so development through ngrok keeps
+working; production deployments should set it to the frontend origins.
+"""
+
+import os
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+
+ALLOWED_METHODS = ["GET", "POST"]
+# Headers the frontends send; ngrok-skip-browser-warning bypasses ngrok's interstitial page
+ALLOWED_HEADERS = ["authorization", "content-type", "ngrok-skip-browser-warning"]
+# Let browsers cache preflight responses for a day
+PREFLIGHT_MAX_AGE = 86400
+
+
+def get_allowed_origins() -> List[str]:
+    """
+    Read the allowed CORS origins from the environment.
+
+    Returns:
+        List of allowed origins, ["*"] if ALLOWED_ORIGINS is unset or empty
+    """
+    origins = [
+        origin.strip()
+        for origin in os.getenv("ALLOWED_ORIGINS", "*").split(",")
+        if origin.strip()
+    ]
+    return origins or ["*"]
+
+
+def add_cors_middleware(app: FastAPI) -> None:
+    """
+    Add the shared CORS middleware to an app.
+
+    Args:
+        app: The FastAPI application
+    """
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=get_allowed_origins(),
+        allow_credentials=False,  # Must be False when allow_origins=["*"]
+        allow_methods=ALLOWED_METHODS,
+        allow_headers=ALLOWED_HEADERS,
+        max_age=PREFLIGHT_MAX_AGE,
+    )
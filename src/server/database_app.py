@@ -2,16 +2,21 @@ from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 from src.utils.logging_utils import get_user_logger
+from src.server.cors import add_cors_middleware
 from src.query.evaluation_agent import EvaluationAgent
 from src.reranking.cross_encoder import CrossEncoderRanker
 from src.reranking.aggregator import ResultAggregator, AggregationStrategy, AggregationConfig
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse, Response
+import asyncio
 import json
-from fastapi.middleware.cors import CORSMiddleware
+import orjson
+from fastapi.middleware.gzip import GZipMiddleware
 from src.db.db_creator_main import create_user_database
 import os
 import uuid
 from datetime import datetime
+from functools import lru_cache
 import math
 
 # Define PROJECT_ROOT
@@ -22,16 +27,14 @@ app = FastAPI(
     title="Database API",
     description="Database API - handles database operations",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
-# Add CORS middleware - Allow all origins for development with ngrok
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins for ngrok compatibility
-    allow_credentials=False,  # Must be False when allow_origins=["*"]
-    allow_methods=["GET", "POST", "OPTIONS"],
-    allow_headers=["*"],
-)
+# Add CORS middleware - origins come from ALLOWED_ORIGINS, all by default
+add_cors_middleware(app)
+
+# Compress larger JSON bodies such as evaluation results; small ones are sent as is
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 
 class CreateDatabaseRequest(BaseModel):
@@ -76,6 +79,12 @@ class RerankRequest(BaseModel):
     device: Optional[str] = "cpu"  # default to CPU for consistent behavior
 
 
+@lru_cache(maxsize=8)
+def get_evaluation_agent(model_name: str) -> EvaluationAgent:
+    """Get the shared evaluation agent for a model; agents keep no per-request state"""
+    return EvaluationAgent(model_name=model_name)
+
+
 def get_user_temp_dir(user_email: str) -> Path:
     """Get the temp directory path for a user"""
     return PROJECT_ROOT / "temp" / user_email
@@ -489,23 +498,24 @@ async def evaluate_endpoint(request: EvaluationRequest):
 
         user_logger.info(f"Using database path: {user_db_path}")
 
-        # Initialize evaluation agent
-        agent = EvaluationAgent(model_name=request.model_name)
+        # Get the evaluation agent for this model
+        agent = get_evaluation_agent(request.model_name)
 
-        # Run query on collections with user-specific database path
-        results_file = agent.query_collections(
+        # Run query on collections with user-specific database path, off the event loop
+        results_file = await asyncio.to_thread(
+            agent.query_collections,
             query=request.query,
             db_path=user_db_path,
             user_email=request.user_email,
             k=request.k,
         )
 
-        # Read the results from the JSON file
-        with open(results_file, "r") as f:
-            results = json.load(f)
+        # The results file is already JSON, so return its bytes as they are
+        with open(results_file, "rb") as f:
+            body = f.read()
 
         user_logger.info("Successfully completed evaluation query")
-        return results
+        return Response(content=body, media_type="application/json")
     except Exception as e:
         user_logger.error(f"Error in evaluation: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -533,11 +543,12 @@ async def evaluate_aggregate_endpoint(request: EvaluationAggregateRequest):
 
         user_logger.info(f"Using database path: {user_db_path}")
 
-        # Initialize evaluation agent
-        agent = EvaluationAgent(model_name=request.model_name)
+        # Get the evaluation agent for this model
+        agent = get_evaluation_agent(request.model_name)
 
-        # Run query on collections with user-specific database path
-        results_file = agent.query_collections(
+        # Run query on collections with user-specific database path, off the event loop
+        results_file = await asyncio.to_thread(
+            agent.query_collections,
             query=request.query,
             db_path=user_db_path,
             user_email=request.user_email,
@@ -545,8 +556,8 @@ async def evaluate_aggregate_endpoint(request: EvaluationAggregateRequest):
         )
 
         # Read the results from the JSON file
-        with open(results_file, "r") as f:
-            evaluation_results = json.load(f)
+        with open(results_file, "rb") as f:
+            evaluation_results = orjson.loads(f.read())
 
         user_logger.info("Successfully completed evaluation query, now aggregating results")
 
@@ -8,13 +8,13 @@ import asyncio
 import glob
 import json
 from pathlib import Path
-from fastapi.middleware.cors import CORSMiddleware
 import requests
 
 # Import your entry points
 from src.utils.gdrive_scraper import scrape_gdrive_pdfs
 from src.core.processor_main import process_combination
 from src.utils.logging_utils import get_user_logger
+from src.server.cors import add_cors_middleware
 from src.utils.file_lock import load_jobs_safe, save_jobs_safe, reset_job_tracking_safe
 from src.utils.file_lock import increment_job_progress_safe
 
@@ -25,14 +25,8 @@ app = FastAPI(
     version="0.1.0",
 )
 
-# Add CORS middleware - Allow all origins for development with ngrok
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins for ngrok compatibility
-    allow_credentials=False,  # Must be False when allow_origins=["*"]
-    allow_methods=["GET", "POST", "OPTIONS"],
-    allow_headers=["*"],
-)
+# Add CORS middleware - origins come from ALLOWED_ORIGINS, all by default
+add_cors_middleware(app)
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 
@@ -1,30 +1,88 @@
 # Light FastAPI server for quick endpoints (evaluation, status)
 from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
-from pydantic import BaseModel, EmailStr
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, EmailStr, field_validator
 from typing import List, Dict
 import json
 from pathlib import Path
-from fastapi.middleware.cors import CORSMiddleware
 import logging
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
 import os
+import re
+import shutil
+import string
+import time
+import uuid
+import aiofiles
 import requests
 
 # Import your entry points
 from src.scraper.openalex_scraper import OpenAlexScraper
 from src.scraper.config import ScraperConfig
 from src.utils.logging_utils import get_user_logger
+from src.server.cors import add_cors_middleware
 from src.utils.file_lock import load_jobs_safe
 from src.utils.ipfs_utils import get_ipfs_client
+from src.utils.embedding_codec import decode_embedding
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create a thread pool executor for CPU-intensive tasks
-_thread_pool = ThreadPoolExecutor(max_workers=2)
+
+def _make_scrape_pool() -> Executor:
+    """
+    Create a single-worker executor used for scraping.
+
+    Scraping and zipping are CPU-bound and hold the GIL, so they run in a
+    worker process. Workers are spawned rather than forked, like the PDF
+    processor's, so they do not inherit the server's event loop, locks or open
+    sockets. Platforms that cannot start a process pool fall back to a thread.
+    """
+    try:
+        return ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+    except (ImportError, NotImplementedError, OSError) as e:
+        logger.warning(f"Process pool unavailable, scraping in threads instead: {e}")
+        return ThreadPoolExecutor(max_workers=1)
+
+
+# Executors for CPU-intensive scraping tasks, sharded so that independent
+# users submit to independent queues
+SCRAPE_SHARDS = max(2, (os.cpu_count() or 1) // 2)
+_scrape_pools = [_make_scrape_pool() for _ in range(SCRAPE_SHARDS)]
+# Scrapes submitted to each shard and not yet finished; only touched on the event loop
+_shard_load = [0] * SCRAPE_SHARDS
+
+
+def _shard_for(user_email: str) -> int:
+    """
+    Pick the scrape executor shard for a user.
+
+    A user's home shard is hash(user_email) % SCRAPE_SHARDS. A busy home shard
+    no longer queues work while another shard sits idle: the least-loaded
+    shard is chosen, and the home shard wins ties.
+    """
+    home = hash(user_email) % SCRAPE_SHARDS
+    return min(range(SCRAPE_SHARDS), key=lambda i: (_shard_load[i], i != home))
+
+
+def _replace_broken_pool(shard: int, broken: Executor) -> None:
+    """
+    Swap a shard's process pool for a fresh one after its worker died.
+
+    A ProcessPoolExecutor whose worker was killed (e.g. OOM or a crash in PDF
+    handling) rejects every later submission, so it has to be replaced.
+    Nothing happens if the shard was already given a new pool.
+    """
+    if _scrape_pools[shard] is not broken:
+        return
+    logger.warning(f"Scrape worker for shard {shard} died, starting a new one")
+    _scrape_pools[shard] = _make_scrape_pool()
+    broken.shutdown(wait=False)
+
 
 # Setup FastAPI app
 app = FastAPI(
@@ -33,25 +91,57 @@ app = FastAPI(
     version="0.1.0",
 )
 
-# Add CORS middleware - Allow all origins for development with ngrok
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Allow all origins for ngrok compatibility
-    allow_credentials=False,  # Must be False when allow_origins=["*"]
-    allow_methods=["GET", "POST", "OPTIONS"],
-    allow_headers=["*"],
-)
+# Add CORS middleware - origins come from ALLOWED_ORIGINS, all by default
+add_cors_middleware(app)
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 WHITELIST_PATH = Path(__file__).parent / "whitelisted_emails.txt"
 
+# When the app runs behind nginx, set this to an internal location aliased to
+# the scraper's downloads directory, e.g.
+#   location /internal/zips/ { internal; alias /app/downloads/; }
+# so that nginx sends the zip itself via sendfile instead of this worker.
+ZIP_ACCEL_REDIRECT_PREFIX = os.getenv("ZIP_ACCEL_REDIRECT_PREFIX", "").rstrip("/")
+# nginx reads the zip after the response has left the app, so cleanup waits
+CLEANUP_DELAY_SECONDS = float(os.getenv("CLEANUP_DELAY_SECONDS", "300"))
+# Chunk size used when the app streams the zip itself
+ZIP_STREAM_CHUNK_SIZE = 1 << 20
+
+
+class _FilenameTable(dict):
+    """str.translate table that keeps ASCII letters, digits, space, '-' and '_' and drops everything else."""
+
+    def __missing__(self, codepoint):
+        return None
+
 
-def _scrape_papers_sync(scraper, cleanup_pdfs):
+_FILENAME_TABLE = _FilenameTable({ord(c): ord(c) for c in string.ascii_letters + string.digits + " -_"})
+
+
+# Status polling is bursty, so jobs.json is re-read at most once per TTL
+JOBS_CACHE_TTL = 0.25
+_jobs_cache = {"ts": 0.0, "data": {}}
+_jobs_cache_lock = asyncio.Lock()
+
+# Scrapes currently running, keyed by normalized research area, so that
+# identical concurrent requests share one scrape
+_inflight: Dict[str, asyncio.Future] = {}
+
+# Parsed whitelist, reloaded only when the file's mtime or size changes
+_wl_cache = {"key": None, "set": frozenset()}
+
+
+def _scrape_papers_sync(research_area: str, user_email: str, cleanup_pdfs: bool):
     """
     Synchronous helper function to scrape papers.
-    This runs in a separate thread to avoid blocking the event loop.
+    This runs in a worker process, so it takes plain arguments and builds the
+    scraper there instead of pickling one across.
     """
     try:
+        config = ScraperConfig.from_research_area(
+            research_area=research_area, user_email=user_email
+        )
+        scraper = OpenAlexScraper(config)
         return scraper.scrape_and_create_zip(cleanup_pdfs)
     except Exception as e:
         return False, str(e), [], None
@@ -62,13 +152,127 @@ def cleanup_zip_file(zip_path: str):
     # Use system logger for cleanup operations
     system_logger = get_user_logger("system", "light_server")
     try:
-        if os.path.exists(zip_path):
-            os.remove(zip_path)
-            system_logger.info(f"Cleaned up zip file: {zip_path}")
+        os.remove(zip_path)
+        system_logger.info(f"Cleaned up zip file: {zip_path}")
+    except FileNotFoundError:
+        pass
     except Exception as e:
         system_logger.warning(f"Error cleaning up zip file {zip_path}: {e}")
 
 
+async def _iter_zip(zip_path: str):
+    """Yield a zip file in fixed-size chunks without blocking the event loop."""
+    async with aiofiles.open(zip_path, "rb") as f:
+        while chunk := await f.read(ZIP_STREAM_CHUNK_SIZE):
+            yield chunk
+
+
+async def get_cached_jobs() -> dict:
+    """
+    Return the contents of jobs.json, re-reading it at most once per JOBS_CACHE_TTL.
+
+    The read runs in a worker thread, and concurrent callers wait on the same
+    read instead of each taking the file lock.
+    """
+    async with _jobs_cache_lock:
+        now = time.monotonic()
+        if now - _jobs_cache["ts"] > JOBS_CACHE_TTL:
+            _jobs_cache["data"] = await asyncio.to_thread(load_jobs_safe)
+            _jobs_cache["ts"] = time.monotonic()
+        return _jobs_cache["data"]
+
+
+def _write_copy(src, copy_path: str) -> None:
+    """Copy an open file to copy_path."""
+    with open(copy_path, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+
+
+async def _copy_zip_for_request(zip_path: str) -> str:
+    """
+    Give a request its own copy of a shared zip so it can be cleaned up independently.
+
+    A hard link is used where possible; it is instant and takes no extra space.
+    Otherwise the zip is copied in a worker thread so large files do not block
+    the event loop.
+    """
+    base, ext = os.path.splitext(zip_path)
+    copy_path = f"{base}_{uuid.uuid4().hex[:8]}{ext}"
+    try:
+        os.link(zip_path, copy_path)
+    except OSError:
+        # Open the zip before yielding to the loop, so the owner's cleanup
+        # cannot remove it before the copy starts
+        with open(zip_path, "rb") as src:
+            await asyncio.to_thread(_write_copy, src, copy_path)
+    return copy_path
+
+
+async def _scrape_deduplicated(research_area: str, user_email: str):
+    """
+    Scrape papers for a research area, sharing the work with identical requests in flight.
+
+    The first request for a research area runs the scrape and owns the zip it
+    produces. Requests for the same area that arrive while it is running wait
+    for the same result and get their own copy of the zip, so each request's
+    cleanup only removes its own file.
+
+    Args:
+        research_area: Research area to scrape
+        user_email: Email of the requesting user
+
+    Returns:
+        Tuple of (success, message_or_error, downloaded_files, zip_file_path)
+    """
+    key = " ".join(research_area.lower().split())
+    fut = _inflight.get(key)
+    if fut is not None:
+        # Copy straight after waking up: the owner only removes its zip once
+        # the response has been sent, which happens after this callback runs
+        success, result_message, downloaded_files, zip_path = await asyncio.shield(fut)
+        if success and zip_path:
+            zip_path = await _copy_zip_for_request(zip_path)
+        return success, result_message, downloaded_files, zip_path
+
+    # Run scraping in the least-loaded worker shard to avoid blocking
+    loop = asyncio.get_running_loop()
+    shard = _shard_for(user_email)
+    pool = _scrape_pools[shard]
+    try:
+        fut = loop.run_in_executor(
+            pool, _scrape_papers_sync, research_area, user_email, True  # cleanup_pdfs=True
+        )
+    except BrokenProcessPool:
+        # The shard's worker died since its last scrape; retry once on a new pool
+        _replace_broken_pool(shard, pool)
+        pool = _scrape_pools[shard]
+        fut = loop.run_in_executor(
+            pool, _scrape_papers_sync, research_area, user_email, True  # cleanup_pdfs=True
+        )
+    _shard_load[shard] += 1
+    _inflight[key] = fut
+
+    def _on_done(done):
+        _shard_load[shard] -= 1
+        _inflight.pop(key, None)
+        # Replace the pool as soon as a worker dies mid-scrape, so the next
+        # request does not have to hit the broken pool first
+        if not done.cancelled() and isinstance(done.exception(), BrokenProcessPool):
+            _replace_broken_pool(shard, pool)
+
+    fut.add_done_callback(_on_done)
+    return await asyncio.shield(fut)
+
+
+async def cleanup_zip_file_later(zip_path: str, delay: float):
+    """Background task to clean up a zip file once nginx has had time to serve it."""
+    await asyncio.sleep(delay)
+    cleanup_zip_file(zip_path)
+
+
+_EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
 # Define request/response models
 class UserStatusResponse(BaseModel):
     user_email: str
@@ -80,7 +284,16 @@ class UserStatusResponse(BaseModel):
 
 
 class EmailValidationRequest(BaseModel):
-    email: EmailStr
+    # Only checked against the whitelist, so a cheap shape check is enough here;
+    # full EmailStr validation is kept for adding emails
+    email: str
+
+    @field_validator("email")
+    @classmethod
+    def _check_email(cls, value: str) -> str:
+        if not _EMAIL_RE.match(value):
+            raise ValueError("value is not a valid email address")
+        return value.lower()
 
 
 class EmailValidationResponse(BaseModel):
@@ -103,6 +316,10 @@ class ResearchScrapeRequest(BaseModel):
     user_email: str
 
 
+class BulkStatusRequest(BaseModel):
+    user_emails: List[str]
+
+
 class BatchRetrievalRequest(BaseModel):
     embedding_cids: List[str]
     content_cids: List[str]
@@ -116,27 +333,33 @@ class BatchRetrievalResponse(BaseModel):
     failed_contents: List[str]  # CIDs that failed to retrieve
 
 
-def load_whitelisted_emails() -> set:
-    """Load whitelisted emails from the file"""
-    if not WHITELIST_PATH.exists():
-        return set()
-
-    with open(WHITELIST_PATH, "r") as f:
-        emails = {
-            line.strip() for line in f if line.strip() and not line.startswith("#")
-        }
-    return emails
+def load_whitelisted_emails() -> frozenset:
+    """Load whitelisted emails from the file, reusing the parsed set while it is unchanged"""
+    try:
+        st = WHITELIST_PATH.stat()
+    except FileNotFoundError:
+        return frozenset()
+
+    key = (st.st_mtime_ns, st.st_size)
+    if key != _wl_cache["key"]:
+        with open(WHITELIST_PATH, "r") as f:
+            # Lookups use lowercased emails, so entries are normalized the same way
+            _wl_cache["set"] = frozenset(
+                line.strip().lower() for line in f if line.strip() and not line.startswith("#")
+            )
+        _wl_cache["key"] = key
+    return _wl_cache["set"]
 
 
 @app.post("/api/auth/validate-email", response_model=EmailValidationResponse)
-async def validate_email(request: EmailValidationRequest):
+def validate_email(request: EmailValidationRequest):
     """Validate if an email is whitelisted"""
     # Create user-specific logger for this request
     user_logger = get_user_logger(request.email, "email_validation")
 
     try:
         whitelisted_emails = load_whitelisted_emails()
-        email = request.email.lower()
+        email = request.email
 
         # Check if email is in whitelist
         is_valid = email in whitelisted_emails
@@ -204,23 +427,13 @@ async def scrape_research_papers(
         if not request.research_area.strip():
             raise HTTPException(status_code=400, detail="Research area cannot be empty")
 
-        # Create scraper configuration
-        config = ScraperConfig.from_research_area(
-            research_area=request.research_area.strip(), user_email=request.user_email
-        )
-
-        # Create scraper instance
-        scraper = OpenAlexScraper(config)
-
-        # Run scraping in the shared thread pool to avoid blocking
-        loop = asyncio.get_event_loop()
         (
             success,
             result_message,
             downloaded_files,
             zip_path,
-        ) = await loop.run_in_executor(
-            _thread_pool, _scrape_papers_sync, scraper, True  # cleanup_pdfs=True
+        ) = await _scrape_deduplicated(
+            request.research_area.strip(), request.user_email
         )
 
         if success and zip_path:
@@ -229,26 +442,33 @@ async def scrape_research_papers(
             )
             user_logger.info(f"Returning zip file: {zip_path}")
 
-            # Schedule cleanup of the zip file after response is sent
-            background_tasks.add_task(cleanup_zip_file, zip_path)
-
             # Get a clean filename for the download
-            safe_topic = "".join(
-                c
-                for c in request.research_area[:30]
-                if c.isalnum() or c in (" ", "-", "_")
-            ).strip()
+            safe_topic = request.research_area[:30].translate(_FILENAME_TABLE).strip()
             download_filename = f"research_papers_{safe_topic}.zip"
+            headers = {
+                "Content-Disposition": f"attachment; filename={download_filename}",
+                "X-Papers-Count": str(len(downloaded_files)),
+                "X-Research-Area": request.research_area[:100],
+            }
+
+            if ZIP_ACCEL_REDIRECT_PREFIX:
+                # Hand the transfer to nginx and clean up once it has read the file
+                background_tasks.add_task(
+                    cleanup_zip_file_later, zip_path, CLEANUP_DELAY_SECONDS
+                )
+                headers["X-Accel-Redirect"] = (
+                    f"{ZIP_ACCEL_REDIRECT_PREFIX}/{os.path.basename(zip_path)}"
+                )
+                return Response(
+                    status_code=200, media_type="application/zip", headers=headers
+                )
+
+            # Schedule cleanup of the zip file after the stream has been sent
+            background_tasks.add_task(cleanup_zip_file, zip_path)
+            headers["Content-Length"] = str(os.path.getsize(zip_path))
 
-            return FileResponse(
-                path=zip_path,
-                filename=download_filename,
-                media_type="application/zip",
-                headers={
-                    "Content-Disposition": f"attachment; filename={download_filename}",
-                    "X-Papers-Count": str(len(downloaded_files)),
-                    "X-Research-Area": request.research_area[:100],
-                },
+            return StreamingResponse(
+                _iter_zip(zip_path), media_type="application/zip", headers=headers
             )
         else:
             user_logger.error(
@@ -287,9 +507,9 @@ async def batch_retrieve_ipfs_data(request: BatchRetrievalRequest):
         for cid in request.embedding_cids:
             try:
                 content = ipfs_client.get_content(cid)
-                embedding_vector = json.loads(content)
+                embedding_vector = decode_embedding(content)
                 embeddings[cid] = embedding_vector
-            except (requests.exceptions.RequestException, json.JSONDecodeError) as e:
+            except (requests.exceptions.RequestException, ValueError) as e:
                 user_logger.error(f"Failed to retrieve embedding for CID {cid}: {e}")
                 failed_embeddings.append(cid)
 
@@ -319,6 +539,17 @@ async def batch_retrieve_ipfs_data(request: BatchRetrievalRequest):
         raise HTTPException(status_code=500, detail=f"Batch retrieval failed: {str(e)}")
 
 
+def _user_status(jobs: dict, user_email: str) -> dict:
+    """Build the status payload for one user from the parsed jobs mapping."""
+    total_jobs, completed_jobs = jobs.get(user_email, [0, 0])
+    completion_percentage = (completed_jobs / total_jobs * 100) if total_jobs > 0 else 0
+    return {
+        "total_jobs": total_jobs,
+        "completed_jobs": completed_jobs,
+        "completion_percentage": completion_percentage,
+    }
+
+
 @app.get("/api/v1/user/status")
 async def get_user_status(user_email: str):
     """Get processing status for a specific user - fast status check"""
@@ -326,24 +557,29 @@ async def get_user_status(user_email: str):
     user_logger = get_user_logger(user_email, "status_check")
 
     try:
-        # Use thread-safe file locking for reading jobs.json
-        jobs = load_jobs_safe()
-        total_jobs, completed_jobs = jobs.get(user_email, [0, 0])
-        completion_percentage = (
-            (completed_jobs / total_jobs * 100) if total_jobs > 0 else 0
+        jobs = await get_cached_jobs()
+        status = _user_status(jobs, user_email)
+        user_logger.debug(
+            f"Status check: {status['completed_jobs']}/{status['total_jobs']} jobs completed"
         )
-        user_logger.debug(f"Status check: {completed_jobs}/{total_jobs} jobs completed")
 
-        return {
-            "total_jobs": total_jobs,
-            "completed_jobs": completed_jobs,
-            "completion_percentage": completion_percentage,
-        }
+        return status
     except Exception as e:
         user_logger.error(f"Error getting user status: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/v1/user/status/bulk")
+async def get_bulk_user_status(request: BulkStatusRequest):
+    """Get processing status for several users from a single read of jobs.json"""
+    try:
+        jobs = await get_cached_jobs()
+        return {email: _user_status(jobs, email) for email in request.user_emails}
+    except Exception as e:
+        logger.error(f"Error getting bulk user status: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -0,0 +1,126 @@
+"""
+Embedding serialization utilities.
+
+This module encodes embedding vectors for storage on IPFS and decodes them
+again. float32 embeddings are stored as plain JSON lists, as they always have
+been; float16 and int8 embeddings are stored as a small JSON envelope holding
+the dtype and the base64-encoded quantized values.
+"""
+
+import base64
+from typing import List, Union
+
+import numpy as np
+import orjson
+
+SUPPORTED_DTYPES = ("float32", "float16", "int8")
+
+
+def encode_embedding(embedding: List[float], dtype: str = "float32") -> bytes:
+    """
+    Serialize an embedding for upload.
+
+    Args:
+        embedding: The embedding vector
+        dtype: Storage dtype, one of SUPPORTED_DTYPES
+
+    Returns:
+        JSON bytes describing the embedding
+
+    Raises:
+        ValueError: If dtype is not supported
+    """
+    return encode_embeddings([embedding], dtype)[0]
+
+
+def encode_embeddings(embeddings: List[List[float]], dtype: str = "float32") -> List[bytes]:
+    """
+    Serialize a batch of embeddings for upload.
+
+    Quantization is done on the whole (n, dim) matrix at once rather than
+    vector by vector.
+
+    Args:
+        embeddings: Embedding vectors, all of the same dimension
+        dtype: Storage dtype, one of SUPPORTED_DTYPES
+
+    Returns:
+        JSON bytes describing each embedding, in input order
+
+    Raises:
+        ValueError: If dtype is not supported
+    """
+    if dtype not in SUPPORTED_DTYPES:
+        raise ValueError(
+            f"Unsupported embedding dtype: {dtype}. Must be one of {', '.join(SUPPORTED_DTYPES)}"
+        )
+
+    if dtype == "float32":
+        return [orjson.dumps(embedding) for embedding in embeddings]
+
+    if not embeddings:
+        return []
+
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    dim = int(matrix.shape[1])
+
+    if dtype == "float16":
+        rows = matrix.astype(np.float16)
+        return [
+            orjson.dumps(
+                {
+                    "dtype": "float16",
+                    "dim": dim,
+                    "data": base64.b64encode(row.tobytes()).decode(),
+                }
+            )
+            for row in rows
+        ]
+
+    # int8: symmetric per-vector scale so the largest component maps to +/-127
+    max_abs = np.abs(matrix).max(axis=1)
+    scales = np.where(max_abs > 0, max_abs / 127, 1.0).astype(np.float32)
+    rows = np.clip(np.round(matrix / scales[:, None]), -127, 127).astype(np.int8)
+    return [
+        orjson.dumps(
+            {
+                "dtype": "int8",
+                "dim": dim,
+                "scale": float(scale),
+                "data": base64.b64encode(row.tobytes()).decode(),
+            }
+        )
+        for row, scale in zip(rows, scales)
+    ]
+
+
+def decode_embedding(content: Union[str, bytes]) -> List[float]:
+    """
+    Deserialize an embedding written by encode_embedding.
+
+    Args:
+        content: Stored embedding, either a JSON list or a quantized envelope
+
+    Returns:
+        The embedding as a list of floats
+
+    Raises:
+        ValueError: If the content is not a valid embedding
+    """
+    value = orjson.loads(content)
+    if isinstance(value, list):
+        return value
+
+    try:
+        dtype = value["dtype"]
+        data = base64.b64decode(value["data"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError(f"Invalid embedding envelope: {e}") from e
+
+    if dtype == "float16":
+        return np.frombuffer(data, dtype=np.float16).astype(np.float32).tolist()
+    if dtype == "int8":
+        vector = np.frombuffer(data, dtype=np.int8).astype(np.float32)
+        return (vector * np.float32(value["scale"])).tolist()
+
+    raise ValueError(f"Unsupported embedding dtype: {dtype}")
@@ -5,19 +5,23 @@ This module provides unified IPFS operations supporting both Lighthouse and loca
 """
 
 import os
-import tempfile
 import urllib.parse
 from pathlib import Path
 from typing import Optional, Union
 
 import requests
 import requests_unixsocket
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from src.utils.logging_utils import get_logger
 
 # Get logger for this module
 logger = get_logger(__name__)
 
+# (connect, read) timeout in seconds for IPFS requests
+REQUEST_TIMEOUT = (5, 60)
+
 
 class IPFSClient:
     """Handles IPFS operations supporting both Lighthouse and local IPFS."""
@@ -40,6 +44,18 @@ class IPFSClient:
             self.api_url = "https://node.lighthouse.storage/api/v0/add"
             self.gateway_url = "https://gateway.lighthouse.storage/ipfs"
 
+            # Reuse connections (and TLS sessions) across uploads; the pool is
+            # sized for the Processor's concurrent uploads
+            self.session = requests.Session()
+            self.session.mount(
+                "https://",
+                HTTPAdapter(
+                    pool_connections=16,
+                    pool_maxsize=64,
+                    max_retries=Retry(total=3, backoff_factor=0.3),
+                ),
+            )
+
         elif self.mode == "local":
             self.socket_path = socket_path or os.getenv(
                 "IPFS_SOCKET_PATH", "/root/.ipfs/api.sock"
@@ -81,23 +97,25 @@ class IPFSClient:
 
         if self.mode == "lighthouse":
             with open(filepath, "rb") as f:
-                headers = {"Authorization": f"Bearer {self.api_key}"}
-                response = requests.post(
-                    self.api_url, headers=headers, files={"file": f}
-                )
-        else:  # local mode
-            # Follow the exact pattern from the user's working example
-            with open(filepath, "rb") as f:
-                file_content = f.read()
+                return self._add({"file": f})
 
-            files = {"file": (filepath.name, file_content, "application/octet-stream")}
+        with open(filepath, "rb") as f:
+            file_content = f.read()
 
-            response = self.ipfs_unix_session.post(
-                f"{self.base_url}/add?pin=true", files=files
-            )
+        return self.upload_bytes(file_content, filepath.name)
 
-        response.raise_for_status()
-        return response.json()["Hash"]
+    def upload_bytes(self, data: bytes, filename: str = "file") -> str:
+        """
+        Upload in-memory content to IPFS and return the CID.
+
+        Args:
+            data: Content to upload
+            filename: Filename reported in the multipart upload
+
+        Returns:
+            IPFS CID of the uploaded content
+        """
+        return self._add({"file": (filename, data, "application/octet-stream")})
 
     def upload_text(self, text: str, filename: Optional[str] = None) -> str:
         """
@@ -105,20 +123,28 @@ class IPFSClient:
 
         Args:
             text: Text content to upload
-            filename: Optional filename for the temporary file
+            filename: Optional filename reported in the upload
 
         Returns:
             IPFS CID of the uploaded content
         """
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as tmp:
-            tmp.write(text)
-            tmp_path = tmp.name
+        return self.upload_bytes(text.encode("utf-8"), filename or "file.txt")
+
+    def _add(self, files: dict) -> str:
+        """Send a multipart add request to the configured IPFS backend."""
+        if self.mode == "lighthouse":
+            headers = {"Authorization": f"Bearer {self.api_key}"}
+            response = self.session.post(
+                self.api_url, headers=headers, files=files, timeout=REQUEST_TIMEOUT
+            )
+        else:  # local mode
+            # Follow the exact pattern from the user's working example
+            response = self.ipfs_unix_session.post(
+                f"{self.base_url}/add?pin=true", files=files, timeout=REQUEST_TIMEOUT
+            )
 
-        try:
-            cid = self.upload_file(tmp_path)
-            return cid
-        finally:
-            os.unlink(tmp_path)
+        response.raise_for_status()
+        return response.json()["Hash"]
 
     def get_content(self, cid: str) -> str:
         """
@@ -132,10 +158,12 @@ class IPFSClient:
         """
         if self.mode == "lighthouse":
             url = f"{self.gateway_url}/{cid}"
-            response = requests.get(url)
+            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
         else:  # local mode
             # Follow the exact pattern from the user's working example
-            response = self.ipfs_unix_session.post(f"{self.base_url}/cat?arg={cid}")
+            response = self.ipfs_unix_session.post(
+                f"{self.base_url}/cat?arg={cid}", timeout=REQUEST_TIMEOUT
+            )
 
         response.raise_for_status()
         return (
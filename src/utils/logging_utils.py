@@ -55,6 +55,12 @@ def get_user_log_dir(user_email: str) -> Path:
     return user_log_dir
 
 
+def _user_logger_name(user_email: str, name=None) -> str:
+    """Return the unique logger name for a user and component."""
+    sanitized_email = sanitize_email_for_path(user_email)
+    return f"user_{sanitized_email}_{name}" if name else f"user_{sanitized_email}"
+
+
 def setup_user_logger(user_email: str, name=None, level=None):
     """
     Configure and return a user-specific logger with consistent formatting.
@@ -72,14 +78,8 @@ def setup_user_logger(user_email: str, name=None, level=None):
         level_name = os.environ.get("SRC_LOG_LEVEL", "INFO")
         level = getattr(logging, level_name.upper(), logging.INFO)
 
-    # Create unique logger name for each user and component
-    sanitized_email = sanitize_email_for_path(user_email)
-    logger_name = (
-        f"user_{sanitized_email}_{name}" if name else f"user_{sanitized_email}"
-    )
-
     # Get or create logger
-    logger = logging.getLogger(logger_name)
+    logger = logging.getLogger(_user_logger_name(user_email, name))
     logger.setLevel(level)
 
     # Prevent inheritance from parent loggers to avoid duplicate messages
@@ -88,6 +88,7 @@ def setup_user_logger(user_email: str, name=None, level=None):
     # Always clear existing handlers to avoid duplicates
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
+        handler.close()
 
     # Create formatters
     formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
@@ -128,8 +129,13 @@ def get_user_logger(user_email: str, name=None):
     Returns:
         User-specific logger instance
     """
-    # Always setup the logger to ensure proper configuration
-    return setup_user_logger(user_email, name)
+    logger = logging.getLogger(_user_logger_name(user_email, name))
+
+    # Only set the logger up the first time; later calls reuse its handlers
+    if not logger.handlers:
+        logger = setup_user_logger(user_email, name)
+
+    return logger
 
 
 def setup_logger(name=None, level=None, log_file=None):
@@ -21,19 +21,22 @@ class MockModule(MagicMock):
 
 
 # Create mock modules before any tests run
-MOCK_MODULES = ["cv2", "marker", "surya"]
-for mod_name in MOCK_MODULES:
-    sys.modules[mod_name] = MockModule()
-    # Also mock submodules that might be imported
-    for submod in ["config", "converters", "builders", "layout", "common"]:
-        sys.modules[f"{mod_name}.{submod}"] = MockModule()
-        sys.modules[f"{mod_name}.{submod}.parser"] = MockModule()
-        sys.modules[f"{mod_name}.{submod}.pdf"] = MockModule()
-        sys.modules[f"{mod_name}.{submod}.document"] = MockModule()
-        sys.modules[f"{mod_name}.{submod}.layout"] = MockModule()
-        sys.modules[f"{mod_name}.{submod}.loader"] = MockModule()
-        sys.modules[f"{mod_name}.{submod}.donut"] = MockModule()
-        sys.modules[f"{mod_name}.{submod}.donut.processor"] = MockModule()
+MOCK_MODULES = ("cv2", "marker", "surya")
+# Submodules that might be imported, and their own submodules
+MOCK_SUBMODULES = ("config", "converters", "builders", "layout", "common", "models")
+MOCK_LEAVES = ("", ".parser", ".pdf", ".document", ".layout", ".loader", ".donut", ".donut.processor")
+
+
+def _expand_mock_names(modules, submodules, leaves):
+    """Return every module path to mock, parents included."""
+    names = list(modules)
+    names.extend(f"{mod}.{sub}{leaf}" for mod in modules for sub in submodules for leaf in leaves)
+    return names
+
+
+sys.modules.update(
+    {name: MockModule() for name in _expand_mock_names(MOCK_MODULES, MOCK_SUBMODULES, MOCK_LEAVES)}
+)
 
 # Set up mock for the convert function
 sys.modules["src.core.converter"] = MockModule()
@@ -138,13 +138,12 @@ class TestTokenRewardIntegration:
         for db_name in expected_db_names:
             mock_token_rewarder._create_database_and_table.assert_any_call(db_name)
 
-        # Verify add_reward_to_user was called for each author and database
-        expected_calls = 0
-        for author, jobs in mock_author_jobs.items():
-            for db_name in expected_db_names:
-                mock_token_rewarder.add_reward_to_user.assert_any_call(
-                    author, db_name, jobs
-                )
-                expected_calls += 1
-
-        assert mock_token_rewarder.add_reward_to_user.call_count == expected_calls
+        # Verify all authors were rewarded in one batch per database
+        batch_calls = mock_token_rewarder.batch_add_rewards.call_args_list
+        assert [call.args[0] for call in batch_calls] == expected_db_names
+        for call in batch_calls:
+            assert dict(call.args[1]) == mock_author_jobs
+        mock_token_rewarder.add_reward_to_user.assert_not_called()
+
+        # Verify queued rewards were flushed and connections closed
+        mock_token_rewarder.close.assert_called_once()
@@ -8,6 +8,7 @@ ChromaDB vector database collections.
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import numpy as np
 import pytest
 
 from src.db.chroma_client import VectorDatabaseManager
@@ -31,7 +32,7 @@ class TestVectorDatabaseManager:
 
                 # Verify
                 mock_makedirs.assert_called_once()
-                assert manager.db_names == ["openai_paragraph_openai"]
+                assert manager.db_names == ("openai_paragraph_openai",)
                 assert mock_instance.get_or_create_collection.call_count == 1
 
     def test_init_with_empty_db_names_raises_error(self):
@@ -105,23 +106,102 @@ class TestVectorDatabaseManager:
                 # Setup mock
                 mock_instance = mock_client.return_value
                 mock_collection = MagicMock()
-                mock_instance.get_collection.return_value = mock_collection
-                mock_instance.get_or_create_collection.return_value = MagicMock()
+                mock_instance.get_or_create_collection.return_value = mock_collection
 
                 # Initialize the manager
                 manager = VectorDatabaseManager(db_names)
 
-                # Insert document
+                # Insert document, which stays buffered until flushed
                 manager.insert_document(db_name, embedding, metadata, doc_id)
+                mock_collection.add.assert_not_called()
+                manager.flush()
+
+                # Verify the handle cached at initialization was used
+                mock_instance.get_collection.assert_not_called()
+                mock_collection.add.assert_called_once()
+                kwargs = mock_collection.add.call_args.kwargs
+                assert "documents" not in kwargs
+                assert kwargs["ids"] == [doc_id]
+                assert kwargs["metadatas"] == [metadata]
+                np.testing.assert_allclose(kwargs["embeddings"], [embedding])
+                assert kwargs["embeddings"].dtype == np.float32
+
+    def test_insert_document_flushes_at_batch_size(self):
+        """Test that buffered inserts are written once the batch size is reached."""
+        db_names = ["openai_paragraph_openai"]
+        db_name = "openai_paragraph_openai"
 
-                # Verify
-                mock_instance.get_collection.assert_called_once_with(name=db_name)
-                mock_collection.add.assert_called_once_with(
-                    documents=[metadata["content_cid"]],
-                    embeddings=embedding,
-                    ids=[doc_id],
-                    metadatas=[metadata],
-                )
+        with patch("chromadb.PersistentClient") as mock_client:
+            with patch("os.makedirs"):
+                # Setup mock
+                mock_instance = mock_client.return_value
+                mock_collection = MagicMock()
+                mock_instance.get_or_create_collection.return_value = mock_collection
+
+                # Initialize the manager with a small batch size
+                manager = VectorDatabaseManager(db_names, batch_size=2)
+
+                for i in range(3):
+                    manager.insert_document(
+                        db_name, [0.1, 0.2], {"content_cid": f"cid_{i}"}, f"doc_{i}"
+                    )
+
+                # Only the first full batch has been written
+                mock_collection.add.assert_called_once()
+                assert mock_collection.add.call_args.kwargs["ids"] == ["doc_0", "doc_1"]
+
+                manager.close()
+                assert mock_collection.add.call_count == 2
+                assert mock_collection.add.call_args.kwargs["ids"] == ["doc_2"]
+
+    def test_insert_document_raises_when_batch_write_fails(self):
+        """Test that a failed batch write is raised to the inserting caller."""
+        db_names = ["openai_paragraph_openai"]
+        db_name = "openai_paragraph_openai"
+
+        with patch("chromadb.PersistentClient") as mock_client:
+            with patch("os.makedirs"):
+                # Setup mock
+                mock_instance = mock_client.return_value
+                mock_collection = MagicMock()
+                mock_collection.add.side_effect = RuntimeError("disk full")
+                mock_instance.get_or_create_collection.return_value = mock_collection
+
+                manager = VectorDatabaseManager(db_names, batch_size=2)
+                manager.insert_document(db_name, [0.1, 0.2], {"content_cid": "cid_0"}, "doc_0")
+
+                with pytest.raises(Exception) as excinfo:
+                    manager.insert_document(db_name, [0.3, 0.4], {"content_cid": "cid_1"}, "doc_1")
+
+                assert "2 buffered documents" in str(excinfo.value)
+                assert "disk full" in str(excinfo.value)
+
+    def test_flush_raises_and_writes_remaining_databases(self):
+        """Test that flush() writes every database and then raises the first failure."""
+        db_names = ["openai_paragraph_openai", "openai_fixed_length_openai"]
+
+        with patch("chromadb.PersistentClient") as mock_client:
+            with patch("os.makedirs"):
+                # Setup mock: the first collection fails, the second succeeds
+                mock_instance = mock_client.return_value
+                failing_collection = MagicMock()
+                failing_collection.add.side_effect = RuntimeError("disk full")
+                working_collection = MagicMock()
+                mock_instance.get_or_create_collection.side_effect = [
+                    failing_collection,
+                    working_collection,
+                ]
+
+                manager = VectorDatabaseManager(db_names)
+                for db_name in db_names:
+                    manager.insert_document(db_name, [0.1, 0.2], {"content_cid": "cid"}, f"{db_name}_doc")
+
+                with pytest.raises(Exception) as excinfo:
+                    manager.flush()
+
+                assert "openai_paragraph_openai" in str(excinfo.value)
+                working_collection.add.assert_called_once()
+                assert manager._buffers == {}
 
     def test_insert_document_invalid_db(self):
         """Test inserting document into an invalid database raises error."""
@@ -146,6 +226,41 @@ class TestVectorDatabaseManager:
 
                 assert f"Database '{db_name}' does not exist" in str(excinfo.value)
 
+    def test_batch_insert_documents_converts_to_array(self):
+        """Test that batch inserts pass embeddings to Chroma as one float32 array."""
+        db_names = ["openai_paragraph_openai"]
+        db_name = "openai_paragraph_openai"
+        embeddings = [[0.1, 0.2], [0.3, 0.4]]
+        metadatas = [{"content_cid": "cid_1"}, {"content_cid": "cid_2"}]
+        doc_ids = ["doc_1", "doc_2"]
+
+        with patch("chromadb.PersistentClient") as mock_client:
+            with patch("os.makedirs"):
+                # Setup mock
+                mock_instance = mock_client.return_value
+                mock_collection = MagicMock()
+                mock_instance.get_or_create_collection.return_value = mock_collection
+
+                manager = VectorDatabaseManager(db_names)
+                manager.batch_insert_documents(db_name, embeddings, metadatas, doc_ids)
+
+                kwargs = mock_collection.add.call_args.kwargs
+                assert isinstance(kwargs["embeddings"], np.ndarray)
+                assert kwargs["embeddings"].shape == (2, 2)
+                assert kwargs["metadatas"] == metadatas
+
+                # Content CIDs given by the caller are stored as documents unchanged
+                manager.batch_insert_documents(
+                    db_name, embeddings, metadatas, doc_ids, content_cids=["cid_1", "cid_2"]
+                )
+                assert mock_collection.add.call_args.kwargs["documents"] == ["cid_1", "cid_2"]
+
+                # A 1-D array is not a batch of embeddings
+                with pytest.raises(ValueError):
+                    manager.batch_insert_documents(
+                        db_name, np.zeros(2, dtype=np.float32), metadatas, doc_ids
+                    )
+
     def test_print_all_metadata(self, capsys):
         """Test that print_all_metadata retrieves and prints metadata from all collections."""
         db_names = ["openai_paragraph_openai"]
@@ -157,8 +272,7 @@ class TestVectorDatabaseManager:
                 # Setup mock
                 mock_instance = mock_client.return_value
                 mock_collection = MagicMock()
-                mock_instance.get_collection.return_value = mock_collection
-                mock_instance.get_or_create_collection.return_value = MagicMock()
+                mock_instance.get_or_create_collection.return_value = mock_collection
 
                 # Mock collection.get() to return test metadata
                 mock_collection.get.return_value = {"metadatas": metadata}
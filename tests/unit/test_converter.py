@@ -2,17 +2,37 @@
 Unit tests for the converter module.
 """
 
-from unittest.mock import MagicMock, patch
+import asyncio
+import importlib.util
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from src.core.converter import (
-    chunk_text,
-    convert,
-    convert_from_url,
-    extract_text_from_pdf,
-    openai,
-)
+
+def _load_real_converter():
+    """Load src/core/converter.py itself; conftest replaces the module with a mock."""
+    path = Path(__file__).parents[2] / "src" / "core" / "converter.py"
+    spec = importlib.util.spec_from_file_location("src.core.converter", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+converter = _load_real_converter()
+chunk_text = converter.chunk_text
+convert = converter.convert
+convert_from_url = converter.convert_from_url
+extract_text_from_pdf = converter.extract_text_from_pdf
+openai = converter.openai
+
+
+@pytest.fixture(autouse=True)
+def real_converter_module(monkeypatch):
+    """Point patch("src.core.converter....") at the real module for these tests."""
+    monkeypatch.setitem(sys.modules, "src.core.converter", converter)
+    return converter
 
 
 class TestConverter:
@@ -25,9 +45,67 @@ class TestConverter:
         assert len(chunks) == 1
         assert chunks[0] == text
 
+    def test_chunk_text_breaks_on_whitespace(self):
+        """Test chunk_text keeps chunks within size and splits between words."""
+        text = "alpha beta\ngamma delta epsilon"
+        chunks = chunk_text(text, chunk_size=11)
+        assert chunks == ["alpha beta", "gamma delta", "epsilon"]
+        assert all(len(c) <= 11 for c in chunks)
+
+    def test_chunk_text_breaks_on_any_whitespace(self):
+        """Test chunk_text treats tabs like other whitespace when splitting."""
+        chunks = chunk_text("a\tb\tc\td\te", chunk_size=3)
+        assert chunks == ["a\tb", "c\td", "e"]
+
+    def test_chunk_text_keeps_long_words_whole(self):
+        """Test chunk_text does not split a word longer than the chunk size."""
+        chunks = chunk_text("tiny supercalifragilistic word", chunk_size=8)
+        assert chunks == ["tiny", "supercalifragilistic", "word"]
+
+    @patch("src.core.converter.pdfium")
+    def test_extract_text_from_pdf(self, mock_pdfium):
+        """Test the extract_text_from_pdf function with PDFium."""
+        # Mock a PDF document with two pages
+        mock_pages = [MagicMock(), MagicMock()]
+        mock_pages[0].get_textpage.return_value.get_text_range.return_value = (
+            "Page 1 content"
+        )
+        mock_pages[1].get_textpage.return_value.get_text_range.return_value = (
+            "Page 2 content"
+        )
+        mock_pdf = mock_pdfium.PdfDocument.return_value
+        mock_pdf.__iter__.return_value = iter(mock_pages)
+
+        # Call the function
+        result = extract_text_from_pdf("test.pdf")
+
+        # Verify the expected behavior
+        mock_pdfium.PdfDocument.assert_called_once_with("test.pdf")
+        assert result == "Page 1 contentPage 2 content"
+        mock_pdf.close.assert_called_once()
+        for page in mock_pages:
+            page.get_textpage.return_value.close.assert_called_once()
+            page.close.assert_called_once()
+
+    @patch("src.core.converter.pdfium")
+    def test_extract_text_from_pdf_closes_document_on_error(self, mock_pdfium):
+        """Test that PDFium handles are released when text extraction fails."""
+        mock_page = MagicMock()
+        mock_page.get_textpage.return_value.get_text_range.side_effect = RuntimeError("bad page")
+        mock_pdf = mock_pdfium.PdfDocument.return_value
+        mock_pdf.__iter__.return_value = iter([mock_page])
+
+        with pytest.raises(RuntimeError):
+            extract_text_from_pdf("test.pdf")
+
+        mock_page.get_textpage.return_value.close.assert_called_once()
+        mock_page.close.assert_called_once()
+        mock_pdf.close.assert_called_once()
+
+    @patch("src.core.converter.pdfium", None)
     @patch("PyPDF2.PdfReader")
-    def test_extract_text_from_pdf(self, mock_pdf_reader):
-        """Test the extract_text_from_pdf function."""
+    def test_extract_text_from_pdf_pypdf2_fallback(self, mock_pdf_reader):
+        """Test the extract_text_from_pdf function without PDFium installed."""
         # Mock a PDF file with two pages
         mock_pages = [MagicMock(), MagicMock()]
         mock_pages[0].extract_text.return_value = "Page 1 content"
@@ -43,7 +121,7 @@ class TestConverter:
         mock_pdf_reader.assert_called_once_with("test.pdf")
         assert result == "Page 1 contentPage 2 content"
 
-    @patch("src.core.converter.OpenAI")
+    @patch("src.core.converter.AsyncOpenAI")
     @patch("src.core.converter.extract_text_from_pdf")
     @patch("os.path.exists")
     def test_openai_converter(self, mock_exists, mock_extract, mock_openai):
@@ -58,7 +136,8 @@ class TestConverter:
         mock_client = MagicMock()
         mock_openai.return_value = mock_client
         mock_response = MagicMock()
-        mock_client.chat.completions.create.return_value = mock_response
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+        mock_client.close = AsyncMock()
         mock_response.choices = [MagicMock()]
         mock_response.choices[0].message.content = "Converted markdown content"
 
@@ -69,9 +148,35 @@ class TestConverter:
         mock_exists.assert_called_once_with("test.pdf")
         mock_extract.assert_called_once_with("test.pdf")
         mock_openai.assert_called_once()
-        mock_client.chat.completions.create.assert_called_once()
+        mock_client.chat.completions.create.assert_awaited_once()
+        mock_client.close.assert_awaited_once()
         assert result == "Converted markdown content"
 
+    @patch("src.core.converter.AsyncOpenAI")
+    @patch("src.core.converter.extract_text_from_pdf")
+    @patch("os.path.exists")
+    def test_openai_converter_inside_running_loop(self, mock_exists, mock_extract, mock_openai):
+        """Test that the OpenAI converter also works when called from a running event loop."""
+        mock_exists.return_value = True
+        mock_extract.return_value = "first chunk second chunk"
+
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "Converted"
+        mock_client.chat.completions.create = AsyncMock(return_value=mock_response)
+        mock_client.close = AsyncMock()
+
+        async def call_from_loop():
+            return openai("test.pdf")
+
+        result = asyncio.run(call_from_loop())
+
+        assert result == "Converted"
+        mock_client.chat.completions.create.assert_awaited_once()
+        mock_client.close.assert_awaited_once()
+
     @patch("os.path.exists")
     def test_openai_converter_file_not_found(self, mock_exists):
         """Test the OpenAI converter with a file that doesn't exist."""
@@ -118,7 +223,9 @@ class TestConverter:
         result = convert_from_url("openai", "http://example.com/file.tar")
 
         # Verify expected behavior
-        mock_download.assert_called_once_with(url="http://example.com/file.tar")
+        mock_download.assert_called_once_with(
+            url="http://example.com/file.tar", output_folder="./tmp"
+        )
         mock_extract.assert_called_once_with(
             tar_file_path="/tmp/download/file.tar", output_path="/tmp/download"
         )
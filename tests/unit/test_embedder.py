@@ -122,3 +122,86 @@ class TestEmbedder:
                 os.environ["OPENAI_API_KEY"] = original_api_key
             else:
                 del os.environ["OPENAI_API_KEY"]
+
+    @patch("src.core.embedder.get_user_logger")
+    @patch("src.core.embedder.OpenAI")
+    def test_openai_batch_caps_batch_size(self, mock_openai, mock_logger):
+        """Test that OpenAI requests never exceed the provider batch limit."""
+        from src.core.embedder import OPENAI_MAX_BATCH_SIZE, openai_batch
+
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+
+        def fake_create(model, input):
+            response = MagicMock()
+            response.data = [MagicMock(embedding=[0.0]) for _ in input]
+            return response
+
+        mock_client.embeddings.create.side_effect = fake_create
+
+        texts = ["text"] * (OPENAI_MAX_BATCH_SIZE + 1)
+        result = openai_batch(texts, batch_size=10 * OPENAI_MAX_BATCH_SIZE)
+
+        assert len(result) == len(texts)
+        assert mock_client.embeddings.create.call_count == 2
+        first_call = mock_client.embeddings.create.call_args_list[0]
+        assert len(first_call.kwargs["input"]) == OPENAI_MAX_BATCH_SIZE
+
+    @patch("src.core.embedder.get_user_logger")
+    @patch("src.core.embedder.OpenAI")
+    def test_openai_batch_caps_tokens_per_request(self, mock_openai, mock_logger):
+        """Test that OpenAI requests stay under the per-request token limit."""
+        from src.core.embedder import (
+            OPENAI_CHARS_PER_TOKEN,
+            OPENAI_MAX_BATCH_SIZE,
+            OPENAI_MAX_BATCH_TOKENS,
+            openai_batch,
+        )
+
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+
+        def fake_create(model, input):
+            response = MagicMock()
+            response.data = [MagicMock(embedding=[float(len(text))]) for text in input]
+            return response
+
+        mock_client.embeddings.create.side_effect = fake_create
+
+        # A full batch of paragraph-sized chunks (~250 tokens each) is far over the limit
+        texts = [
+            "x" * (250 * OPENAI_CHARS_PER_TOKEN + i % 7)
+            for i in range(OPENAI_MAX_BATCH_SIZE)
+        ]
+        result = openai_batch(texts)
+
+        calls = mock_client.embeddings.create.call_args_list
+        assert len(calls) > 1
+        for request in calls:
+            chars = sum(len(text) for text in request.kwargs["input"])
+            assert chars / OPENAI_CHARS_PER_TOKEN <= OPENAI_MAX_BATCH_TOKENS
+        # Batches are consecutive, so embeddings keep the input order
+        assert [text for request in calls for text in request.kwargs["input"]] == texts
+        assert result == [[float(len(text))] for text in texts]
+
+    @patch("src.core.embedder.get_user_logger")
+    @patch("src.core.embedder.OpenAI")
+    def test_openai_batch_sends_oversized_text_alone(self, mock_openai, mock_logger):
+        """Test that a text over the token budget is sent in a request of its own."""
+        from src.core.embedder import (
+            OPENAI_CHARS_PER_TOKEN,
+            OPENAI_MAX_BATCH_TOKENS,
+            openai_batch,
+        )
+
+        mock_client = MagicMock()
+        mock_openai.return_value = mock_client
+        mock_client.embeddings.create.side_effect = lambda model, input: MagicMock(
+            data=[MagicMock(embedding=[0.0]) for _ in input]
+        )
+
+        huge = "x" * (OPENAI_MAX_BATCH_TOKENS * OPENAI_CHARS_PER_TOKEN)
+        openai_batch(["small", huge, "small"])
+
+        inputs = [request.kwargs["input"] for request in mock_client.embeddings.create.call_args_list]
+        assert inputs == [["small"], [huge], ["small"]]
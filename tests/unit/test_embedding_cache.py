@@ -0,0 +1,135 @@
+"""
+Unit tests for the embedding cache module.
+"""
+
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from src.core.embedding_cache import EmbeddingCache, content_hash
+
+
+class TestEmbeddingCache:
+    """Test cases for the EmbeddingCache class."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create an EmbeddingCache in a temporary directory."""
+        cache = EmbeddingCache(tmp_path / "embedding_cache" / "embeddings.sqlite")
+        yield cache
+        cache.close()
+
+    def test_content_hash_is_stable(self):
+        """Test that identical text maps to the same key."""
+        assert content_hash("chunk text") == content_hash("chunk text")
+        assert content_hash("chunk text") != content_hash("other text")
+
+    def test_content_hash_ignores_whitespace_differences(self):
+        """Test that chunks differing only in whitespace share a key."""
+        assert content_hash("chunk  text\n") == content_hash("chunk text")
+
+    def test_get_missing_entry(self, cache):
+        """Test that a lookup for an unknown chunk returns None."""
+        assert cache.get(content_hash("missing"), "openai", "model") is None
+
+    def test_put_and_get(self, cache):
+        """Test that a stored embedding round-trips with its CID."""
+        key = content_hash("chunk text")
+        cache.put(key, "openai", "model", [0.5, -1.0, 2.0], "QmEmbedding")
+
+        vector, cid = cache.get(key, "openai", "model")
+
+        assert vector == pytest.approx([0.5, -1.0, 2.0])
+        assert cid == "QmEmbedding"
+
+    def test_entries_are_scoped_by_model(self, cache):
+        """Test that the same chunk is cached separately per provider and model."""
+        key = content_hash("chunk text")
+        cache.put(key, "openai", "model-a", [1.0], "QmA")
+
+        assert cache.get(key, "openai", "model-b") is None
+        assert cache.get(key, "bge", "model-a") is None
+
+    def test_evicts_oldest_entries(self, tmp_path):
+        """Test that the cache keeps only the most recently written entries."""
+        cache = EmbeddingCache(tmp_path / "embeddings.sqlite", max_entries=2)
+        try:
+            for name in ["first", "second", "third"]:
+                cache.put(content_hash(name), "openai", "model", [1.0], name)
+
+            assert cache.get(content_hash("first"), "openai", "model") is None
+            assert cache.get(content_hash("second"), "openai", "model")[1] == "second"
+            assert cache.get(content_hash("third"), "openai", "model")[1] == "third"
+        finally:
+            cache.close()
+
+    def test_get_refreshes_entry_before_eviction(self, tmp_path):
+        """Test that reading an entry protects it from eviction over newer writes."""
+        cache = EmbeddingCache(tmp_path / "embeddings.sqlite", max_entries=2)
+        try:
+            with patch("src.core.embedding_cache.time.time", side_effect=[1.0, 2.0, 3.0, 4.0]):
+                cache.put(content_hash("first"), "openai", "model", [1.0], "first")
+                cache.put(content_hash("second"), "openai", "model", [1.0], "second")
+                assert cache.get(content_hash("first"), "openai", "model")[1] == "first"
+                cache.put(content_hash("third"), "openai", "model", [1.0], "third")
+
+            assert cache.get(content_hash("second"), "openai", "model") is None
+            assert cache.get(content_hash("first"), "openai", "model")[1] == "first"
+            assert cache.get(content_hash("third"), "openai", "model")[1] == "third"
+        finally:
+            cache.close()
+
+    def test_expires_unused_entries(self, tmp_path):
+        """Test that entries unused for longer than max_age are misses and get removed."""
+        cache = EmbeddingCache(tmp_path / "embeddings.sqlite", max_age=60)
+        try:
+            with patch("src.core.embedding_cache.time.time", side_effect=[0.0, 30.0, 100.0, 200.0]):
+                cache.put(content_hash("stale"), "openai", "model", [1.0], "stale")
+                cache.put(content_hash("fresh"), "openai", "model", [1.0], "fresh")
+                # At t=100 "stale" has been unused for 100s, "fresh" for 70s
+                assert cache.get(content_hash("stale"), "openai", "model") is None
+                cache.put(content_hash("newest"), "openai", "model", [1.0], "newest")
+
+            count = cache._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            assert count == 1
+        finally:
+            cache.close()
+
+    def test_upgrades_cache_without_last_used(self, tmp_path):
+        """Test that a cache file written before LRU eviction is still readable."""
+        db_path = tmp_path / "embeddings.sqlite"
+        conn = sqlite3.connect(str(db_path))
+        conn.execute(
+            "CREATE TABLE embeddings (hash TEXT NOT NULL, provider TEXT NOT NULL, model TEXT NOT NULL, "
+            "vec BLOB NOT NULL, cid TEXT NOT NULL, PRIMARY KEY (hash, provider, model))"
+        )
+        conn.execute(
+            "INSERT INTO embeddings VALUES (?, ?, ?, ?, ?)",
+            (content_hash("old"), "openai", "model", b"\x00\x00\x80?", "QmOld"),
+        )
+        conn.commit()
+        conn.close()
+
+        cache = EmbeddingCache(db_path)
+        try:
+            vector, cid = cache.get(content_hash("old"), "openai", "model")
+            assert vector == pytest.approx([1.0])
+            assert cid == "QmOld"
+        finally:
+            cache.close()
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test that entries survive reopening the cache file."""
+        db_path = tmp_path / "embeddings.sqlite"
+        key = content_hash("chunk text")
+
+        first = EmbeddingCache(db_path)
+        first.put(key, "openai", "model", [1.0, 2.0], "QmPersisted")
+        first.close()
+
+        second = EmbeddingCache(db_path)
+        try:
+            assert second.get(key, "openai", "model")[1] == "QmPersisted"
+        finally:
+            second.close()
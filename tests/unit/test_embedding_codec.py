@@ -0,0 +1,62 @@
+"""
+Unit tests for the embedding codec module.
+"""
+
+import json
+
+import pytest
+
+from src.utils.embedding_codec import (
+    decode_embedding,
+    encode_embedding,
+    encode_embeddings,
+)
+
+
+class TestEmbeddingCodec:
+    """Test cases for embedding encoding and decoding."""
+
+    def test_float32_is_plain_json_list(self):
+        """Test that float32 embeddings stay readable as JSON lists."""
+        encoded = encode_embedding([0.25, -0.5, 1.0])
+        assert json.loads(encoded) == [0.25, -0.5, 1.0]
+        assert decode_embedding(encoded) == [0.25, -0.5, 1.0]
+
+    def test_float16_round_trip(self):
+        """Test that float16 embeddings decode to close values."""
+        embedding = [0.1, -0.2, 0.3, 0.75]
+        encoded = encode_embedding(embedding, "float16")
+
+        assert json.loads(encoded)["dtype"] == "float16"
+        assert decode_embedding(encoded) == pytest.approx(embedding, abs=1e-3)
+
+    def test_int8_round_trip(self):
+        """Test that int8 embeddings decode to close values."""
+        embedding = [0.1, -0.2, 0.3, -1.27]
+        encoded = encode_embedding(embedding, "int8")
+
+        assert json.loads(encoded)["dtype"] == "int8"
+        assert decode_embedding(encoded) == pytest.approx(embedding, abs=0.01)
+
+    def test_int8_zero_vector(self):
+        """Test that an all-zero vector survives int8 quantization."""
+        assert decode_embedding(encode_embedding([0.0, 0.0], "int8")) == [0.0, 0.0]
+
+    def test_batch_int8_uses_per_vector_scale(self):
+        """Test that batch quantization scales each vector independently."""
+        embeddings = [[0.01, -0.02], [10.0, -5.0]]
+        encoded = encode_embeddings(embeddings, "int8")
+
+        assert len(encoded) == 2
+        assert decode_embedding(encoded[0]) == pytest.approx(embeddings[0], abs=1e-3)
+        assert decode_embedding(encoded[1]) == pytest.approx(embeddings[1], abs=0.1)
+
+    def test_unsupported_dtype(self):
+        """Test that unknown dtypes are rejected."""
+        with pytest.raises(ValueError):
+            encode_embedding([0.1], "bfloat16")
+
+    def test_decode_invalid_content(self):
+        """Test that malformed content raises ValueError."""
+        with pytest.raises(ValueError):
+            decode_embedding('{"dtype": "float16"}')
@@ -0,0 +1,37 @@
+"""
+Unit tests for the evaluation agent module.
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.query.evaluation_agent import EvaluationAgent
+
+
+class TestEvaluationAgent:
+    """Test cases for the EvaluationAgent class."""
+
+    @pytest.fixture
+    def agent(self, tmp_path, monkeypatch):
+        """Create an EvaluationAgent that writes into a temporary directory."""
+        monkeypatch.setenv("OPENROUTER_API_KEY", "test-key")
+        agent = EvaluationAgent()
+        agent.temp_dir = tmp_path
+        return agent
+
+    def test_query_results_files_are_unique_within_a_second(self, agent):
+        """Test that queries from the same user in the same second get separate result files."""
+        with patch(
+            "src.query.evaluation_agent.discover_user_collections", return_value=[]
+        ), patch("src.query.evaluation_agent.get_user_logger"):
+            with patch("src.query.evaluation_agent.time.time", return_value=1700000000.0):
+                first = agent.query_collections("first query", user_email="user@example.com")
+                second = agent.query_collections("second query", user_email="user@example.com")
+
+        assert first != second
+        with open(first) as f:
+            assert json.load(f)["query"] == "first query"
+        with open(second) as f:
+            assert json.load(f)["query"] == "second query"
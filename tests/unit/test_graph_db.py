@@ -5,7 +5,8 @@ from unittest.mock import MagicMock, call, patch
 import pytest
 import requests
 
-from src.db.graph_db import IPFSNeo4jGraph
+import src.db.graph_db as graph_db_module
+from src.db.graph_db import IPFSNeo4jGraph, get_graph_db
 
 
 class TestIPFSNeo4jGraph:
@@ -454,3 +455,12 @@ class TestIPFSNeo4jGraph:
                         "author2@example.com": 3,
                     }
                     assert result == expected_result
+
+    def test_get_graph_db_reuses_instance(self, mock_env_vars, mock_driver):
+        """Test that get_graph_db connects once and shares the instance."""
+        with patch.object(graph_db_module, "_graph_db", None):
+            first = get_graph_db()
+            second = get_graph_db()
+
+            assert first is second
+            mock_driver.assert_called_once()
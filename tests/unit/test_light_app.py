@@ -0,0 +1,319 @@
+"""
+Unit tests for the light server's scrape deduplication and status endpoints.
+"""
+
+import asyncio
+import os
+from concurrent.futures import Executor, Future
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.server import light_app
+
+
+class StubExecutor(Executor):
+    """Executor that records submissions and lets the test complete them."""
+
+    def __init__(self, broken=False):
+        self.calls = []
+        self.futures = []
+        self.broken = broken
+        self.shut_down = False
+
+    def submit(self, fn, *args, **kwargs):
+        if self.broken:
+            # Like a ProcessPoolExecutor whose worker process was killed
+            raise BrokenProcessPool("A child process terminated abruptly")
+        self.calls.append((fn, args))
+        future = Future()
+        self.futures.append(future)
+        return future
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        self.shut_down = True
+
+
+class TestScrapeDeduplicated:
+    """Test cases for _scrape_deduplicated and _copy_zip_for_request."""
+
+    @pytest.fixture
+    def executor(self, monkeypatch):
+        """Route every scrape shard to one stub executor with fresh in-flight state."""
+        executor = StubExecutor()
+        monkeypatch.setattr(
+            light_app, "_scrape_pools", [executor] * light_app.SCRAPE_SHARDS
+        )
+        monkeypatch.setattr(light_app, "_shard_load", [0] * light_app.SCRAPE_SHARDS)
+        monkeypatch.setattr(light_app, "_inflight", {})
+        return executor
+
+    @pytest.fixture
+    def zip_path(self, tmp_path):
+        """Create the zip the owning scrape produces."""
+        path = tmp_path / "research_papers.zip"
+        path.write_bytes(b"zip contents")
+        return str(path)
+
+    @staticmethod
+    async def _run_requests(executor, research_areas, result):
+        """Start one request per research area, then finish the scrape with result."""
+        tasks = []
+        for i, research_area in enumerate(research_areas):
+            tasks.append(
+                asyncio.create_task(
+                    light_app._scrape_deduplicated(research_area, f"user{i}@example.com")
+                )
+            )
+            # Let the request reach the executor or the in-flight future
+            await asyncio.sleep(0)
+
+        if isinstance(result, BaseException):
+            executor.futures[0].set_exception(result)
+        else:
+            executor.futures[0].set_result(result)
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    def test_duplicates_share_one_scrape(self, executor, zip_path):
+        """Test that requests for the same normalized area run a single scrape."""
+        results = asyncio.run(
+            self._run_requests(
+                executor,
+                ["Quantum  Computing", "quantum computing", "QUANTUM COMPUTING "],
+                (True, "Scraped 1 paper", ["paper.pdf"], zip_path),
+            )
+        )
+
+        assert len(executor.calls) == 1
+        fn, args = executor.calls[0]
+        assert fn is light_app._scrape_papers_sync
+        assert args == ("Quantum  Computing", "user0@example.com", True)
+
+        # The owner gets the original zip
+        assert results[0] == (True, "Scraped 1 paper", ["paper.pdf"], zip_path)
+        # Each duplicate gets its own copy of it
+        copies = [result[3] for result in results[1:]]
+        assert len(set(copies)) == 2
+        for success, message, files, copy_path in results[1:]:
+            assert (success, message, files) == (True, "Scraped 1 paper", ["paper.pdf"])
+            assert copy_path != zip_path
+            with open(copy_path, "rb") as f:
+                assert f.read() == b"zip contents"
+
+        assert light_app._inflight == {}
+        assert light_app._shard_load == [0] * light_app.SCRAPE_SHARDS
+
+    def test_different_areas_are_not_shared(self, executor, zip_path):
+        """Test that requests for different areas each run their own scrape."""
+
+        async def run():
+            first = asyncio.create_task(
+                light_app._scrape_deduplicated("biology", "a@example.com")
+            )
+            second = asyncio.create_task(
+                light_app._scrape_deduplicated("chemistry", "b@example.com")
+            )
+            await asyncio.sleep(0)
+            for future in executor.futures:
+                future.set_result((True, "ok", [], zip_path))
+            return await asyncio.gather(first, second)
+
+        results = asyncio.run(run())
+
+        assert len(executor.calls) == 2
+        assert [result[3] for result in results] == [zip_path, zip_path]
+
+    def test_copy_survives_owner_cleanup(self, executor, zip_path):
+        """Test that a duplicate's copy stays readable after the owner removes its zip."""
+        results = asyncio.run(
+            self._run_requests(
+                executor, ["biology", "biology"], (True, "ok", [], zip_path)
+            )
+        )
+
+        os.remove(results[0][3])
+
+        with open(results[1][3], "rb") as f:
+            assert f.read() == b"zip contents"
+
+    def test_copy_falls_back_without_hard_links(self, zip_path):
+        """Test that the zip is copied in a worker thread when it cannot be hard-linked."""
+        with patch.object(light_app.os, "link", side_effect=OSError("cross-device link")):
+            with patch.object(
+                light_app.asyncio, "to_thread", wraps=asyncio.to_thread
+            ) as mock_to_thread:
+                copy_path = asyncio.run(light_app._copy_zip_for_request(zip_path))
+
+        mock_to_thread.assert_called_once()
+        assert copy_path != zip_path
+        assert os.stat(copy_path).st_ino != os.stat(zip_path).st_ino
+        with open(copy_path, "rb") as f:
+            assert f.read() == b"zip contents"
+
+    def test_failed_scrape_is_shared_without_copies(self, executor, zip_path):
+        """Test that a failed scrape reaches every waiter and no zip is copied."""
+        with patch.object(light_app, "_copy_zip_for_request") as mock_copy:
+            results = asyncio.run(
+                self._run_requests(
+                    executor,
+                    ["biology", "biology"],
+                    (False, "No papers found", [], None),
+                )
+            )
+
+        assert results == [(False, "No papers found", [], None)] * 2
+        mock_copy.assert_not_called()
+        assert light_app._inflight == {}
+
+    def test_scrape_exception_reaches_every_waiter(self, executor):
+        """Test that an executor error is raised to the owner and the duplicates."""
+        results = asyncio.run(
+            self._run_requests(
+                executor, ["biology", "biology"], RuntimeError("worker died")
+            )
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert light_app._inflight == {}
+        assert light_app._shard_load == [0] * light_app.SCRAPE_SHARDS
+
+        # A later request starts a fresh scrape instead of reusing the failed one
+        async def retry():
+            task = asyncio.create_task(
+                light_app._scrape_deduplicated("biology", "c@example.com")
+            )
+            await asyncio.sleep(0)
+            executor.futures[1].set_result((False, "No papers found", [], None))
+            return await task
+
+        assert asyncio.run(retry()) == (False, "No papers found", [], None)
+        assert len(executor.calls) == 2
+
+
+class TestBrokenScrapePool:
+    """Test cases for replacing scrape shards whose worker process died."""
+
+    @pytest.fixture
+    def pools(self, monkeypatch):
+        """Give every shard its own stub executor and make replacements stubs too."""
+        pools = [StubExecutor() for _ in range(light_app.SCRAPE_SHARDS)]
+        monkeypatch.setattr(light_app, "_scrape_pools", pools)
+        monkeypatch.setattr(light_app, "_shard_load", [0] * light_app.SCRAPE_SHARDS)
+        monkeypatch.setattr(light_app, "_inflight", {})
+        monkeypatch.setattr(light_app, "_make_scrape_pool", StubExecutor)
+        return pools
+
+    def test_broken_pool_is_replaced_on_submit(self, pools):
+        """Test that a shard whose pool rejects submissions gets a new pool and the scrape runs."""
+        shard = light_app._shard_for("user@example.com")
+        broken = pools[shard]
+        broken.broken = True
+
+        async def run():
+            task = asyncio.create_task(
+                light_app._scrape_deduplicated("biology", "user@example.com")
+            )
+            await asyncio.sleep(0)
+            light_app._scrape_pools[shard].futures[0].set_result((True, "ok", [], None))
+            return await task
+
+        assert asyncio.run(run()) == (True, "ok", [], None)
+        replacement = light_app._scrape_pools[shard]
+        assert replacement is not broken
+        assert len(replacement.calls) == 1
+        assert broken.shut_down
+        assert light_app._shard_load == [0] * light_app.SCRAPE_SHARDS
+
+    def test_pool_is_replaced_when_worker_dies_mid_scrape(self, pools):
+        """Test that a scrape failing with BrokenProcessPool replaces its shard's pool."""
+        shard = light_app._shard_for("user@example.com")
+        original = list(pools)
+        broken = original[shard]
+
+        async def run():
+            task = asyncio.create_task(
+                light_app._scrape_deduplicated("biology", "user@example.com")
+            )
+            await asyncio.sleep(0)
+            broken.futures[0].set_exception(BrokenProcessPool("worker killed"))
+            return await asyncio.gather(task, return_exceptions=True)
+
+        (result,) = asyncio.run(run())
+
+        assert isinstance(result, BrokenProcessPool)
+        assert light_app._scrape_pools[shard] is not broken
+        assert broken.shut_down
+        # Other shards keep their pools
+        assert all(
+            light_app._scrape_pools[i] is original[i]
+            for i in range(light_app.SCRAPE_SHARDS)
+            if i != shard
+        )
+
+
+class TestBulkUserStatus:
+    """Test cases for the POST /api/v1/user/status/bulk endpoint."""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        """Create a test client that reads jobs.json fresh for every test."""
+        monkeypatch.setattr(light_app, "_jobs_cache", {"ts": float("-inf"), "data": {}})
+        return TestClient(light_app.app)
+
+    def test_known_and_unknown_emails(self, client):
+        """Test that known users get their counts and unknown users get zeros."""
+        jobs = {"known@example.com": [4, 1], "done@example.com": [2, 2]}
+        with patch.object(light_app, "load_jobs_safe", return_value=jobs) as mock_load:
+            response = client.post(
+                "/api/v1/user/status/bulk",
+                json={
+                    "user_emails": [
+                        "known@example.com",
+                        "done@example.com",
+                        "unknown@example.com",
+                    ]
+                },
+            )
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "known@example.com": {
+                "total_jobs": 4,
+                "completed_jobs": 1,
+                "completion_percentage": 25.0,
+            },
+            "done@example.com": {
+                "total_jobs": 2,
+                "completed_jobs": 2,
+                "completion_percentage": 100.0,
+            },
+            "unknown@example.com": {
+                "total_jobs": 0,
+                "completed_jobs": 0,
+                "completion_percentage": 0,
+            },
+        }
+        # Every user is answered from a single read of jobs.json
+        mock_load.assert_called_once()
+
+    def test_empty_email_list(self, client):
+        """Test that an empty request returns an empty mapping."""
+        with patch.object(light_app, "load_jobs_safe", return_value={}):
+            response = client.post("/api/v1/user/status/bulk", json={"user_emails": []})
+
+        assert response.status_code == 200
+        assert response.json() == {}
+
+    def test_jobs_read_failure(self, client):
+        """Test that a failure reading jobs.json is reported as a server error."""
+        with patch.object(
+            light_app, "load_jobs_safe", side_effect=OSError("jobs.json unreadable")
+        ):
+            response = client.post(
+                "/api/v1/user/status/bulk", json={"user_emails": ["known@example.com"]}
+            )
+
+        assert response.status_code == 500
+        assert "jobs.json unreadable" in response.json()["detail"]
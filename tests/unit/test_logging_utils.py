@@ -0,0 +1,28 @@
+"""
+Unit tests for the logging utilities module.
+"""
+
+from unittest.mock import patch
+
+from src.utils.logging_utils import get_user_logger, sanitize_email_for_path
+
+
+class TestLoggingUtils:
+    """Test cases for the logging utilities."""
+
+    def test_sanitize_email_for_path(self):
+        """Test that emails become safe directory names."""
+        assert sanitize_email_for_path("User.Name@Example.com") == "user_name_example_com"
+
+    def test_get_user_logger_reuses_handlers(self, tmp_path):
+        """Test that repeated calls do not rebuild the logger's handlers."""
+        with patch("src.utils.logging_utils.get_user_log_dir", return_value=tmp_path) as mock_dir:
+            first = get_user_logger("reuse@example.com", "status_check")
+            handlers = list(first.handlers)
+            second = get_user_logger("reuse@example.com", "status_check")
+
+        assert second is first
+        assert second.handlers == handlers
+        assert mock_dir.call_count == 1
+        for handler in handlers:
+            handler.close()
@@ -0,0 +1,87 @@
+"""
+Unit tests for the processor module.
+"""
+
+from unittest.mock import MagicMock, patch
+
+from src.core.embedding_cache import EmbeddingCache, content_hash
+from src.core.processor import Processor, _worker_process
+
+
+class TestProcess:
+    """Test cases for Processor.process."""
+
+    def test_returns_false_when_pdf_upload_fails(self):
+        """Test that a failed IPFS upload is reported instead of returning silently."""
+        processor = Processor.__new__(Processor)
+        processor.logger = MagicMock()
+        processor.ipfs_client = MagicMock()
+        processor.ipfs_client.upload_file.return_value = None
+
+        assert processor.process("paper.pdf", []) is False
+
+
+class TestEmbeddingCacheModel:
+    """Test cases for keying cached embeddings by model and dtype."""
+
+    def test_dtype_is_part_of_the_key(self, tmp_path):
+        """Test that a CID cached for one EMBEDDING_DTYPE is not reused for another."""
+        float32_processor = Processor.__new__(Processor)
+        float32_processor.embedding_dtype = "float32"
+        int8_processor = Processor.__new__(Processor)
+        int8_processor.embedding_dtype = "int8"
+
+        cache = EmbeddingCache(tmp_path / "embeddings.sqlite")
+        try:
+            key = content_hash("chunk text")
+            cache.put(
+                key,
+                "openai",
+                float32_processor._embedding_cache_model("openai"),
+                [1.0],
+                "QmFloat32",
+            )
+
+            assert cache.get(key, "openai", int8_processor._embedding_cache_model("openai")) is None
+            assert cache.get(key, "openai", float32_processor._embedding_cache_model("openai"))[1] == "QmFloat32"
+        finally:
+            cache.close()
+
+        assert float32_processor._embedding_cache_model("openai") == "text-embedding-3-small:float32"
+
+
+class TestWorkerProcess:
+    """Test cases for the process_many worker function."""
+
+    def test_success(self):
+        """Test that a processed PDF is reported as a success."""
+        mock_processor = MagicMock()
+        mock_processor.process.return_value = True
+
+        with patch("src.core.processor._worker_processor", mock_processor):
+            result = _worker_process("paper.pdf", [])
+
+        assert result == ("paper.pdf", True, None)
+        mock_processor.process.assert_called_once_with(pdf_path="paper.pdf", databases=[])
+
+    def test_failure_without_exception(self):
+        """Test that a PDF whose processing returned False is reported as failed."""
+        mock_processor = MagicMock()
+        mock_processor.process.return_value = False
+
+        with patch("src.core.processor._worker_processor", mock_processor):
+            pdf_path, success, error = _worker_process("paper.pdf", [])
+
+        assert pdf_path == "paper.pdf"
+        assert success is False
+        assert error
+
+    def test_exception(self):
+        """Test that an exception is reported with its message."""
+        mock_processor = MagicMock()
+        mock_processor.process.side_effect = RuntimeError("boom")
+
+        with patch("src.core.processor._worker_processor", mock_processor):
+            result = _worker_process("paper.pdf", [])
+
+        assert result == ("paper.pdf", False, "boom")
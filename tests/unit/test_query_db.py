@@ -40,8 +40,12 @@ class TestQueryDB:
         """Create a mock ChromaDB query response."""
         return {
             "ids": [["id1", "id2"]],
-            "documents": [["document1", "document2"]],
-            "metadatas": [[{"source": "paper1"}, {"source": "paper2"}]],
+            "metadatas": [
+                [
+                    {"source": "paper1", "content_cid": "document1"},
+                    {"source": "paper2", "content_cid": "document2"},
+                ]
+            ],
             "distances": [[0.1, 0.2]],
         }
 
@@ -138,7 +142,6 @@ class TestQueryDB:
         """Test behavior when no results are found."""
         empty_response = {
             "ids": [[]],
-            "documents": [[]],
             "metadatas": [[]],
             "distances": [[]],
         }
@@ -1,12 +1,17 @@
 """Tests for the token_rewarder module in src."""
 
+import asyncio
 import itertools
 import json
-from unittest.mock import Mock, call, patch
+import math
+import threading
+import weakref
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, Mock, call, patch
 
 import pytest
 
-from src.rewards.token_rewarder import TokenRewarder
+from src.rewards.token_rewarder import TokenRewarder, _flush_rewarder_at_exit
 
 
 class TestTokenRewarder:
@@ -147,6 +152,81 @@ class TestTokenRewarder:
                             assert conn is None
                             mock_logger.error.assert_called_once()
 
+    def test_conn_returns_connection_to_pool(self, mock_contract_abi):
+        """Test that pooled connections are reused per database and returned on exit."""
+        with patch("src.rewards.token_rewarder.Web3"):
+            with patch(
+                "src.rewards.token_rewarder.TokenRewarder.load_contract_abi",
+                return_value=mock_contract_abi,
+            ):
+                with patch("src.rewards.token_rewarder.os.getenv"):
+                    with patch(
+                        "src.rewards.token_rewarder.ThreadedConnectionPool"
+                    ) as mock_pool_cls:
+                        mock_pool = mock_pool_cls.return_value
+                        mock_conn = Mock(closed=0)
+                        mock_pool.getconn.return_value = mock_conn
+
+                        rewarder = TokenRewarder()
+                        for _ in range(2):
+                            with rewarder._conn("test_db") as conn:
+                                assert conn is mock_conn
+                                assert conn.autocommit is True
+
+                        # One pool per database, connection handed back each time
+                        mock_pool_cls.assert_called_once()
+                        assert mock_pool.putconn.call_count == 2
+
+                        rewarder.close()
+                        mock_pool.closeall.assert_called_once()
+
+    @pytest.mark.parametrize("same_db", [False, True])
+    def test_get_pool_connects_outside_the_lock(self, mock_contract_abi, same_db):
+        """Test that pools connect in parallel and a thread losing the creation race closes its pool."""
+        with patch("src.rewards.token_rewarder.Web3"):
+            with patch(
+                "src.rewards.token_rewarder.TokenRewarder.load_contract_abi",
+                return_value=mock_contract_abi,
+            ):
+                # Both pool constructors must be running at once to pass the barrier,
+                # which cannot happen if connecting holds the instance-wide lock
+                barrier = threading.Barrier(2, timeout=5)
+                created = []
+
+                def make_pool(**kwargs):
+                    barrier.wait()
+                    pool = MagicMock()
+                    created.append(pool)
+                    return pool
+
+                with patch(
+                    "src.rewards.token_rewarder.ThreadedConnectionPool",
+                    side_effect=make_pool,
+                ):
+                    rewarder = TokenRewarder()
+                    db_names = ["db_a", "db_a"] if same_db else ["db_a", "db_b"]
+                    results = [None, None]
+
+                    def get_pool(i):
+                        results[i] = rewarder._get_pool(db_names[i])
+
+                    threads = [threading.Thread(target=get_pool, args=(i,)) for i in range(2)]
+                    for thread in threads:
+                        thread.start()
+                    for thread in threads:
+                        thread.join(timeout=10)
+
+                assert len(created) == 2
+                if same_db:
+                    # Both callers share the winning pool; the other one is closed
+                    assert results[0] is results[1]
+                    loser = next(pool for pool in created if pool is not results[0])
+                    loser.closeall.assert_called_once()
+                    assert rewarder._pools == {"db_a": results[0]}
+                else:
+                    assert results[0] is not results[1]
+                    assert rewarder._pools == {"db_a": results[0], "db_b": results[1]}
+
     def test_load_contract_abi(self, tmp_path):
         """Test loading contract ABI from file."""
         with patch("src.token_rewarder.Web3"):
@@ -258,6 +338,67 @@ class TestTokenRewarder:
                             # Verify schema and table creation was called
                             mock_create_schema.assert_called_once_with("test_db")
 
+    def test_initialize_reward_tables_creates_databases_sequentially(
+        self, mock_contract_abi
+    ):
+        """Test that CREATE DATABASE stays on the calling thread and only schemas run in parallel."""
+        with patch("src.rewards.token_rewarder.Web3"):
+            with patch(
+                "src.rewards.token_rewarder.TokenRewarder.load_contract_abi",
+                return_value=mock_contract_abi,
+            ):
+                rewarder = TokenRewarder()
+                rewarder.db_names = ("db_a", "db_b", "db_c")
+
+                # The bootstrap connection must only be used from the calling thread
+                bootstrap_threads = []
+                mock_cursor = MagicMock()
+                mock_cursor.execute.side_effect = lambda *args: bootstrap_threads.append(
+                    threading.get_ident()
+                )
+                mock_cursor.fetchone.return_value = None  # No database exists yet
+                mock_conn = MagicMock()
+                mock_conn.cursor.return_value = mock_cursor
+
+                schema_threads = {}
+
+                def create_schema(db_name):
+                    schema_threads[db_name] = threading.get_ident()
+
+                with patch.object(rewarder, "_connect", return_value=mock_conn):
+                    with patch.object(
+                        rewarder, "_create_schema_and_table", side_effect=create_schema
+                    ):
+                        rewarder._initialize_reward_tables()
+
+                # One existence check and one CREATE DATABASE per database
+                assert len(bootstrap_threads) == 6
+                assert set(bootstrap_threads) == {threading.get_ident()}
+                assert set(schema_threads) == {"db_a", "db_b", "db_c"}
+                assert threading.get_ident() not in schema_threads.values()
+
+    def test_initialize_reward_tables_skips_failed_databases(
+        self, mock_contract_abi
+    ):
+        """Test that no schema is created in a database that could not be created."""
+        with patch("src.rewards.token_rewarder.Web3"):
+            with patch(
+                "src.rewards.token_rewarder.TokenRewarder.load_contract_abi",
+                return_value=mock_contract_abi,
+            ):
+                rewarder = TokenRewarder()
+                rewarder.db_names = ("db_a", "db_b")
+
+                with patch.object(
+                    rewarder, "_ensure_database", side_effect=[False, True]
+                ):
+                    with patch.object(
+                        rewarder, "_create_schema_and_table"
+                    ) as mock_create_schema:
+                        rewarder._initialize_reward_tables()
+
+                mock_create_schema.assert_called_once_with("db_b")
+
     def test_create_schema_and_table(self, mock_contract_abi):
         """Test creation of schema and table."""
         with patch("src.token_rewarder.Web3"):
@@ -274,7 +415,8 @@ class TestTokenRewarder:
 
                     # Initialize TokenRewarder and mock its _connect method
                     rewarder = TokenRewarder()
-                    with patch.object(rewarder, "_connect", return_value=mock_conn):
+                    with patch.object(rewarder, "_conn") as mock_pooled:
+                        mock_pooled.return_value.__enter__.return_value = mock_conn
                         # Call the method
                         rewarder._create_schema_and_table("test_db")
 
@@ -313,7 +455,8 @@ class TestTokenRewarder:
 
                     # Initialize TokenRewarder and mock its _connect method
                     rewarder = TokenRewarder()
-                    with patch.object(rewarder, "_connect", return_value=mock_conn):
+                    with patch.object(rewarder, "_conn") as mock_pooled:
+                        mock_pooled.return_value.__enter__.return_value = mock_conn
                         # Call the method
                         rewarder.add_reward_to_user("test_db", "test_user", 5)
 
@@ -337,6 +480,60 @@ class TestTokenRewarder:
 
                         assert insert_called, "INSERT statement not called"
 
+    def test_batch_add_rewards_single_upsert(self, mock_contract_abi):
+        """Test that batch rewards are summed per user and sent in one upsert."""
+        with patch("src.rewards.token_rewarder.Web3"):
+            with patch(
+                "src.rewards.token_rewarder.TokenRewarder.load_contract_abi",
+                return_value=mock_contract_abi,
+            ):
+                with patch(
+                    "src.rewards.token_rewarder.execute_values"
+                ) as mock_execute_values:
+                    mock_conn = Mock()
+                    mock_cursor = Mock()
+                    mock_conn.cursor.return_value = mock_cursor
+
+                    rewarder = TokenRewarder()
+                    with patch.object(rewarder, "_conn") as mock_pooled:
+                        mock_pooled.return_value.__enter__.return_value = mock_conn
+                        rewarder.batch_add_rewards(
+                            "test_db", [("user1", 2), ("user2", 1), ("user1", 3)]
+                        )
+
+                    mock_pooled.assert_called_once_with("test_db_token")
+                    mock_execute_values.assert_called_once()
+                    args, kwargs = mock_execute_values.call_args
+                    assert "ON CONFLICT (public_key)" in args[1]
+                    assert args[2] == [("user1", 5), ("user2", 1)]
+                    assert kwargs["template"] == "(%s, %s, CURRENT_TIMESTAMP)"
+
+    def test_bulk_load_rewards_copies_into_staging_table(self, mock_contract_abi):
+        """Test that bulk reward loads COPY rows in and merge them in one transaction."""
+        with patch("src.rewards.token_rewarder.Web3"):
+            with patch(
+                "src.rewards.token_rewarder.TokenRewarder.load_contract_abi",
+                return_value=mock_contract_abi,
+            ):
+                mock_conn = Mock()
+                mock_cursor = Mock()
+                mock_conn.cursor.return_value = mock_cursor
+                copied = []
+                mock_cursor.copy_expert.side_effect = lambda sql, buf: copied.append(
+                    buf.read()
+                )
+
+                rewarder = TokenRewarder()
+                with patch.object(rewarder, "_conn") as mock_pooled:
+                    mock_pooled.return_value.__enter__.return_value = mock_conn
+                    rewarder.bulk_load_rewards("test_db", [("user1", 2), ("user2", 3)])
+
+                mock_pooled.assert_called_once_with("test_db_token")
+                assert copied == ["user1,2\nuser2,3\n"]
+                assert "ON COMMIT DROP" in mock_cursor.execute.call_args_list[0][0][0]
+                assert "ON CONFLICT (public_key)" in mock_cursor.execute.call_args_list[1][0][0]
+                mock_conn.commit.assert_called_once()
+
     def test_issue_token(self, mock_contract_abi, mock_env_vars):
         """Test issuing a token to a recipient."""
         with patch("src.token_rewarder.Web3") as mock_web3:
@@ -447,7 +644,8 @@ class TestTokenRewarder:
 
                     # Initialize TokenRewarder and mock its _connect method
                     rewarder = TokenRewarder()
-                    with patch.object(rewarder, "_connect", return_value=mock_conn):
+                    with patch.object(rewarder, "_conn") as mock_pooled:
+                        mock_pooled.return_value.__enter__.return_value = mock_conn
                         # Call the method
                         result = rewarder.get_user_rewards("test_db")
 
@@ -507,3 +705,340 @@ class TestTokenRewarder:
 
                             # Verify result
                             assert result == {"user1": 5, "user2": 10}
+
+    def test_reward_users_default_weights_sql_buckets(self, mock_contract_abi):
+        """Test that bucketed totals from the database are weighted by recency."""
+        with patch("src.rewards.token_rewarder.Web3"):
+            with patch(
+                "src.rewards.token_rewarder.TokenRewarder.load_contract_abi",
+                return_value=mock_contract_abi,
+            ):
+                mock_conn = Mock()
+                mock_cursor = Mock()
+                mock_conn.cursor.return_value = mock_cursor
+
+                first_time = datetime(2024, 1, 1)
+                mock_cursor.fetchone.return_value = (
+                    first_time,
+                    first_time + timedelta(days=3),
+                )
+                # (public_key, bucket, total jobs); bucket 3 is the most recent
+                mock_cursor.fetchall.return_value = [
+                    ("user1", 3, 2),
+                    ("user1", 1, 1),
+                    ("user2", 2, 4),
+                ]
+
+                rewarder = TokenRewarder()
+                with patch.object(rewarder, "_conn") as mock_pooled:
+                    mock_pooled.return_value.__enter__.return_value = mock_conn
+                    result = rewarder.reward_users_default("test_db")
+
+                assert result["user1"] == pytest.approx(2 + math.exp(-2))
+                assert result["user2"] == pytest.approx(4 * math.exp(-1))
+                assert "width_bucket" in mock_cursor.execute.call_args[0][0]
+
+    def test_reward_users_default_single_timestamp(self, mock_contract_abi):
+        """Test that entries sharing one timestamp produce no weighted rewards."""
+        with patch("src.rewards.token_rewarder.Web3"):
+            with patch(
+                "src.rewards.token_rewarder.TokenRewarder.load_contract_abi",
+                return_value=mock_contract_abi,
+            ):
+                mock_conn = Mock()
+                mock_cursor = Mock()
+                mock_conn.cursor.return_value = mock_cursor
+                timestamp = datetime(2024, 1, 1)
+                mock_cursor.fetchone.return_value = (timestamp, timestamp)
+
+                rewarder = TokenRewarder()
+                with patch.object(rewarder, "_conn") as mock_pooled:
+                    mock_pooled.return_value.__enter__.return_value = mock_conn
+                    assert rewarder.reward_users_default("test_db") == {}
+
+                mock_cursor.execute.assert_called_once()
+
+    def test_reward_users_constant_streams_from_server_cursor(self, mock_contract_abi):
+        """Test that rewards are computed in SQL and streamed from a named cursor."""
+        with patch("src.rewards.token_rewarder.Web3"):
+            with patch(
+                "src.rewards.token_rewarder.TokenRewarder.load_contract_abi",
+                return_value=mock_contract_abi,
+            ):
+                mock_conn = MagicMock()
+                mock_cursor = MagicMock()
+                mock_cursor.__iter__.return_value = iter([("user1", 6), ("user2", 2)])
+                # Real cursors are not mappings, so dict() must iterate the rows
+                del mock_cursor.keys
+                mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+
+                rewarder = TokenRewarder()
+                with patch.object(rewarder, "_conn") as mock_pooled:
+                    mock_pooled.return_value.__enter__.return_value = mock_conn
+                    result = rewarder.reward_users_constant("test_db", reward_per_job=2)
+
+                assert result == {"user1": 6, "user2": 2}
+                mock_conn.cursor.assert_called_once_with(name="rewards_stream")
+                query, params = mock_cursor.execute.call_args[0]
+                assert "SUM(job_count) * %s::float8" in query
+                assert params == (2,)
+                mock_conn.commit.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "method, kwargs, expected_params, casts",
+        [
+            ("reward_users_constant", {}, (0.5,), 1),
+            (
+                "reward_users_after_time",
+                {"start_time": datetime(2024, 1, 1)},
+                (0.5, datetime(2024, 1, 1)),
+                1,
+            ),
+            ("reward_users_milestone", {"milestone": 3}, (0.5, 3), 1),
+            (
+                "reward_users_with_bonus",
+                {"bonus_threshold": 3, "bonus": 2.5},
+                (0.5, 3, 2.5),
+                2,
+            ),
+            (
+                "reward_users_within_timeframe",
+                {"start_time": datetime(2024, 1, 1), "end_time": datetime(2024, 2, 1)},
+                (0.5, datetime(2024, 1, 1), datetime(2024, 2, 1)),
+                1,
+            ),
+        ],
+    )
+    def test_fractional_reward_per_job_is_sent_as_float8(
+        self, mock_contract_abi, method, kwargs, expected_params, casts
+    ):
+        """Test that fractional rewards are cast to float8, so rows come back as floats rather than Decimals."""
+        with patch("src.rewards.token_rewarder.Web3"):
+            with patch(
+                "src.rewards.token_rewarder.TokenRewarder.load_contract_abi",
+                return_value=mock_contract_abi,
+            ):
+                mock_conn = MagicMock()
+                mock_cursor = MagicMock()
+                mock_cursor.__iter__.return_value = iter([("user1", 1.5)])
+                del mock_cursor.keys
+                mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
+
+                rewarder = TokenRewarder()
+                with patch.object(rewarder, "_conn") as mock_pooled:
+                    mock_pooled.return_value.__enter__.return_value = mock_conn
+                    result = getattr(rewarder, method)(
+                        "test_db", reward_per_job=0.5, **kwargs
+                    )
+
+                assert result == {"user1": 1.5}
+                query, params = mock_cursor.execute.call_args[0]
+                assert params == expected_params
+                # psycopg2 sends 0.5 as an untyped numeric literal; without the cast
+                # Postgres returns numeric, which issue_token cannot multiply by 1e18
+                assert query.count("%s::float8") == casts
+                assert "SUM(job_count) * %s::float8" in query
+
+    def test_areward_users_constant_uses_async_pool(self, mock_contract_abi):
+        """Test that the async reward path queries one lazily created asyncpg pool."""
+        with patch("src.rewards.token_rewarder.Web3"):
+            with patch(
+                "src.rewards.token_rewarder.TokenRewarder.load_contract_abi",
+                return_value=mock_contract_abi,
+            ):
+                with patch(
+                    "src.rewards.token_rewarder.asyncpg.create_pool",
+                    new_callable=AsyncMock,
+                ) as mock_create_pool:
+                    mock_pool = mock_create_pool.return_value
+                    mock_pool.fetch = AsyncMock(return_value=[("user1", 4.0)])
+
+                    rewarder = TokenRewarder()
+
+                    async def run():
+                        first = await rewarder.areward_users_constant("test_db", 2)
+                        second = await rewarder.areward_users_constant("test_db", 2)
+                        return first, second
+
+                    first, second = asyncio.run(run())
+
+                    assert first == second == {"user1": 4.0}
+                    mock_create_pool.assert_awaited_once()
+                    assert mock_create_pool.call_args.kwargs["database"] == "test_db"
+                    query, reward_per_job = mock_pool.fetch.call_args[0]
+                    assert "$1" in query
+                    assert reward_per_job == 2
+
+    def test_async_pools_are_created_per_event_loop(self, mock_contract_abi):
+        """Test that each asyncio.run loop gets its own pool instead of reusing a dead loop's."""
+        with patch("src.rewards.token_rewarder.Web3"):
+            with patch(
+                "src.rewards.token_rewarder.TokenRewarder.load_contract_abi",
+                return_value=mock_contract_abi,
+            ):
+                pools = []
+
+                async def create_pool(**kwargs):
+                    pool = MagicMock()
+                    pool.loop = asyncio.get_running_loop()
+                    pool.fetch = AsyncMock(return_value=[("user1", 1.0)])
+                    pool.close = AsyncMock()
+                    pools.append(pool)
+                    return pool
+
+                with patch(
+                    "src.rewards.token_rewarder.asyncpg.create_pool",
+                    side_effect=create_pool,
+                ):
+                    rewarder = TokenRewarder()
+
+                    async def run():
+                        first = await rewarder.areward_users_constant("test_db")
+                        second = await rewarder.areward_users_constant("test_db")
+                        return first, second, len(rewarder._apools)
+
+                    first_run = asyncio.run(run())
+                    second_run = asyncio.run(run())
+
+                # One pool per loop, each used only on the loop that created it
+                assert first_run == second_run == ({"user1": 1.0}, {"user1": 1.0}, 1)
+                assert len(pools) == 2
+                assert pools[0].loop is not pools[1].loop
+                assert pools[0].fetch.await_count == pools[1].fetch.await_count == 2
+
+    def test_transactions_reuse_nonce_and_gas_price(self, mock_contract_abi, mock_env_vars):
+        """Test that consecutive transactions fetch the nonce and gas price only once."""
+        with patch("src.rewards.token_rewarder.Web3") as mock_web3:
+            with patch(
+                "src.rewards.token_rewarder.TokenRewarder.load_contract_abi",
+                return_value=mock_contract_abi,
+            ):
+                mock_web3_instance = mock_web3.return_value
+                mock_web3_instance.eth.get_transaction_count.return_value = 7
+                mock_build = (
+                    mock_web3_instance.eth.contract.return_value.functions.transfer.return_value.build_transaction
+                )
+
+                rewarder = TokenRewarder()
+                assert rewarder.issue_token("0xREC1", 1)
+                assert rewarder.issue_token("0xREC2", 1)
+
+                mock_web3_instance.eth.get_transaction_count.assert_called_once()
+                nonces = [c.args[0]["nonce"] for c in mock_build.call_args_list]
+                assert nonces == [7, 8]
+
+                # A failed send makes the next transaction re-read the nonce
+                mock_web3_instance.eth.send_raw_transaction.side_effect = Exception("boom")
+                assert not rewarder.issue_token("0xREC3", 1)
+                assert rewarder._nonce is None
+
+    def test_reward_users_by_tier(self, mock_contract_abi):
+        """Test that users get the per-job reward of the highest tier they reach."""
+        with patch("src.rewards.token_rewarder.Web3"):
+            with patch(
+                "src.rewards.token_rewarder.TokenRewarder.load_contract_abi",
+                return_value=mock_contract_abi,
+            ):
+                rewarder = TokenRewarder()
+                user_totals = {"low": 5, "edge": 50, "high": 120}
+                with patch.object(rewarder, "_conn"):
+                    with patch.object(
+                        rewarder, "_fetch_rewards", return_value=user_totals
+                    ):
+                        result = rewarder.reward_users_by_tier(
+                            "test_db", tiers={100: 5, 50: 3, 10: 1}
+                        )
+
+                # Totals below the lowest tier earn nothing
+                assert result == {"low": 0, "edge": 150, "high": 600}
+
+    def test_add_reward_to_user_is_queued_and_flushed(self, mock_contract_abi):
+        """Test that queued rewards are written in per-database batches on flush."""
+        with patch("src.rewards.token_rewarder.Web3"):
+            with patch(
+                "src.rewards.token_rewarder.TokenRewarder.load_contract_abi",
+                return_value=mock_contract_abi,
+            ):
+                rewarder = TokenRewarder()
+                with patch.object(rewarder, "batch_add_rewards") as mock_batch:
+                    rewarder.add_reward_to_user("user1", "db_a", 2)
+                    rewarder.add_reward_to_user("user2", "db_b", 1)
+                    rewarder.add_reward_to_user("user3", "db_a", 4)
+                    rewarder.flush_queued_rewards()
+
+                written = {c.args[0]: c.args[1] for c in mock_batch.call_args_list}
+                assert written == {
+                    "db_a": [("user1", 2), ("user3", 4)],
+                    "db_b": [("user2", 1)],
+                }
+                assert rewarder._flusher is None
+
+    def test_flush_races_with_concurrent_adds(self, mock_contract_abi):
+        """Test that flushing while other threads add rewards neither hangs nor loses rows."""
+        with patch("src.rewards.token_rewarder.Web3"):
+            with patch(
+                "src.rewards.token_rewarder.TokenRewarder.load_contract_abi",
+                return_value=mock_contract_abi,
+            ):
+                rewarder = TokenRewarder()
+                written = []
+                written_lock = threading.Lock()
+
+                def record(db_name, rows):
+                    with written_lock:
+                        written.extend(rows)
+
+                def add_rows(worker):
+                    for i in range(200):
+                        rewarder.add_reward_to_user(f"user{worker}_{i}", "db_a", 1)
+
+                def flush_repeatedly():
+                    for _ in range(50):
+                        rewarder.flush_queued_rewards()
+
+                with patch.object(rewarder, "batch_add_rewards", side_effect=record):
+                    threads = [threading.Thread(target=add_rows, args=(w,), daemon=True) for w in range(4)]
+                    threads.append(threading.Thread(target=flush_repeatedly, daemon=True))
+                    for thread in threads:
+                        thread.start()
+                    for thread in threads:
+                        thread.join(timeout=10)
+                        assert not thread.is_alive()
+                    rewarder.flush_queued_rewards()
+
+                assert len(written) == 800
+                assert rewarder._flusher is None
+
+    def test_queued_rewards_are_flushed_at_exit(self, mock_contract_abi):
+        """Test that the exit hook writes rewards that were never flushed explicitly."""
+        with patch("src.rewards.token_rewarder.Web3"):
+            with patch(
+                "src.rewards.token_rewarder.TokenRewarder.load_contract_abi",
+                return_value=mock_contract_abi,
+            ):
+                rewarder = TokenRewarder()
+                with patch.object(rewarder, "batch_add_rewards") as mock_batch:
+                    rewarder.add_reward_to_user("user1", "db_a", 3)
+                    _flush_rewarder_at_exit(weakref.ref(rewarder))
+
+                mock_batch.assert_called_once_with("db_a", [("user1", 3)])
+                assert rewarder._flusher is None
+
+    def test_close_unregisters_only_its_exit_hook(self, mock_contract_abi):
+        """Test that close() removes its own exit hook and leaves other rewarders' hooks registered."""
+        with patch("src.rewards.token_rewarder.Web3"):
+            with patch(
+                "src.rewards.token_rewarder.TokenRewarder.load_contract_abi",
+                return_value=mock_contract_abi,
+            ):
+                with patch("src.rewards.token_rewarder.atexit") as mock_atexit:
+                    first = TokenRewarder()
+                    second = TokenRewarder()
+                    first.close()
+
+                assert mock_atexit.register.call_args_list == [
+                    call(first._exit_hook),
+                    call(second._exit_hook),
+                ]
+                assert first._exit_hook != second._exit_hook
+                mock_atexit.unregister.assert_called_once_with(first._exit_hook)
@@ -100,23 +100,23 @@ class TestTokenReward:
                             assert "chunker" in components
                             assert "embedder" in components
 
-                            # Verify create_database_and_table was called
-                            assert (
-                                mock_rewarder_instance.create_database_and_table.call_count
-                                > 0
+                            # Verify _create_database_and_table was called
+                            mock_rewarder_instance._create_database_and_table.assert_called_once_with(
+                                "openai_paragraph_openai"
                             )
 
-                            # Verify add_reward_to_user was called for each author
-                            assert (
-                                mock_rewarder_instance.add_reward_to_user.call_count
-                                == 2
-                            )  # Two authors
-                            mock_rewarder_instance.add_reward_to_user.assert_any_call(
-                                "openai_paragraph_openai", "author1@example.com", 10
-                            )
-                            mock_rewarder_instance.add_reward_to_user.assert_any_call(
-                                "openai_paragraph_openai", "author2@example.com", 5
-                            )
+                            # Verify all authors were rewarded in one batch per database
+                            mock_rewarder_instance.batch_add_rewards.assert_called_once()
+                            db_name, rows = mock_rewarder_instance.batch_add_rewards.call_args.args
+                            assert db_name == "openai_paragraph_openai"
+                            assert dict(rows) == {
+                                "author1@example.com": 10,
+                                "author2@example.com": 5,
+                            }
+                            mock_rewarder_instance.add_reward_to_user.assert_not_called()
+
+                            # Verify queued rewards were flushed and connections closed
+                            mock_rewarder_instance.close.assert_called_once()
 
     def test_run_reward_users_no_authors(self):
         """Test behavior when no authors are found."""
@@ -149,11 +149,14 @@ class TestTokenReward:
                                 "Found 0 authors with contributions"
                             )
 
-                            # Verify add_reward_to_user was not called (no authors)
+                            # Verify no rewards were added (no authors)
                             assert (
                                 mock_rewarder_instance.add_reward_to_user.call_count
                                 == 0
                             )
+                            for call in mock_rewarder_instance.batch_add_rewards.call_args_list:
+                                assert not list(call.args[1])
+                            mock_rewarder_instance.close.assert_called_once()
 
     def test_neo4j_connection_failure(self):
         """Test behavior when Neo4j connection fails."""